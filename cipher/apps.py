@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class CipherConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'cipher'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,85 @@
+"""
+Helpers for async read endpoints.
+
+DRF's APIView only dispatches sync handlers, so async endpoints are plain
+Django views that authenticate with the configured DRF authentication classes
+(the claims-based JWT backend) and render with DRF's JSON renderer, keeping
+the response format identical to the sync views.
+
+Django's async ORM still funnels queries through a single thread per request,
+so independent queries are instead run with sync_to_async(thread_sensitive=False):
+each runs in a worker thread with its own database connection.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+
+def _run_with_connection(query):
+    # Worker threads keep their own connection; honour CONN_MAX_AGE and
+    # health checks the way request_started/request_finished would
+    close_old_connections()
+    try:
+        return query()
+    finally:
+        close_old_connections()
+
+
+async def run_query(query):
+    """
+    Runs a zero-argument ORM callable in a worker thread.
+    """
+    return await sync_to_async(_run_with_connection, thread_sensitive=False)(query)
+
+
+async def gather_queries(queries):
+    """
+    Runs a dict of independent zero-argument ORM callables concurrently and
+    returns their results under the same keys.
+    """
+    names = list(queries.keys())
+    results = await asyncio.gather(*(run_query(queries[name]) for name in names))
+    return dict(zip(names, results))
+
+
+class AsyncAPIView(View):
+    """
+    Base class for async GET endpoints that require an authenticated user.
+    """
+    http_method_names = ['get', 'options']
+
+    def render(self, data, status=200):
+        return HttpResponse(
+            JSONRenderer().render(data),
+            status=status,
+            content_type='application/json'
+        )
+
+    def _authenticate(self, request):
+        for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+            result = authentication_class().authenticate(request)
+            if result is not None:
+                return result[0]
+        return None
+
+    async def authenticate(self, request):
+        try:
+            return await sync_to_async(self._authenticate)(request)
+        except AuthenticationFailed:
+            return None
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await self.authenticate(request)
+        if user is None:
+            return self.render(
+                {'detail': 'Authentication credentials were not provided.'},
+                status=401
+            )
+        request.user = user
+        return await super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,178 @@
+"""
+JWT authentication from token claims.
+
+Tokens carry the user's username, role, user type and staff flags plus
+their token version (CustomUser.token_version, bumped on every change to
+those fields, the password or is_active). While the version in the token
+matches the one in the cache, the request user is built from the claims
+without a query; everything else about the user is loaded on first access
+(CustomUser.refresh_from_db). A stale or missing version falls back to the
+usual lookup, which also re-caches the version.
+
+Refresh tokens can cache their blacklist lookup until they expire, so
+refreshing and logging out don't join the ever-growing token tables on
+every call. Blacklisting a token (rotation, logout, the admin) caches the
+flag from the BlacklistedToken signal (cipher/signals.py), and a "not
+blacklisted" read from the database never replaces it. The tables
+themselves are kept small by the prune_expired_tokens command.
+
+Versions and blacklist flags are cached from signals, so both shortcuts
+are only safe with a cache every worker shares: they are enabled by
+JWT_TRUST_TOKEN_CLAIMS and JWT_CACHE_BLACKLIST, which default to on with
+Redis only. Updates through QuerySet.update() skip save() and must not
+touch the token version fields.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+
+TOKEN_VERSION_CACHE_PREFIX = 'auth:ver'
+TOKEN_VERSION_CLAIM = 'ver'
+BLACKLIST_CACHE_PREFIX = 'auth:bl'
+# CustomUser fields copied into the token, enough for the permission checks
+USER_CLAIM_FIELDS = ['username', 'role', 'user_type', 'is_superuser', 'is_staff']
+
+
+def _token_version_key(user_id):
+    return f"{TOKEN_VERSION_CACHE_PREFIX}:{user_id}"
+
+
+def remember_token_version(user_id, version):
+    cache.set(_token_version_key(user_id), version, timeout=settings.TOKEN_VERSION_CACHE_TIMEOUT)
+
+
+def forget_token_version(user_id):
+    cache.delete(_token_version_key(user_id))
+
+
+def _blacklist_key(jti):
+    return f"{BLACKLIST_CACHE_PREFIX}:{jti}"
+
+
+def remember_blacklisted(jti, blacklisted, expires_at):
+    """
+    Caches whether the token `jti` is blacklisted until it expires
+    (`expires_at` as a timestamp); expired tokens are rejected anyway.
+    False is only added, as it may have been read before the token was
+    blacklisted.
+    """
+    if not settings.JWT_CACHE_BLACKLIST:
+        return
+    timeout = int(expires_at - time.time())
+    if timeout <= 0:
+        return
+    if blacklisted:
+        cache.set(_blacklist_key(jti), True, timeout=timeout)
+    else:
+        cache.add(_blacklist_key(jti), False, timeout=timeout)
+
+
+def add_user_claims(token, user):
+    for field in USER_CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    remember_token_version(user.pk, user.token_version)
+    return token
+
+
+def user_from_claims(validated_token):
+    """
+    CustomUser built from the token's claims, or None when they are missing
+    or older than the user's cached token version.
+    """
+    from emplyees.models import CustomUser
+
+    claims = [api_settings.USER_ID_CLAIM, TOKEN_VERSION_CLAIM, *USER_CLAIM_FIELDS]
+    if any(claim not in validated_token for claim in claims):
+        return None
+    user_id = validated_token[api_settings.USER_ID_CLAIM]
+    version = cache.get(_token_version_key(user_id))
+    if version is None or version != validated_token[TOKEN_VERSION_CLAIM]:
+        return None
+
+    # A changed is_active bumps the version, so a current token means an active user
+    values = {
+        'id': int(user_id),
+        'is_active': True,
+        'token_version': version,
+        **{field: validated_token[field] for field in USER_CLAIM_FIELDS},
+    }
+    # from_db takes the values in field order
+    field_names = [field.attname for field in CustomUser._meta.concrete_fields if field.attname in values]
+    user = CustomUser.from_db(
+        router.db_for_read(CustomUser), field_names, [values[name] for name in field_names]
+    )
+    user._from_token_claims = True
+    return user
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token (and the access tokens made from it) carrying the user claims.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        return add_user_claims(super().for_user(user), user)
+
+    def check_blacklist(self):
+        if not settings.JWT_CACHE_BLACKLIST:
+            return super().check_blacklist()
+        jti = self.payload[api_settings.JTI_CLAIM]
+        blacklisted = cache.get(_blacklist_key(jti))
+        if blacklisted is None:
+            blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+            remember_blacklisted(jti, blacklisted, self.payload['exp'])
+        if blacklisted:
+            raise TokenError(_('Token is blacklisted'))
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        if settings.JWT_TRUST_TOKEN_CLAIMS:
+            user = user_from_claims(validated_token)
+            if user is not None:
+                return user
+        user = super().get_user(validated_token)
+        remember_token_version(user.pk, user.token_version)
+        return user
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    TokenRefreshSerializer that re-reads the user and stamps the current
+    claims on the new tokens, so a role change reaches the next refresh.
+    """
+    token_class = ClaimsRefreshToken
+
+    def validate(self, attrs):
+        from emplyees.models import CustomUser
+
+        refresh = self.token_class(attrs['refresh'])
+        user = CustomUser.objects.filter(pk=refresh.payload.get(api_settings.USER_ID_CLAIM)).first()
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        add_user_claims(refresh, user)
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+        return data
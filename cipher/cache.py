@@ -0,0 +1,162 @@
+"""
+Response caching for read-mostly API endpoints.
+
+Serialized response data is cached per namespace, keyed by the requesting
+user's role/user_type, the request host and the query string. Each namespace
+carries a version number stored in the cache; model signals bump the version
+on save/delete so every cached variant of that namespace is dropped at once,
+whatever the cache backend (local memory and file caches cannot delete by
+pattern).
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+
+RESPONSE_CACHE_PREFIX = 'respcache'
+
+# Every namespace used with cache_response, exposed by the stats endpoint
+RESPONSE_CACHE_NAMESPACES = [
+    'announcements',
+    'income_categories',
+    'expense_categories',
+    'clients',
+    'employees',
+]
+
+
+def _version_key(namespace):
+    return f"{RESPONSE_CACHE_PREFIX}:ver:{namespace}"
+
+
+def _stat_key(namespace, kind):
+    return f"{RESPONSE_CACHE_PREFIX}:stats:{namespace}:{kind}"
+
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key missing or evicted; add() keeps concurrent first writers from clobbering each other
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+def get_namespace_version(namespace):
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        cache.add(_version_key(namespace), 1, timeout=None)
+        version = cache.get(_version_key(namespace), 1)
+    return version
+
+
+def invalidate_namespace(*namespaces):
+    """
+    Drops every cached response under the given namespaces.
+    """
+    for namespace in namespaces:
+        _incr(_version_key(namespace))
+
+
+def build_cache_key(namespace, request):
+    """
+    Cache key for a request: namespace version, role, host, day and sorted query params.
+    The day is part of the key because several list serializers render
+    date-relative fields (e.g. "Due in 3 days").
+    """
+    user = request.user
+    role = 'superuser' if user.is_superuser else (user.role or '')
+    user_type = getattr(user, 'user_type', None) or ''
+    params = '&'.join(
+        f"{name}={value}"
+        for name in sorted(request.query_params.keys())
+        for value in request.query_params.getlist(name)
+    )
+    raw = '|'.join([
+        role,
+        user_type,
+        request.get_host(),
+        timezone.now().date().isoformat(),
+        params,
+    ])
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f"{RESPONSE_CACHE_PREFIX}:{namespace}:v{get_namespace_version(namespace)}:{digest}"
+
+
+def _to_cacheable(data):
+    """
+    Strips DRF's ReturnList/ReturnDict wrappers, which hold a reference to
+    their serializer and would otherwise be pickled along with the data.
+    """
+    if isinstance(data, (ReturnList, list)):
+        return [_to_cacheable(item) for item in data]
+    if isinstance(data, (ReturnDict, dict)):
+        return {key: _to_cacheable(value) for key, value in data.items()}
+    return data
+
+
+def cache_response(namespace, timeout=None):
+    """
+    Decorator for APIView/GenericAPIView read methods (get/list).
+    Only 200 responses are cached.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            if not getattr(settings, 'RESPONSE_CACHE_ENABLED', True):
+                return view_method(view, request, *args, **kwargs)
+
+            key = build_cache_key(namespace, request)
+            data = cache.get(key)
+            if data is not None:
+                _incr(_stat_key(namespace, 'hits'))
+                return Response(data)
+
+            _incr(_stat_key(namespace, 'misses'))
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache_timeout = timeout if timeout is not None else settings.RESPONSE_CACHE_TIMEOUT
+                cache.set(key, _to_cacheable(response.data), cache_timeout)
+            return response
+        return wrapper
+    return decorator
+
+
+def get_cache_stats():
+    """
+    Hit/miss counters per namespace.
+    """
+    keys = []
+    for namespace in RESPONSE_CACHE_NAMESPACES:
+        keys.append(_stat_key(namespace, 'hits'))
+        keys.append(_stat_key(namespace, 'misses'))
+    values = cache.get_many(keys)
+
+    stats = {}
+    total_hits = 0
+    total_misses = 0
+    for namespace in RESPONSE_CACHE_NAMESPACES:
+        hits = values.get(_stat_key(namespace, 'hits'), 0)
+        misses = values.get(_stat_key(namespace, 'misses'), 0)
+        total_hits += hits
+        total_misses += misses
+        stats[namespace] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 4) if (hits + misses) else None,
+            'version': cache.get(_version_key(namespace), 1),
+        }
+
+    return {
+        'backend': settings.CACHES['default']['BACKEND'],
+        'total_hits': total_hits,
+        'total_misses': total_misses,
+        'hit_ratio': round(total_hits / (total_hits + total_misses), 4) if (total_hits + total_misses) else None,
+        'namespaces': stats,
+    }
@@ -0,0 +1,172 @@
+"""
+Image derivatives (thumbnails).
+
+Derivatives live under THUMBNAIL_PREFIX with names derived from the original
+path, so no model fields are needed. Serializers always link the thumbnail;
+while it hasn't been generated yet, the media view serves the original in
+its place (see original_for_thumbnail).
+
+    profile_images/2025/10/07/me.jpg
+    -> thumbnails/profile_images/2025/10/07/me_128.webp
+    -> thumbnails/profile_images/2025/10/07/me_128.jpg
+
+Generation runs on a small thread pool after the saving transaction commits,
+so uploads don't wait for Pillow. `manage.py generate_thumbnails` backfills
+existing images.
+"""
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_PREFIX = 'thumbnails'
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tif', '.tiff'}
+THUMBNAIL_RE = re.compile(rf"^{THUMBNAIL_PREFIX}/(.+)_(\d+)\.({'|'.join(THUMBNAIL_FORMATS)})$")
+
+_executor = None
+
+
+def is_image(name):
+    return bool(name) and os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def thumbnail_name(name, size, extension='webp'):
+    base, _ = os.path.splitext(name)
+    return f"{THUMBNAIL_PREFIX}/{base}_{size}.{extension}"
+
+
+def thumbnail_names(name):
+    return [
+        thumbnail_name(name, size, extension)
+        for size in settings.THUMBNAIL_SIZES
+        for extension in THUMBNAIL_FORMATS
+    ]
+
+
+def thumbnail_url(field_file, size=None, request=None):
+    """
+    URL of the WebP thumbnail for a FileField value. Built from the name
+    alone, without checking the storage, so lists don't pay a lookup per row.
+    """
+    if not field_file or not is_image(field_file.name):
+        return None
+    size = size or settings.THUMBNAIL_SIZES[0]
+    url = default_storage.url(thumbnail_name(field_file.name, size))
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def original_for_thumbnail(name):
+    """
+    Stored original image a thumbnail name was derived from, or None. The
+    thumbnail name drops the original's extension, so its directory is
+    listed; the media view only asks for thumbnails that don't exist yet.
+    """
+    match = THUMBNAIL_RE.match(name)
+    if not match or int(match.group(2)) not in settings.THUMBNAIL_SIZES:
+        return None
+    directory, stem = os.path.split(match.group(1))
+    try:
+        _, files = default_storage.listdir(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    for filename in sorted(files):
+        root, extension = os.path.splitext(filename)
+        if root == stem and extension.lower() in IMAGE_EXTENSIONS:
+            return f"{directory}/{filename}" if directory else filename
+    return None
+
+
+def generate_thumbnails(name, force=False):
+    """
+    Writes every size/format derivative for one stored image. EXIF data is
+    dropped: orientation is applied to the pixels and no metadata is saved.
+    Returns the number of files written.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    if not is_image(name) or not default_storage.exists(name):
+        return 0
+    if not force and all(default_storage.exists(thumb) for thumb in thumbnail_names(name)):
+        return 0
+
+    try:
+        with default_storage.open(name, 'rb') as source:
+            image = Image.open(source)
+            image.load()
+    except (UnidentifiedImageError, OSError) as e:
+        logger.warning("Cannot create thumbnails for %s: %s", name, e)
+        return 0
+
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+
+    written = 0
+    for size in settings.THUMBNAIL_SIZES:
+        thumb = image.copy()
+        thumb.thumbnail((size, size), Image.LANCZOS)
+        for extension, (image_format, options) in THUMBNAIL_FORMATS.items():
+            if image_format == 'JPEG' or not has_alpha:
+                output_image = thumb.convert('RGB')
+            else:
+                output_image = thumb.convert('RGBA')
+            buffer = BytesIO()
+            output_image.save(buffer, format=image_format, **options)
+
+            thumb_name = thumbnail_name(name, size, extension)
+            if default_storage.exists(thumb_name):
+                default_storage.delete(thumb_name)
+            default_storage.save(thumb_name, ContentFile(buffer.getvalue()))
+            written += 1
+    return written
+
+
+def delete_thumbnails(name):
+    for thumb in thumbnail_names(name):
+        if default_storage.exists(thumb):
+            default_storage.delete(thumb)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.THUMBNAIL_WORKERS,
+            thread_name_prefix='thumbnails'
+        )
+    return _executor
+
+
+def _run(name, on_done):
+    try:
+        if generate_thumbnails(name) and on_done:
+            on_done()
+    except Exception:
+        logger.exception("Thumbnail generation failed for %s", name)
+    finally:
+        close_old_connections()
+
+
+def schedule_thumbnails(name, on_done=None):
+    """
+    Queues thumbnail generation once the current transaction commits.
+    With THUMBNAIL_ASYNC off (tests, management commands) it runs inline.
+    """
+    if not is_image(name):
+        return
+    if not settings.THUMBNAIL_ASYNC:
+        transaction.on_commit(lambda: _run(name, on_done))
+        return
+    transaction.on_commit(lambda: _get_executor().submit(_run, name, on_done))
@@ -0,0 +1,313 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from cipher.profiling import RequestProfile
+
+
+# (label, url name, kwargs as {url kwarg: object kind}, query string kind)
+BENCH_ENDPOINTS = [
+    ('employee_detail', 'employee_detail', {'employee_id': 'employee'}, None),
+    ('client_list', 'client-list', {}, None),
+    ('client_detail', 'client-detail', {'id': 'client'}, None),
+    ('finance_stats', 'finance-stats', {}, None),
+    ('income_list', 'income-list-create', {}, None),
+    ('expense_list', 'expense-list-create', {}, None),
+    ('monthly_client_report', 'monthly-client-report', {}, 'month'),
+    ('monthly_employee_report', 'monthly-employee-report', {}, 'month'),
+    ('monthly_income_report', 'monthly-income-report', {}, 'month'),
+    ('monthly_expense_report', 'monthly-expense-report', {}, 'month'),
+    ('task_list', 'task-list', {}, None),
+    ('event_list', 'event-list', {}, None),
+]
+
+# Row counts stored with each run so baselines are only compared like for like
+DATASET_MODELS = [
+    'emplyees.CustomUser', 'clientapp.Client', 'emplyees.SalaryPayment', 'clientapp.ClientPayment',
+    'finance.Income', 'finance.Expense', 'task.Task', 'events.Event', 'emplyees.LeaveManagement',
+]
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def change(before, after):
+    if not before:
+        return None
+    return (after - before) / before * 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the heavy GET endpoints in-process with the test client against the "
+        "current (seeded) database: p50/p95 latency and query counts per endpoint. Each run "
+        "is saved as JSON and compared with the previous run or a given baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint first')
+        parser.add_argument('--user', help='Username to request as (default: first superuser or admin)')
+        parser.add_argument('--only', action='append', default=[], help='Benchmark only this endpoint label')
+        parser.add_argument(
+            '--cached',
+            action='store_true',
+            help='Keep the response cache on (default measures the uncached work)'
+        )
+        parser.add_argument(
+            '--output-dir',
+            default=str(Path(settings.BASE_DIR) / 'benchmarks'),
+            help='Directory results are written to'
+        )
+        parser.add_argument('--label', help='Name for this run (default: timestamp)')
+        parser.add_argument('--baseline', help='Result file to compare with (default: latest in --output-dir)')
+        parser.add_argument('--no-save', action='store_true', help='Compare only, do not write a result file')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=10.0,
+            help='Percent p95 slowdown reported as a regression'
+        )
+        parser.add_argument(
+            '--fail-on-regression',
+            action='store_true',
+            help='Exit with an error when a regression is found (for CI)'
+        )
+
+    def bench_user(self, username):
+        from emplyees.models import CustomUser
+
+        if username:
+            user = CustomUser.objects.filter(username=username).first()
+            if user is None:
+                raise CommandError(f"User '{username}' does not exist.")
+            return user
+        user = (
+            CustomUser.objects.filter(is_superuser=True).order_by('id').first()
+            or CustomUser.objects.filter(role='admin').order_by('id').first()
+        )
+        if user is None:
+            raise CommandError("No superuser or admin found; seed the database first (manage.py seed_scale).")
+        return user
+
+    def bench_objects(self):
+        from django.db.models import Count
+
+        from clientapp.models import Client
+        from emplyees.models import CustomUser
+
+        # The busiest employee and the first live client: the worst realistic detail pages
+        employee = (
+            CustomUser.objects.filter(role='employee')
+            .annotate(payment_count=Count('salary_payments'))
+            .order_by('-payment_count', 'id')
+            .first()
+        )
+        client = Client.objects.filter(is_deleted=False).order_by('id').first()
+        if employee is None or client is None:
+            raise CommandError("No employees or clients found; seed the database first (manage.py seed_scale).")
+        return {'employee': employee, 'client': client}
+
+    def dataset(self):
+        from django.apps import apps
+
+        return {label: apps.get_model(label).objects.count() for label in DATASET_MODELS}
+
+    def git_revision(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    def build_urls(self, objects, only):
+        # Reports default to the last complete month
+        last_month = timezone.localdate().replace(day=1) - timedelta(days=1)
+        queries = {'month': f"month={last_month.month}&year={last_month.year}"}
+        urls = {}
+        for label, name, kwargs, query in BENCH_ENDPOINTS:
+            if only and label not in only:
+                continue
+            url = reverse(name, kwargs={key: objects[kind].pk for key, kind in kwargs.items()})
+            urls[label] = url + (f"?{queries[query]}" if query else '')
+        return urls
+
+    def measure(self, client, url, iterations, warmup):
+        connection = connections[DEFAULT_DB_ALIAS]
+        for _ in range(warmup):
+            client.get(url)
+        timings = []
+        queries = []
+        response = None
+        for _ in range(iterations):
+            profile = RequestProfile()
+            with connection.execute_wrapper(profile.query_wrapper):
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(profile.query_count)
+        ordered = sorted(timings)
+        return {
+            'url': url,
+            'status': response.status_code,
+            'response_bytes': len(response.content),
+            'iterations': iterations,
+            'p50_ms': round(statistics.median(ordered), 2),
+            'p95_ms': round(percentile(ordered, 0.95), 2),
+            'mean_ms': round(statistics.mean(ordered), 2),
+            'max_ms': round(ordered[-1], 2),
+            'queries': max(queries),
+        }
+
+    def run(self, options):
+        from rest_framework.test import APIClient
+
+        user = self.bench_user(options['user'])
+        unknown = set(options['only']) - {label for label, *_ in BENCH_ENDPOINTS}
+        if unknown:
+            raise CommandError(f"Unknown endpoint(s): {', '.join(sorted(unknown))}")
+        urls = self.build_urls(self.bench_objects(), options['only'])
+
+        overrides = {
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+            'REQUEST_PROFILING_ENABLED': False,
+        }
+        if not options['cached']:
+            overrides['RESPONSE_CACHE_ENABLED'] = False
+
+        endpoints = {}
+        with override_settings(**overrides), transaction.atomic():
+            # Report endpoints save snapshots; roll everything back so the dataset stays as seeded
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(user)
+            for label, url in urls.items():
+                result = self.measure(client, url, options['iterations'], options['warmup'])
+                endpoints[label] = result
+                self.stdout.write(
+                    f"{label:<26}{result['status']:>5}{result['p50_ms']:>11.1f}{result['p95_ms']:>11.1f}"
+                    f"{result['queries']:>9}"
+                )
+            transaction.set_rollback(True)
+
+        return {
+            'label': options['label'],
+            'created': timezone.now().isoformat(),
+            'git_revision': self.git_revision(),
+            'database': connections[DEFAULT_DB_ALIAS].vendor,
+            'python': platform.python_version(),
+            'user': user.username,
+            'cached': options['cached'],
+            'dataset': self.dataset(),
+            'endpoints': endpoints,
+        }
+
+    def latest_result(self, directory, exclude=None):
+        files = sorted(
+            (path for path in directory.glob('*.json') if path != exclude),
+            key=lambda path: path.stat().st_mtime,
+        )
+        return files[-1] if files else None
+
+    def compare(self, baseline, current, threshold):
+        """
+        Prints the per-endpoint change from `baseline` to `current` and returns
+        the labels that regressed: p95 slower by more than `threshold` percent,
+        more queries, or a new error status.
+        """
+        if baseline.get('dataset') != current['dataset']:
+            self.stdout.write(self.style.WARNING(
+                "Dataset differs from the baseline's; latency changes may come from the data, not the code."
+            ))
+        self.stdout.write(
+            f"\n{'endpoint':<26}{'p50 ms':>20}{'p95 ms':>24}{'queries':>16}"
+        )
+        regressions = []
+        for label, result in current['endpoints'].items():
+            before = baseline['endpoints'].get(label)
+            if before is None:
+                self.stdout.write(f"{label:<26}  (not in baseline)")
+                continue
+            p50 = change(before['p50_ms'], result['p50_ms'])
+            p95 = change(before['p95_ms'], result['p95_ms'])
+            regressed = (
+                (p95 is not None and p95 > threshold)
+                or result['queries'] > before['queries']
+                or (result['status'] >= 400 > before['status'])
+            )
+            line = (
+                f"{label:<26}"
+                f"{before['p50_ms']:>8.1f} -> {result['p50_ms']:<7.1f}{self.percent(p50):>5}"
+                f"{before['p95_ms']:>10.1f} -> {result['p95_ms']:<7.1f}{self.percent(p95):>5}"
+                f"{before['queries']:>8} -> {result['queries']:<6}"
+            )
+            if regressed:
+                regressions.append(label)
+                self.stdout.write(self.style.ERROR(line + ' REGRESSION'))
+            elif p95 is not None and p95 < -threshold or result['queries'] < before['queries']:
+                self.stdout.write(self.style.SUCCESS(line + ' improved'))
+            else:
+                self.stdout.write(line)
+        return regressions
+
+    def percent(self, value):
+        return '' if value is None else f"{value:+.0f}%"
+
+    def handle(self, *args, **options):
+        output_dir = Path(options['output_dir'])
+        baseline_path = Path(options['baseline']) if options['baseline'] else None
+        if baseline_path is None and output_dir.is_dir():
+            baseline_path = self.latest_result(output_dir)
+        if baseline_path is not None and not baseline_path.is_file():
+            raise CommandError(f"Baseline {baseline_path} does not exist.")
+
+        self.stdout.write(
+            f"{options['iterations']} requests per endpoint after {options['warmup']} warmup, "
+            f"{'cached' if options['cached'] else 'uncached'}\n"
+            f"{'endpoint':<26}{'status':>5}{'p50 ms':>11}{'p95 ms':>11}{'queries':>9}"
+        )
+        current = self.run(options)
+
+        if not options['no_save']:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+            path = output_dir / f"{options['label'] or stamp}.json"
+            with open(path, 'w') as handle:
+                json.dump(current, handle, indent=2)
+                handle.write('\n')
+            self.stdout.write(f"Saved {path}")
+
+        if baseline_path is None:
+            self.stdout.write("No baseline to compare with; this run is the first baseline.")
+            return
+
+        with open(baseline_path) as handle:
+            baseline = json.load(handle)
+        self.stdout.write(
+            f"Compared with {baseline_path.name} "
+            f"({baseline.get('git_revision') or 'unknown revision'}, {baseline.get('created', '')[:19]})"
+        )
+        regressions = self.compare(baseline, current, options['threshold'])
+        if regressions:
+            message = f"{len(regressions)} endpoint(s) regressed: {', '.join(regressions)}"
+            if options['fail_on_regression']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS("No regressions."))
@@ -0,0 +1,85 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures per-request database connection overhead with CONN_MAX_AGE=0 "
+        "(a new connection for every request) against the configured persistent "
+        "connection/pool settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Simulated requests per run')
+        parser.add_argument('--database', default='default', help='Database alias to benchmark')
+
+    def simulate_requests(self, alias, iterations):
+        """
+        Runs one trivial query per simulated request and closes connections
+        the way Django does at request_finished.
+        """
+        connection = connections[alias]
+        timings = []
+        for _ in range(iterations):
+            close_old_connections()
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            timings.append((time.perf_counter() - start) * 1000)
+            close_old_connections()
+        return timings
+
+    def summarize(self, label, timings):
+        ordered = sorted(timings)
+        p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f"{label:<28} mean {statistics.mean(ordered):8.3f} ms   "
+            f"p50 {statistics.median(ordered):8.3f} ms   p95 {p95:8.3f} ms"
+        )
+        return statistics.mean(ordered)
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        iterations = options['iterations']
+        connection = connections[alias]
+        settings_dict = connection.settings_dict
+        configured_max_age = settings_dict.get('CONN_MAX_AGE', 0)
+        pooled = bool(settings_dict.get('OPTIONS', {}).get('pool'))
+
+        self.stdout.write(
+            f"Database '{alias}' ({settings_dict['ENGINE']}), {iterations} simulated requests\n"
+            f"Configured: CONN_MAX_AGE={configured_max_age}, "
+            f"CONN_HEALTH_CHECKS={settings_dict.get('CONN_HEALTH_CHECKS', False)}, pool={pooled}"
+        )
+
+        # Before: every request opens and closes its own connection.
+        # A pool already reuses connections, so it is bypassed for the baseline.
+        connection.close()
+        original_options = dict(settings_dict.get('OPTIONS', {}))
+        settings_dict['CONN_MAX_AGE'] = 0
+        settings_dict['OPTIONS'] = {key: value for key, value in original_options.items() if key != 'pool'}
+        try:
+            before = self.summarize('CONN_MAX_AGE=0', self.simulate_requests(alias, iterations))
+        finally:
+            connection.close()
+            settings_dict['CONN_MAX_AGE'] = configured_max_age
+            settings_dict['OPTIONS'] = original_options
+
+        # After: the configured settings.
+        if not pooled and configured_max_age == 0:
+            self.stdout.write(self.style.WARNING(
+                'CONN_MAX_AGE is 0 and no pool is configured; set DB_CONN_MAX_AGE or DB_POOL to compare.'
+            ))
+        label = 'pool' if pooled else f'CONN_MAX_AGE={configured_max_age}'
+        after = self.summarize(label, self.simulate_requests(alias, iterations))
+        connection.close()
+
+        saved = before - after
+        self.stdout.write(self.style.SUCCESS(
+            f"Connection overhead saved per request: {saved:.3f} ms "
+            f"({(saved / before * 100) if before else 0:.1f}%)"
+        ))
@@ -0,0 +1,75 @@
+import os
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from cipher.storage import BLOB_DIR, ContentAddressedStorage, file_sha256
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves existing media files into the content-addressed blob store, "
+        "replacing duplicate copies with hard links to a single blob."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report duplicates without changing anything')
+        parser.add_argument('--prune', action='store_true', help='Also remove blobs no file refers to')
+
+    def walk(self, directory):
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name == BLOB_DIR and directory == default_storage.location:
+                        continue
+                    yield from self.walk(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError("The default storage is not cipher.storage.ContentAddressedStorage")
+
+        dry_run = options['dry_run']
+        scanned = 0
+        interned = 0
+        duplicates = 0
+        freed = 0
+        seen = {}
+
+        for entry in self.walk(default_storage.location):
+            scanned += 1
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_nlink > 1:
+                # Already linked into the blob store
+                continue
+
+            if dry_run:
+                sha256 = file_sha256(entry.path)
+                if sha256 in seen or default_storage.reference_count(sha256):
+                    duplicates += 1
+                    freed += stat.st_size
+                seen[sha256] = True
+                continue
+
+            _, saved = default_storage.intern(entry.path)
+            interned += 1
+            if saved:
+                duplicates += 1
+                freed += saved
+            if interned % 500 == 0:
+                self.stdout.write(f"  {interned} files interned...")
+
+        pruned = 0
+        if options['prune']:
+            for blob in default_storage.unreferenced_blobs():
+                if not dry_run:
+                    os.remove(blob)
+                pruned += 1
+
+        prefix = 'Would free' if dry_run else 'Freed'
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} files, interned {interned}, {duplicates} duplicate(s). "
+            f"{prefix} {freed / (1024 * 1024):.2f} MB"
+            + (f", {pruned} unreferenced blob(s) {'to prune' if dry_run else 'pruned'}" if options['prune'] else '')
+        ))
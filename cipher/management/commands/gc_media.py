@@ -0,0 +1,149 @@
+import os
+import time
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from cipher.images import THUMBNAIL_PREFIX, is_image
+from cipher.storage import BLOB_DIR, ContentAddressedStorage
+
+
+# Rows whose files may be released with --release, as exclude() filters per model
+RELEASE_FILTERS = {
+    'deleted_clients': {
+        'clientapp.ClientDocument': {'client__is_deleted': True},
+    },
+    'terminated_employees': {
+        'emplyees.CustomUser': {'current_status': 'terminated'},
+        'emplyees.EmployeeDocument': {'user__current_status': 'terminated'},
+        'emplyees.EmployeeMedia': {'user__current_status': 'terminated'},
+        'emplyees.LeaveManagement': {'employee__current_status': 'terminated'},
+        'leaves.LeaveApplication': {'employee__current_status': 'terminated'},
+    },
+}
+
+# Staging areas that are never garbage collected
+SKIPPED_DIRS = {BLOB_DIR}
+
+
+class Command(BaseCommand):
+    help = (
+        "Finds media files that no FileField references any more (e.g. left behind "
+        "by deleted documents) and reports or removes them in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete', action='store_true', help='Remove orphans (default is report only)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Orphans reported/removed per batch')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per query chunk')
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=24,
+            help='Ignore files modified within this many hours (uploads whose row is not committed yet)'
+        )
+        parser.add_argument(
+            '--release',
+            action='append',
+            choices=sorted(RELEASE_FILTERS),
+            default=[],
+            help='Treat files of soft-deleted clients / terminated employees as unreferenced'
+        )
+
+    def file_fields(self):
+        for model in apps.get_models():
+            fields = [
+                field.attname for field in model._meta.concrete_fields
+                if isinstance(field, models.FileField)
+            ]
+            if fields:
+                yield model, fields
+
+    def referenced_names(self, chunk_size, releases):
+        referenced = set()
+        for model, fields in self.file_fields():
+            queryset = model._default_manager.all()
+            for release in releases:
+                exclude = RELEASE_FILTERS[release].get(model._meta.label)
+                if exclude:
+                    queryset = queryset.exclude(**exclude)
+            for row in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+                referenced.update(name for name in row if name)
+            self.stdout.write(f"  {model._meta.label}: {', '.join(fields)}")
+        return referenced
+
+    def walk(self, directory, root):
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if directory == root and entry.name in SKIPPED_DIRS:
+                        continue
+                    yield from self.walk(entry.path, root)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+    def thumbnail_source(self, name):
+        # thumbnails/<original without extension>_<size>.<ext> -> <original without extension>
+        base = os.path.splitext(name[len(THUMBNAIL_PREFIX) + 1:])[0]
+        return base.rsplit('_', 1)[0]
+
+    def flush(self, batch, delete):
+        size = sum(entry_size for _, entry_size in batch)
+        for name, _ in batch:
+            if delete:
+                default_storage.delete(name)
+            else:
+                self.stdout.write(f"  orphan: {name}")
+        action = 'Removed' if delete else 'Found'
+        self.stdout.write(f"{action} {len(batch)} orphan(s), {size / (1024 * 1024):.2f} MB")
+
+    def handle(self, *args, **options):
+        root = default_storage.location
+        delete = options['delete']
+        cutoff = time.time() - options['min_age'] * 3600
+
+        self.stdout.write("Loading referenced files:")
+        referenced = self.referenced_names(options['chunk_size'], options['release'])
+        image_bases = {os.path.splitext(name)[0] for name in referenced if is_image(name)}
+
+        scanned = 0
+        orphans = 0
+        orphan_bytes = 0
+        batch = []
+        for entry in self.walk(root, root):
+            scanned += 1
+            name = os.path.relpath(entry.path, root).replace(os.sep, '/')
+            if name in referenced:
+                continue
+            if name.startswith(THUMBNAIL_PREFIX + '/') and self.thumbnail_source(name) in image_bases:
+                continue
+
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > cutoff:
+                continue
+
+            orphans += 1
+            orphan_bytes += stat.st_size
+            batch.append((name, stat.st_size))
+            if len(batch) >= options['batch_size']:
+                self.flush(batch, delete)
+                batch = []
+
+        if batch:
+            self.flush(batch, delete)
+
+        pruned = 0
+        if delete and isinstance(default_storage, ContentAddressedStorage):
+            # Orphans that were the last link to a blob already dropped it; catch any stragglers
+            for blob in default_storage.unreferenced_blobs():
+                os.remove(blob)
+                pruned += 1
+
+        action = 'removed' if delete else 'found (run with --delete to remove)'
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} files against {len(referenced)} references: "
+            f"{orphans} orphan(s), {orphan_bytes / (1024 * 1024):.2f} MB {action}"
+            + (f"; pruned {pruned} unreferenced blob(s)" if pruned else '')
+        ))
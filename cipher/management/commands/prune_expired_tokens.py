@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired refresh tokens from the outstanding token list, together with their "
+        "blacklist entries, in batches. Run it daily (e.g. from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tokens deleted per query')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be removed')
+
+    def handle(self, *args, **options):
+        # Expired tokens fail verification whether or not they are blacklisted
+        expired = OutstandingToken.objects.filter(expires_at__lte=timezone.now()).order_by()
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Would remove {expired.count()} expired token(s)"))
+            return
+
+        removed = blacklisted = 0
+        while True:
+            ids = list(expired.values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            # Short batches keep row locks and transactions small on a live database
+            _, deleted = OutstandingToken.objects.filter(id__in=ids).only('id').delete()
+            removed += deleted.get('token_blacklist.OutstandingToken', 0)
+            blacklisted += deleted.get('token_blacklist.BlacklistedToken', 0)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} expired token(s), {blacklisted} of them blacklisted"
+        ))
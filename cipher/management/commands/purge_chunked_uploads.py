@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from cipher.models import ChunkedUpload
+from cipher.uploads import discard_chunks
+
+
+class Command(BaseCommand):
+    help = "Deletes chunked uploads that were abandoned or completed, together with their staged chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=settings.CHUNKED_UPLOAD_EXPIRY_HOURS,
+            help='Remove unfinished uploads with no activity for this many hours'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be removed')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = ChunkedUpload.objects.filter(status='uploading', updated_at__lt=cutoff)
+        completed = ChunkedUpload.objects.filter(status='complete', updated_at__lt=cutoff)
+
+        removed = 0
+        for upload in stale.iterator():
+            if not options['dry_run']:
+                discard_chunks(upload)
+                upload.delete()
+            removed += 1
+
+        completed_count = completed.count()
+        if not options['dry_run']:
+            completed.delete()
+
+        prefix = 'Would remove' if options['dry_run'] else 'Removed'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {removed} abandoned upload(s) and {completed_count} completed upload record(s)"
+        ))
@@ -0,0 +1,147 @@
+"""
+Protected media.
+
+Files under MEDIA_ROOT are no longer served as static files. ProtectedMediaView
+checks access and then hands the transfer to the web server:
+
+- PROTECTED_MEDIA_SERVER = 'nginx': X-Accel-Redirect to PROTECTED_MEDIA_INTERNAL_URL
+  (an `internal` nginx location aliased to MEDIA_ROOT)
+- PROTECTED_MEDIA_SERVER = 'sendfile': X-Sendfile with the absolute path
+  (Apache mod_xsendfile, lighttpd)
+- otherwise (dev): the file is streamed by Django, with Range support
+
+Browsers cannot attach the JWT header to <img>/<a> requests, so the storage
+signs every URL it generates with an expiry. A request is allowed either with
+a valid signature or with an authenticated user that passes the path's rule.
+"""
+import mimetypes
+import os
+import re
+import time
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage
+from django.utils.http import http_date
+
+from .permissions import has_capability
+
+
+MEDIA_SIGNING_SALT = 'cipher.media'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _signature_value(name, expires):
+    return f"{name}:{expires}"
+
+
+def sign_media_path(name, max_age=None):
+    """
+    Query parameters granting access to a media path until the expiry.
+    The expiry is rounded to a max_age boundary so the same file keeps the
+    same URL for a while (browser and response caches stay effective).
+    """
+    max_age = max_age or settings.PROTECTED_MEDIA_URL_MAX_AGE
+    expires = (int(time.time()) // max_age + 2) * max_age
+    signature = signing.Signer(salt=MEDIA_SIGNING_SALT).signature(_signature_value(name, expires))
+    return {'expires': expires, 'sig': signature}
+
+
+def check_media_signature(name, expires, signature):
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if expires < time.time():
+        return False
+    expected = signing.Signer(salt=MEDIA_SIGNING_SALT).signature(_signature_value(name, expires))
+    return signing.constant_time_compare(expected, signature or '')
+
+
+class ProtectedMediaStorage(FileSystemStorage):
+    """
+    FileSystemStorage whose URLs carry an expiring signature.
+    """
+
+    def url(self, name):
+        url = super().url(name)
+        if not getattr(settings, 'PROTECTED_MEDIA_SIGNED_URLS', True) or name is None:
+            return url
+        return f"{url}?{urlencode(sign_media_path(name.replace(os.sep, '/')))}"
+
+
+def _can_view_leave_attachment(user, name):
+    # Both leave models upload here: LeaveManagement (employees' own leave
+    # requests) and LeaveApplication (the admin leave page)
+    from emplyees.models import LeaveManagement
+    from leaves.models import LeaveApplication
+
+    if has_capability(user, 'manage_leaves') or LeaveManagement.objects.filter(attachment=name, employee=user).exists():
+        return True
+    if has_capability(user, 'review_leave_applications'):
+        return LeaveApplication.objects.filter(attachment=name).exists()
+    return LeaveApplication.objects.filter(attachment=name, employee=user).exists()
+
+
+# Extra rules per upload directory; anything else only needs an authenticated user,
+# the same as the API endpoints that list these files
+MEDIA_ACCESS_RULES = {
+    'leave_attachments': _can_view_leave_attachment,
+}
+
+
+def user_can_access_media(user, name):
+    if not user or not user.is_authenticated:
+        return False
+    rule = MEDIA_ACCESS_RULES.get(name.split('/', 1)[0])
+    return rule(user, name) if rule else True
+
+
+def parse_range_header(header, size):
+    """
+    Parses a single "bytes=start-end" range. Returns (start, end) inclusive,
+    None when the header is absent or unsupported (serve the whole file) and
+    False when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def iter_file_range(path, start, length, chunk_size=STREAM_CHUNK_SIZE):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def media_headers(response, name, stat, cache_control=None):
+    content_type, encoding = mimetypes.guess_type(name)
+    response['Content-Type'] = content_type or 'application/octet-stream'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Content-Disposition'] = f"inline; filename*=UTF-8''{quote(os.path.basename(name))}"
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = cache_control or 'private, max-age=3600'
+    return response
@@ -0,0 +1,127 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from .profiling import current_profile, end_profile, start_profile
+
+
+logger = logging.getLogger('cipher.requests')
+
+
+class RequestProfilingMiddleware:
+    """
+    Records query count, DB time, view/render time and response size
+    per request; see cipher/profiling.py. A sample of requests (and every slow
+    or query-heavy one) is logged; with REQUEST_PROFILING_SERVER_TIMING
+    (DEBUG by default) responses also get a Server-Timing header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_PROFILING_ENABLED', True)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        profile, token = start_profile()
+        try:
+            with ExitStack() as stack:
+                # Wrappers live on the (thread-local) connection objects, which
+                # don't need an open database connection to accept them
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.query_wrapper))
+                response = self.get_response(request)
+        finally:
+            end_profile(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        # Async views run their queries in worker threads with their own
+        # connections, so only timing and size are recorded here
+        profile, token = start_profile()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_profile(token)
+        return self.finish(request, response, profile)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = current_profile()
+        if profile is not None:
+            profile.view_started = (time.perf_counter(), profile.db_ms)
+        return None
+
+    def process_template_response(self, request, response):
+        # The view has just returned: whatever it spent outside the database
+        # is mostly serialization. DRF Responses render after this point, so
+        # the JSON encoding is timed separately
+        profile = current_profile()
+        if profile is not None:
+            if profile.view_started is not None:
+                started, db_ms = profile.view_started
+                view_ms = (time.perf_counter() - started) * 1000 - (profile.db_ms - db_ms)
+                profile.add_segment('view', view_ms)
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: profile.add_segment('render', (time.perf_counter() - start) * 1000)
+            )
+        return response
+
+    def finish(self, request, response, profile):
+        total_ms = profile.elapsed_ms()
+        if response.streaming:
+            size = int(response.get('Content-Length') or 0) or None
+        else:
+            size = len(response.content)
+
+        match = getattr(request, 'resolver_match', None)
+        metrics = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'duration_ms': round(total_ms, 2),
+            'queries': profile.query_count,
+            'db_ms': round(profile.db_ms, 2),
+            'max_duplicate_queries': profile.max_duplicate_queries(),
+            'response_bytes': size,
+        }
+        for name, elapsed in profile.segments.items():
+            metrics[f'{name}_ms'] = round(elapsed, 2)
+
+        if getattr(settings, 'REQUEST_PROFILING_SERVER_TIMING', settings.DEBUG):
+            response['Server-Timing'] = server_timing_header(profile, total_ms)
+
+        slow = total_ms >= settings.REQUEST_PROFILING_SLOW_MS
+        heavy = profile.query_count >= settings.REQUEST_PROFILING_QUERY_THRESHOLD
+        if slow or heavy:
+            metrics['slow'] = slow
+            metrics['query_heavy'] = heavy
+            logger.warning(json.dumps(metrics), extra={'request_metrics': metrics})
+        elif random.random() < settings.REQUEST_PROFILING_SAMPLE_RATE:
+            logger.info(json.dumps(metrics), extra={'request_metrics': metrics})
+        return response
+
+
+def server_timing_header(profile, total_ms):
+    parts = [f'db;dur={profile.db_ms:.1f};desc="{profile.query_count} queries"']
+    for name, elapsed in profile.segments.items():
+        parts.append(f'{name};dur={elapsed:.1f}')
+    parts.append(f'total;dur={total_ms:.1f}')
+    return ', '.join(parts)
+
@@ -0,0 +1,59 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class ChunkedUpload(models.Model):
+    """
+    A resumable upload session; chunks are kept under CHUNKED_UPLOAD_ROOT
+    until the upload is completed and assembled into the target FileField.
+    """
+
+    TARGET_CHOICES = [
+        ('employee_document', 'Employee Document'),
+        ('employee_media', 'Employee Media'),
+        ('client_document', 'Client Document'),
+    ]
+
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='chunked_uploads'
+    )
+    target = models.CharField(max_length=30, choices=TARGET_CHOICES)
+    object_id = models.PositiveIntegerField(help_text="Employee or client the file belongs to")
+    document_type = models.CharField(max_length=50)
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    checksum = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Optional SHA-256 of the whole file, verified on completion"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    result_id = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.filename} ({self.get_target_display()}) - {self.status}"
+
+    @property
+    def total_chunks(self):
+        return max((self.total_size + self.chunk_size - 1) // self.chunk_size, 1)
+
+    def expected_chunk_size(self, index):
+        if index == self.total_chunks - 1:
+            return self.total_size - self.chunk_size * index
+        return self.chunk_size
@@ -0,0 +1,99 @@
+"""
+Role-based permissions.
+
+What each role may do is declared once, as a role -> capability matrix
+(plus the capabilities a few user types grant on their own). Views either
+list the capability per HTTP method for the HasCapability permission
+class, or call has_capability() for checks that also depend on the object
+(e.g. "HR, or the employee themselves"). The check reads only role,
+user_type and is_superuser, which the access token carries (see
+cipher/authentication.py), so it needs no database access. Superusers
+have every capability.
+"""
+from rest_framework.permissions import BasePermission
+
+
+ROLE_CAPABILITIES = {
+    'superuser': {
+        'upload_employee_media', 'view_all_tasks', 'view_all_events', 'archive_work',
+        'review_leave_applications',
+    },
+    'admin': {
+        'manage_leaves', 'review_leave_applications', 'manage_payroll', 'delete_employee_files',
+        'upload_employee_media', 'manage_camera_projects', 'manage_announcements', 'reset_passwords',
+        'view_all_tasks', 'view_all_events', 'archive_work', 'update_task_status',
+        'delete_client_documents', 'view_cache_stats',
+    },
+    'director': {
+        'manage_leaves', 'manage_payroll', 'manage_employees', 'update_employees',
+        'delete_employee_files', 'manage_announcements', 'reset_passwords', 'assign_work',
+        'view_all_events', 'update_task_status', 'delete_client_documents',
+    },
+    'managing_director': {
+        'manage_employees', 'update_employees', 'delete_employee_files', 'manage_announcements',
+        'assign_work', 'view_all_events', 'update_task_status', 'delete_client_documents',
+    },
+    'manager': {'manage_leaves', 'manage_payroll', 'update_employees', 'reset_passwords'},
+    'hr': {'manage_leaves', 'manage_payroll', 'delete_employee_files'},
+    'employee': set(),
+}
+
+USER_TYPE_CAPABILITIES = {
+    'camera_department': {'manage_camera_projects'},
+    'content_creator': {'manage_camera_projects'},
+    'editor': {'manage_camera_projects'},
+    'manager': {'manage_camera_projects', 'review_leave_applications'},
+    'hr': {'manage_camera_projects', 'review_leave_applications'},
+    'director': {'review_leave_applications'},
+    'admin': {'review_leave_applications'},
+}
+
+CAPABILITY_DENIED_MESSAGES = {
+    'manage_leaves': 'You do not have permission to manage leave applications',
+    'review_leave_applications': 'Only admins can process leaves',
+    'manage_payroll': 'You do not have permission to process payments',
+    'manage_employees': 'You do not have permission to manage employees',
+    'update_employees': 'You do not have permission to update employees',
+    'manage_camera_projects': 'You do not have permission to manage camera projects',
+    'manage_announcements': 'Permission denied',
+    'reset_passwords': 'You do not have permission to reset passwords',
+    'assign_work': 'Permission denied',
+    'view_cache_stats': 'Permission denied',
+}
+
+
+def get_capabilities(user):
+    """
+    Capabilities of a user's role and user type; empty for anonymous users.
+    """
+    if not user or not user.is_authenticated:
+        return frozenset()
+    capabilities = set(ROLE_CAPABILITIES.get(user.role or '', ()))
+    capabilities.update(USER_TYPE_CAPABILITIES.get((user.user_type or '').lower(), ()))
+    return frozenset(capabilities)
+
+
+def has_capability(user, capability):
+    if not user or not user.is_authenticated:
+        return False
+    return user.is_superuser or capability in get_capabilities(user)
+
+
+class HasCapability(BasePermission):
+    """
+    Checks the view's `required_capabilities`, a {method: capability} dict
+    ('*' for every method). Methods that aren't listed only need a login.
+    Denials answer {'error': ...} like the rest of the API, with the view's
+    `capability_denied_message` when it sets one.
+    """
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        required = getattr(view, 'required_capabilities', {})
+        capability = required.get(request.method, required.get('*'))
+        if capability is None or has_capability(request.user, capability):
+            return True
+        message = getattr(view, 'capability_denied_message', None)
+        self.message = {'error': message or CAPABILITY_DENIED_MESSAGES.get(capability, 'Permission denied')}
+        return False
@@ -0,0 +1,85 @@
+"""
+Per-request profiling.
+
+RequestProfilingMiddleware (cipher/middleware.py) opens a RequestProfile for
+each request and records:
+
+- db: query count and total time, via connection.execute_wrapper (works with
+  DEBUG off), plus the highest number of repeats of one SQL statement, which
+  is how N+1 patterns show up
+- view: time spent in the view outside the database, i.e. serialization,
+  permission checks and other Python work (template/DRF responses only)
+- render: time spent rendering the response body (JSON encoding)
+- any custom segment wrapped in `with profile_segment('name'):`
+
+Results go to the Server-Timing header and to the 'cipher.requests' logger.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_current_profile = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_ms = 0.0
+        self.statements = Counter()
+        self.segments = {}
+        self.view_started = None
+
+    def add_segment(self, name, elapsed_ms):
+        self.segments[name] = self.segments.get(name, 0.0) + elapsed_ms
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def max_duplicate_queries(self):
+        if not self.statements:
+            return 0
+        return self.statements.most_common(1)[0][1]
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - start) * 1000
+            self.query_count += 1
+            self.statements[sql] += 1
+
+
+def start_profile():
+    profile = RequestProfile()
+    return profile, _current_profile.set(profile)
+
+
+def end_profile(token):
+    _current_profile.reset(token)
+
+
+def current_profile():
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_segment(name):
+    """
+    Adds the wrapped block's duration to the current request's Server-Timing
+    under `name`. A no-op outside a profiled request.
+    """
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_segment(name, (time.perf_counter() - start) * 1000)
+
@@ -0,0 +1,530 @@
+"""
+Synthetic dataset generation.
+
+DatasetBuilder fills every app with related, realistically distributed rows
+using bulk_create, so model save() methods and signals are bypassed: derived
+fields (net/total amounts) are computed here, and the response cache is
+invalidated once at the end. The same seed always produces the same rows
+relative to `today`. Users and clients are numbered from `first_index`, so a
+second dataset can be added on top of an existing one; the finance
+categories are shared.
+
+Rows are generated lazily and inserted batch by batch, so only users,
+clients and a few lookup tables are held in memory; the large ledgers
+(salary/client payments, incomes, expenses) can run to millions of rows.
+
+Used by the query budget tests (cipher/tests.py) and `manage.py seed_scale`.
+"""
+import random
+import time as timer
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+
+SEED_PASSWORD = 'seed-password'
+
+FIRST_NAMES = [
+    'Aarav', 'Vivaan', 'Aditya', 'Arjun', 'Sai', 'Reyansh', 'Ishaan', 'Kabir', 'Rohan', 'Nikhil',
+    'Ananya', 'Diya', 'Saanvi', 'Aadhya', 'Meera', 'Kavya', 'Riya', 'Neha', 'Priya', 'Fathima',
+]
+LAST_NAMES = [
+    'Sharma', 'Verma', 'Nair', 'Menon', 'Iyer', 'Reddy', 'Patel', 'Khan', 'Das', 'Pillai',
+    'Kurian', 'Joseph', 'Thomas', 'George', 'Varghese', 'Gupta', 'Rao', 'Bose', 'Shetty', 'Mathew',
+]
+DEPARTMENTS = ['Creative', 'Production', 'Marketing', 'Development', 'Operations', 'Accounts']
+CLIENT_WORDS = [
+    'Blue', 'Lotus', 'Spice', 'Urban', 'Coastal', 'Golden', 'Green', 'Royal', 'Bright', 'Silver',
+    'Nova', 'Peak', 'Vista', 'Prime', 'Star', 'Maple', 'River', 'Cedar', 'Metro', 'Harbor',
+]
+CLIENT_SUFFIXES = ['Foods', 'Studios', 'Retail', 'Wellness', 'Realty', 'Motors', 'Fashion', 'Labs', 'Cafe', 'Resorts']
+
+# Staff roles used by the permission checks in the views, with how many of each to create
+STAFF_ROLES = [
+    ('admin', None, 2),
+    ('director', None, 1),
+    ('managing_director', None, 1),
+    ('manager', 'manager', 3),
+    ('hr', 'hr', 2),
+]
+EMPLOYEE_USER_TYPES = [
+    ('developer', 15), ('camera_department', 20), ('editor', 25),
+    ('marketer', 15), ('content_creator', 25),
+]
+
+
+# Row counts for `manage.py seed_scale --preset`. Ledger rows (salary and
+# client payments, incomes, expenses) come to roughly 10k / 100k / 1M.
+SCALE_PRESETS = {
+    'small': dict(
+        employees=100, clients=40, months=12, tasks=1000, events=500,
+        leaves=500, incomes=2000, expenses=2000,
+    ),
+    'medium': dict(
+        employees=1000, clients=400, months=36, tasks=20000, events=8000,
+        leaves=8000, incomes=30000, expenses=30000,
+    ),
+    'large': dict(
+        employees=5000, clients=2500, months=60, tasks=200000, events=50000,
+        leaves=60000, incomes=400000, expenses=400000,
+    ),
+}
+
+# Tables that make up the financial ledger, for reporting
+LEDGER_MODELS = ['emplyees.SalaryPayment', 'clientapp.ClientPayment', 'finance.Income', 'finance.Expense']
+
+
+def month_start(value, months_back):
+    month_index = value.year * 12 + value.month - 1 - months_back
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+class DatasetBuilder:
+
+    def __init__(self, employees=200, clients=80, months=12, tasks=600, events=300, leaves=400,
+                 incomes=1000, expenses=1000, seed=42, batch_size=1000, today=None, log=None,
+                 progress_every=100000, first_index=0):
+        self.counts = {
+            'employees': employees,
+            'clients': clients,
+            'months': months,
+            'tasks': tasks,
+            'events': events,
+            'leaves': leaves,
+            'incomes': incomes,
+            'expenses': expenses,
+        }
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.today = today or timezone.now().date()
+        self.first_index = first_index
+        self.log = log or (lambda message: None)
+        self.progress_every = progress_every
+        self.created = {}
+        self.timings = {}
+
+    def choice_weighted(self, weighted):
+        values, weights = zip(*weighted)
+        return self.random.choices(values, weights=weights)[0]
+
+    def money(self, low, high, step=500):
+        return Decimal(self.random.randrange(low, high, step))
+
+    def aware(self, day, hour=10):
+        return timezone.make_aware(datetime.combine(day, time(hour, self.random.randrange(60))))
+
+    def batches(self, objects):
+        iterator = iter(objects)
+        while batch := list(islice(iterator, self.batch_size)):
+            yield batch
+
+    def insert(self, model, batch):
+        label = model._meta.label
+        started = timer.perf_counter()
+        model.objects.bulk_create(batch, batch_size=self.batch_size)
+        before = self.created.get(label, 0)
+        self.created[label] = before + len(batch)
+        self.timings[label] = self.timings.get(label, 0.0) + timer.perf_counter() - started
+        if self.created[label] // self.progress_every > before // self.progress_every:
+            self.log(f"  {label}: {self.created[label]:,} rows...")
+
+    def report(self, model):
+        label = model._meta.label
+        count = self.created.get(label, 0)
+        elapsed = self.timings.get(label, 0.0)
+        rate = f", {count / elapsed:,.0f} rows/s" if elapsed else ''
+        self.log(f"{label}: {count:,} rows in {elapsed:.1f}s{rate}")
+
+    def bulk(self, model, objects, keep=False):
+        """
+        Inserts `objects` (any iterable) in batches. Returns the created
+        instances, with primary keys, when `keep` is set.
+        """
+        kept = []
+        for batch in self.batches(objects):
+            self.insert(model, batch)
+            if keep:
+                kept.extend(batch)
+        self.report(model)
+        return kept
+
+    def lookup_rows(self, model, names):
+        """
+        Rows of a lookup table with a unique name, creating the missing ones.
+        """
+        existing = list(model.objects.filter(name__in=names))
+        known = {row.name for row in existing}
+        return existing + self.bulk(model, [model(name=name) for name in names if name not in known], keep=True)
+
+    def build(self):
+        """
+        Creates the whole dataset in one transaction and returns the
+        created row counts per model.
+        """
+        from cipher.cache import RESPONSE_CACHE_NAMESPACES, invalidate_namespace
+
+        with transaction.atomic():
+            self.build_users()
+            self.build_clients()
+            self.build_salary_payments()
+            self.build_client_payments()
+            self.build_tasks()
+            self.build_events()
+            self.build_leaves()
+            self.build_announcements()
+            self.build_camera_projects()
+            self.build_finance()
+            self.build_verifications()
+            self.build_content_delivery()
+        invalidate_namespace(*RESPONSE_CACHE_NAMESPACES)
+        return self.created
+
+    def build_users(self):
+        from emplyees.models import CustomUser, LeaveBalance
+
+        password = make_password(SEED_PASSWORD)
+        users = []
+        staff = [(role, user_type) for role, user_type, count in STAFF_ROLES for _ in range(count)]
+        for index in range(self.counts['employees']):
+            if index < len(staff):
+                role, user_type = staff[index]
+            else:
+                role, user_type = 'employee', self.choice_weighted(EMPLOYEE_USER_TYPES)
+            first = self.random.choice(FIRST_NAMES)
+            last = self.random.choice(LAST_NAMES)
+            joined = self.today - timedelta(days=self.random.randrange(30, max(365 * 5, 30 * self.counts['months'])))
+            number = self.first_index + index
+            users.append(CustomUser(
+                username=f"seed{number:05d}",
+                email=f"seed{number:05d}@example.com",
+                password=password,
+                first_name=first,
+                last_name=last,
+                role=role,
+                user_type=user_type,
+                salary=self.money(18000, 150000, 1000),
+                current_status=self.choice_weighted([
+                    ('active', 85), ('on_leave', 4), ('probation_period', 6),
+                    ('notice_period', 3), ('inactive', 2),
+                ]),
+                joining_date=joined,
+                date_of_birth=date(self.random.randrange(1975, 2003), self.random.randrange(1, 13), self.random.randrange(1, 29)),
+                gender=self.random.choice(['male', 'female']),
+                employee_id=f"SEED{number:05d}",
+                department=self.random.choice(DEPARTMENTS),
+                designation=(user_type or role).replace('_', ' ').title(),
+                phone_number=f"9{self.random.randrange(10 ** 8, 10 ** 9)}",
+            ))
+        self.users = self.bulk(CustomUser, users, keep=True)
+        self.staff = self.users[:len(staff)]
+        self.bulk(LeaveBalance, (
+            LeaveBalance(employee=user, year=self.today.year) for user in self.users
+        ))
+
+    def build_clients(self):
+        from clientapp.models import Client
+
+        clients = []
+        for index in range(self.counts['clients']):
+            onboarded = self.today - timedelta(days=self.random.randrange(30, max(365 * 3, 30 * self.counts['months'])))
+            retainer = self.money(15000, 250000, 2500)
+            number = self.first_index + index
+            clients.append(Client(
+                client_name=f"{self.random.choice(CLIENT_WORDS)} {self.random.choice(CLIENT_SUFFIXES)} {number:04d}",
+                client_type=self.choice_weighted([('company', 60), ('brand', 25), ('individual', 10), ('agency', 5)]),
+                industry=self.random.choice([choice for choice, _ in Client.INDUSTRY_CHOICES]),
+                contact_person_name=f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}",
+                contact_email=f"client{number:04d}@example.com",
+                contact_phone=f"8{self.random.randrange(10 ** 8, 10 ** 9)}",
+                videos_per_month=self.random.randrange(2, 20),
+                posters_per_month=self.random.randrange(4, 40),
+                status=self.choice_weighted([('active', 70), ('inactive', 10), ('on_hold', 8), ('prospect', 12)]),
+                onboarding_date=onboarded,
+                contract_start_date=onboarded,
+                contract_end_date=onboarded + timedelta(days=365 * self.random.randrange(1, 4)),
+                payment_cycle=self.choice_weighted([('monthly', 80), ('quarterly', 15), ('yearly', 5)]),
+                monthly_retainer=retainer,
+                city=self.random.choice(['Kochi', 'Bengaluru', 'Chennai', 'Mumbai', 'Dubai']),
+                is_deleted=self.random.random() < 0.03,
+                created_by=self.random.choice(self.staff),
+            ))
+        self.clients = self.bulk(Client, clients, keep=True)
+        self.active_clients = [client for client in self.clients if not client.is_deleted]
+
+    def build_salary_payments(self):
+        from emplyees.models import SalaryPayment
+
+        def payments():
+            for months_back in range(self.counts['months']):
+                period = month_start(self.today, months_back)
+                for user in self.users:
+                    if user.joining_date > period:
+                        continue
+                    incentives = self.money(0, 10000, 500) if self.random.random() < 0.3 else Decimal('0')
+                    deductions = self.money(0, 3000, 250) if self.random.random() < 0.15 else Decimal('0')
+                    paid = months_back > 0 or self.random.random() < 0.6
+                    scheduled = month_start(self.today, months_back - 1) - timedelta(days=1)
+                    yield SalaryPayment(
+                        employee=user,
+                        month=period.month,
+                        year=period.year,
+                        base_salary=user.salary,
+                        incentives=incentives,
+                        deductions=deductions,
+                        net_amount=user.salary + incentives - deductions,
+                        scheduled_date=scheduled,
+                        status='paid' if paid else 'pending',
+                        payment_date=self.aware(scheduled) if paid else None,
+                        payment_method='bank_transfer' if paid else None,
+                        processed_by=self.random.choice(self.staff) if paid else None,
+                    )
+
+        self.bulk(SalaryPayment, payments())
+
+    def build_client_payments(self):
+        from clientapp.models import ClientPayment
+
+        def payments():
+            for months_back in range(self.counts['months']):
+                period = month_start(self.today, months_back)
+                for client in self.active_clients:
+                    if client.onboarding_date > period:
+                        continue
+                    tax = (client.monthly_retainer * Decimal('0.18')).quantize(Decimal('0.01'))
+                    status = 'paid' if months_back > 1 else self.choice_weighted([
+                        ('paid', 55), ('pending', 30), ('overdue', 10), ('partial', 5),
+                    ])
+                    scheduled = month_start(self.today, months_back - 1) - timedelta(days=1)
+                    yield ClientPayment(
+                        client=client,
+                        month=period.month,
+                        year=period.year,
+                        amount=client.monthly_retainer,
+                        tax_amount=tax,
+                        net_amount=client.monthly_retainer + tax,
+                        scheduled_date=scheduled,
+                        status=status,
+                        payment_date=self.aware(scheduled) if status == 'paid' else None,
+                        payment_method=self.random.choice(['bank_transfer', 'upi']) if status == 'paid' else None,
+                        processed_by=self.random.choice(self.staff) if status == 'paid' else None,
+                    )
+
+        self.bulk(ClientPayment, payments())
+
+    def build_tasks(self):
+        from task.models import Task
+
+        def tasks():
+            now = timezone.now()
+            task_types = [choice for choice, _ in Task.TASK_TYPES]
+            for index in range(self.counts['tasks']):
+                status = self.choice_weighted([('completed', 45), ('in_progress', 25), ('pending', 20), ('scheduled', 10)])
+                yield Task(
+                    title=f"Task {index:06d}",
+                    description="Generated task",
+                    assignee=self.random.choice(self.users),
+                    status=status,
+                    priority=self.choice_weighted([('low', 25), ('medium', 50), ('high', 25)]),
+                    task_type=self.random.choice(task_types),
+                    client=self.random.choice(self.active_clients) if self.random.random() < 0.8 else None,
+                    completed_at=now - timedelta(days=self.random.randrange(0, 30 * self.counts['months'])) if status == 'completed' else None,
+                    created_by=self.random.choice(self.staff),
+                )
+
+        self.bulk(Task, tasks())
+
+    def build_events(self):
+        from events.models import Event
+
+        def events():
+            span_days = 30 * self.counts['months']
+            event_types = [choice for choice, _ in Event.EVENT_TYPE_CHOICES]
+            for index in range(self.counts['events']):
+                day = self.today + timedelta(days=self.random.randrange(-span_days, 60))
+                yield Event(
+                    name=f"Event {index:06d}",
+                    event_date=self.aware(day, self.random.randrange(9, 18)),
+                    event_type=self.random.choice(event_types),
+                    assigned_employee=self.random.choice(self.users),
+                    created_by=self.random.choice(self.staff),
+                    status='completed' if day < self.today else 'scheduled',
+                    duration_minutes=self.random.choice([30, 60, 90, 120]),
+                )
+
+        self.bulk(Event, events())
+
+    def build_leaves(self):
+        from emplyees.models import LeaveManagement
+        from leaves.models import LeaveApplication
+
+        def leaves():
+            span_days = 30 * self.counts['months']
+            categories = [('Casual Leave', 40), ('Sick Leave', 30), ('Annual Leave', 20), ('WFH', 7), ('LOP', 3)]
+            for _ in range(self.counts['leaves']):
+                employee = self.random.choice(self.users)
+                start = self.today + timedelta(days=self.random.randrange(-span_days, 45))
+                days = self.choice_weighted([(1, 55), (2, 20), (3, 12), (5, 8), (10, 5)])
+                end = start + timedelta(days=days - 1)
+                category = self.choice_weighted(categories)
+                status = 'pending' if start > self.today else self.choice_weighted([('approved', 80), ('rejected', 12), ('pending', 8)])
+                approver = self.random.choice(self.staff) if status != 'pending' else None
+                leave = LeaveManagement(
+                    employee=employee,
+                    category=category,
+                    start_date=start.isoformat(),
+                    end_date=end.isoformat(),
+                    start_day=start,
+                    end_day=end,
+                    total_days=Decimal(days),
+                    reason='Generated leave',
+                    status=status,
+                    approved_by=approver,
+                    approved_at=self.aware(start - timedelta(days=1)) if approver else None,
+                )
+                application = LeaveApplication(
+                    employee=employee,
+                    leave_type=category,
+                    start_date=start,
+                    end_date=end,
+                    total_days=Decimal(days),
+                    reason='Generated leave',
+                    status=status,
+                    approved_by=approver,
+                )
+                yield leave, application
+
+        # Both tables are drawn from the same rows, so insert them batch by batch together
+        for batch in self.batches(leaves()):
+            self.insert(LeaveManagement, [leave for leave, _ in batch])
+            self.insert(LeaveApplication, [application for _, application in batch])
+        self.report(LeaveManagement)
+        self.report(LeaveApplication)
+
+    def build_announcements(self):
+        from emplyees.models import Announcement
+
+        self.bulk(Announcement, [
+            Announcement(
+                title=f"Announcement {index:04d}",
+                description="Generated announcement",
+                created_by=self.random.choice(self.staff),
+                is_active=index % 5 != 0,
+            )
+            for index in range(max(self.counts['employees'] // 10, 5))
+        ])
+
+    def build_camera_projects(self):
+        from emplyees.models import CameraDepartment
+
+        crew = [user for user in self.users if user.user_type == 'camera_department'] or self.users
+        self.bulk(CameraDepartment, [
+            CameraDepartment(
+                employee=self.random.choice(crew),
+                client=self.random.choice(self.active_clients),
+                uploaded_date=self.today - timedelta(days=self.random.randrange(0, 30 * self.counts['months'])),
+                priority=self.random.choice(['high', 'medium', 'low', 'urgent']),
+                link=f"https://drive.example.com/project/{index}",
+            )
+            for index in range(len(self.active_clients) * 2)
+        ])
+
+    def build_finance(self):
+        from finance.models import Expense, ExpenseCategory, Income, IncomeCategory
+
+        income_categories = self.lookup_rows(IncomeCategory, ['Retainers', 'Projects', 'Consulting', 'Ad Management', 'Other'])
+        expense_categories = self.lookup_rows(ExpenseCategory, ['Salaries', 'Rent', 'Software', 'Equipment', 'Travel', 'Marketing'])
+
+        span_days = 30 * self.counts['months']
+
+        def incomes():
+            for index in range(self.counts['incomes']):
+                amount = self.money(5000, 300000, 500)
+                gst = (amount * Decimal('0.18')).quantize(Decimal('0.01'))
+                recurring = self.random.random() < 0.1
+                client = self.random.choice(self.active_clients)
+                yield Income(
+                    type=self.choice_weighted([('client_payment', 70), ('consulting_fee', 15), ('product_sale', 10), ('other_income', 5)]),
+                    amount=amount,
+                    gst_amount=gst,
+                    gst_rate=Decimal('18.00'),
+                    total_amount=amount + gst,
+                    category=self.random.choice(income_categories),
+                    date=self.today - timedelta(days=self.random.randrange(0, span_days)),
+                    client_name=client.client_name,
+                    reference_number=f"INV-{index:07d}",
+                    is_recurring=recurring,
+                    recurring_frequency='monthly' if recurring else None,
+                    payment_method=self.random.choice(['bank_transfer', 'digital_wallet', 'check']),
+                    payment_status=self.choice_weighted([('completed', 85), ('pending', 12), ('failed', 3)]),
+                    created_by=self.random.choice(self.staff),
+                )
+
+        self.bulk(Income, incomes())
+
+        def expenses():
+            expense_types = [choice for choice, _ in Expense.EXPENSE_TYPES]
+            for index in range(self.counts['expenses']):
+                recurring = self.random.random() < 0.15
+                yield Expense(
+                    type=self.random.choice(expense_types),
+                    amount=self.money(500, 120000, 250),
+                    category=self.random.choice(expense_categories),
+                    date=self.today - timedelta(days=self.random.randrange(0, span_days)),
+                    vendor_name=f"Vendor {self.random.randrange(1, 60):02d}",
+                    reference_number=f"EXP-{index:07d}",
+                    is_recurring=recurring,
+                    recurring_frequency='monthly' if recurring else None,
+                    payment_method=self.random.choice(['bank_transfer', 'credit_card', 'cash']),
+                    payment_status=self.choice_weighted([('completed', 90), ('pending', 10)]),
+                    created_by=self.random.choice(self.staff),
+                )
+
+        self.bulk(Expense, expenses())
+
+    def build_verifications(self):
+        from verification.models import ClientVerification, MonthlyVerification
+
+        verifications = self.bulk(ClientVerification, [
+            ClientVerification(
+                client=client,
+                verified_by=self.random.choice(self.staff),
+                is_completed=self.random.random() < 0.5,
+                # Roughly a third of the board has already been closed for this month
+                verified_date=self.aware(self.today) if self.random.random() < 0.35 else None,
+            )
+            for client in self.active_clients
+        ], keep=True)
+
+        def monthly():
+            for verification in verifications:
+                client = verification.client
+                for months_back in range(min(self.counts['months'], 6)):
+                    period = month_start(self.today, months_back)
+                    done = months_back > 0
+                    yield MonthlyVerification(
+                        clientverification=verification,
+                        month=period.month,
+                        year=period.year,
+                        is_verified=done,
+                        posters_completed=client.posters_per_month if done else self.random.randrange(0, client.posters_per_month + 1),
+                        videos_completed=client.videos_per_month if done else self.random.randrange(0, client.videos_per_month + 1),
+                        posters_posted=client.posters_per_month if done else 0,
+                        videos_posted=client.videos_per_month if done else 0,
+                    )
+
+        self.bulk(MonthlyVerification, monthly())
+
+    def build_content_delivery(self):
+        # bulk_create skips the signals that keep the delivery counters current
+        from verification.delivery import rebuild_content_delivery
+        from verification.models import ContentDelivery
+
+        started = timer.perf_counter()
+        label = ContentDelivery._meta.label
+        self.created[label] = rebuild_content_delivery(batch_size=self.batch_size)
+        self.timings[label] = timer.perf_counter() - started
+        self.report(ContentDelivery)
@@ -0,0 +1,71 @@
+import re
+
+from django.conf import settings
+from rest_framework import serializers
+
+from .models import ChunkedUpload
+from .uploads import get_upload_target, received_chunks
+
+
+SHA256_RE = re.compile(r'^[0-9a-fA-F]{64}$')
+
+
+#chunked upload serializer (for reading)
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    total_chunks = serializers.IntegerField(read_only=True)
+    received_chunks = serializers.SerializerMethodField()
+    missing_chunks = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChunkedUpload
+        fields = [
+            'id', 'target', 'object_id', 'document_type', 'filename', 'total_size',
+            'chunk_size', 'total_chunks', 'received_chunks', 'missing_chunks',
+            'checksum', 'status', 'result_id', 'created_at', 'updated_at',
+        ]
+
+    def get_received_chunks(self, obj):
+        return received_chunks(obj)
+
+    def get_missing_chunks(self, obj):
+        if obj.status == 'complete':
+            return []
+        return sorted(set(range(obj.total_chunks)) - set(received_chunks(obj)))
+
+
+#chunked upload start serializer
+class ChunkedUploadCreateSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.IntegerField(required=False, min_value=64 * 1024)
+
+    class Meta:
+        model = ChunkedUpload
+        fields = ['target', 'object_id', 'document_type', 'filename', 'total_size', 'chunk_size', 'checksum']
+
+    def validate_filename(self, value):
+        value = value.replace('\\', '/').split('/')[-1].strip()
+        if not value:
+            raise serializers.ValidationError("Filename is required.")
+        return value
+
+    def validate_total_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("File is empty.")
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            max_mb = settings.CHUNKED_UPLOAD_MAX_SIZE // (1024 * 1024)
+            raise serializers.ValidationError(f"File size cannot exceed {max_mb}MB.")
+        return value
+
+    def validate_chunk_size(self, value):
+        return min(value, settings.CHUNKED_UPLOAD_CHUNK_SIZE)
+
+    def validate_checksum(self, value):
+        if value and not SHA256_RE.match(value):
+            raise serializers.ValidationError("Checksum must be a SHA-256 hex digest.")
+        return value.lower()
+
+    def validate(self, data):
+        target = get_upload_target(data['target'])
+        if data['document_type'] not in target['document_types']:
+            raise serializers.ValidationError({'document_type': f"Invalid type for {data['target']}."})
+        data.setdefault('chunk_size', settings.CHUNKED_UPLOAD_CHUNK_SIZE)
+        return data
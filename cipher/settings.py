@@ -52,11 +52,13 @@ INSTALLED_APPS = [
     'corsheaders',
     'rest_framework',
     'rest_framework_simplejwt.token_blacklist',
-    'django_filters'
+    'django_filters',
+    'cipher',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'cipher.middleware.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -69,15 +71,54 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'cipher.urls'
 
+# Request profiling (cipher/middleware.py): Server-Timing headers and
+# structured 'cipher.requests' logs. Slow or query-heavy requests are always
+# logged; the rest are sampled. The header shows every client the DB time and
+# query count, so it is only sent in development unless turned on.
+REQUEST_PROFILING_ENABLED = config('REQUEST_PROFILING_ENABLED', default=True, cast=bool)
+REQUEST_PROFILING_SERVER_TIMING = config('REQUEST_PROFILING_SERVER_TIMING', default=DEBUG, cast=bool)
+REQUEST_PROFILING_SAMPLE_RATE = config('REQUEST_PROFILING_SAMPLE_RATE', default=0.05, cast=float)
+REQUEST_PROFILING_SLOW_MS = config('REQUEST_PROFILING_SLOW_MS', default=500, cast=int)
+REQUEST_PROFILING_QUERY_THRESHOLD = config('REQUEST_PROFILING_QUERY_THRESHOLD', default=50, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'plain',
+        },
+    },
+    'loggers': {
+        'cipher': {
+            'handlers': ['console'],
+            'level': config('CIPHER_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 
 REST_FRAMEWORK = {
      'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'cipher.authentication.ClaimsJWTAuthentication',
       ],
+     # nginx appends the client address to X-Forwarded-For; earlier entries
+     # come from the client and would let it pick its own throttle bucket
+     'NUM_PROXIES': 1,
 }
 
 AUTH_USER_MODEL = 'emplyees.CustomUser'
 
+# Username or email login with a single lookup (see emplyees/backends.py)
+AUTHENTICATION_BACKENDS = ['emplyees.backends.UsernameOrEmailBackend']
+
 
 CORS_ALLOWED_ORIGINS = [
      "https://cipherpeak.vercel.app"
@@ -106,7 +147,8 @@ SIMPLE_JWT = {
      'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
      'REFRESH_TOKEN_LIFETIME': timedelta(days=9),
      'ROTATE_REFRESH_TOKENS': True,
-     'BLACKLIST_AFTER_ROTATION': True
+     'BLACKLIST_AFTER_ROTATION': True,
+     'TOKEN_REFRESH_SERIALIZER': 'cipher.authentication.ClaimsTokenRefreshSerializer',
 }
  
 TEMPLATES = [
@@ -138,9 +180,73 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST'),
         'PORT': config('DB_PORT'),
+        # Keep connections open between requests instead of reconnecting every time.
+        # Health checks drop a dead persistent connection before it is reused.
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        'OPTIONS': {
+            'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+        },
     }
 }
 
+# Optional native connection pool (requires psycopg 3 instead of psycopg2).
+# Django does not allow a pool together with persistent connections, so
+# CONN_MAX_AGE is forced to 0 when the pool is enabled.
+if config('DB_POOL', default=False, cast=bool):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+        'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Redis when REDIS_URL is set (production), otherwise local memory or a file
+# cache (CACHE_BACKEND / CACHE_LOCATION) for development and tests.
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+            'LOCATION': config('CACHE_LOCATION', default='cipher-default'),
+        }
+    }
+
+# Cached API responses (see cipher/cache.py)
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Cached used-leave totals per employee and year, dropped on leave changes (see emplyees/leave_balances.py)
+LEAVE_BALANCE_CACHE_TIMEOUT = config('LEAVE_BALANCE_CACHE_TIMEOUT', default=86400, cast=int)
+# Cached team availability months, dropped on leave/event changes (see emplyees/availability.py)
+AVAILABILITY_CACHE_TIMEOUT = config('AVAILABILITY_CACHE_TIMEOUT', default=86400, cast=int)
+
+# Build request.user from access token claims while the token version
+# matches the cached one (see cipher/authentication.py). Versions live in the
+# cache, so this needs a cache all workers share: on by default with Redis only.
+JWT_TRUST_TOKEN_CLAIMS = config('JWT_TRUST_TOKEN_CLAIMS', default=bool(REDIS_URL), cast=bool)
+TOKEN_VERSION_CACHE_TIMEOUT = config('TOKEN_VERSION_CACHE_TIMEOUT', default=86400, cast=int)
+# Cache refresh token blacklist lookups; the flags are set from a signal, so
+# like the claims above this needs a shared cache (on by default with Redis only)
+JWT_CACHE_BLACKLIST = config('JWT_CACHE_BLACKLIST', default=bool(REDIS_URL), cast=bool)
+
+# Login attempts per client address and per login name (see cipher/throttling.py)
+LOGIN_RATE_LIMIT_ENABLED = config('LOGIN_RATE_LIMIT_ENABLED', default=True, cast=bool)
+LOGIN_RATE_LIMIT_BURST = config('LOGIN_RATE_LIMIT_BURST', default=10, cast=int)
+LOGIN_RATE_LIMIT_PER_MINUTE = config('LOGIN_RATE_LIMIT_PER_MINUTE', default=5, cast=float)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -187,6 +293,36 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Media is served through cipher.views.ProtectedMediaView (see cipher/media.py).
+# PROTECTED_MEDIA_SERVER: 'nginx' (X-Accel-Redirect), 'sendfile' (X-Sendfile)
+# or empty to stream from Django (development)
+PROTECTED_MEDIA_SERVER = config('PROTECTED_MEDIA_SERVER', default='')
+PROTECTED_MEDIA_INTERNAL_URL = config('PROTECTED_MEDIA_INTERNAL_URL', default='/protected-media/')
+PROTECTED_MEDIA_SIGNED_URLS = config('PROTECTED_MEDIA_SIGNED_URLS', default=True, cast=bool)
+PROTECTED_MEDIA_URL_MAX_AGE = config('PROTECTED_MEDIA_URL_MAX_AGE', default=3600, cast=int)
+
+STORAGES = {
+    'default': {
+        # Signed URLs (cipher/media.py) + SHA-256 deduplication (cipher/storage.py)
+        'BACKEND': 'cipher.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+
+# Image thumbnails (cipher/images.py): square bounding boxes in pixels,
+# the first size is the one exposed as *_thumb_url
+THUMBNAIL_SIZES = [128, 512]
+THUMBNAIL_ASYNC = config('THUMBNAIL_ASYNC', default=True, cast=bool)
+THUMBNAIL_WORKERS = config('THUMBNAIL_WORKERS', default=2, cast=int)
+
+# Chunked uploads (cipher/uploads.py): chunks are staged outside MEDIA_ROOT
+CHUNKED_UPLOAD_ROOT = config('CHUNKED_UPLOAD_ROOT', default=os.path.join(BASE_DIR, 'chunked_uploads'))
+CHUNKED_UPLOAD_CHUNK_SIZE = config('CHUNKED_UPLOAD_CHUNK_SIZE', default=5 * 1024 * 1024, cast=int)
+CHUNKED_UPLOAD_MAX_SIZE = config('CHUNKED_UPLOAD_MAX_SIZE', default=500 * 1024 * 1024, cast=int)
+CHUNKED_UPLOAD_EXPIRY_HOURS = config('CHUNKED_UPLOAD_EXPIRY_HOURS', default=24, cast=int)
 
 # File upload settings
 # FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .authentication import remember_blacklisted
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def cache_blacklisted_token(sender, instance, created, **kwargs):
+    # Refresh tokens cache their blacklist lookup (cipher/authentication.py)
+    if created:
+        jti, expires_at = instance.token.jti, instance.token.expires_at.timestamp()
+        transaction.on_commit(lambda: remember_blacklisted(jti, True, expires_at))
@@ -0,0 +1,126 @@
+"""
+Content-addressed, deduplicating media storage.
+
+Every saved file is also hard-linked into a blob store keyed by its SHA-256:
+
+    media/employee_documents/2025/10/07/contract.pdf  --+
+    media/client_documents/2025/11/02/contract.pdf    --+--> media/.blobs/3f/3fa9...e1
+
+Files keep their normal upload_to names, so FileField values, URLs, API
+responses and X-Accel-Redirect serving are unchanged; identical uploads just
+share one inode on disk. The blob's link count is its reference count
+(st_nlink - 1): deleting the last file that points at a blob removes the blob.
+
+`manage.py dedupe_media` moves existing files into the blob store.
+"""
+import hashlib
+import os
+
+from .media import ProtectedMediaStorage
+
+
+BLOB_DIR = '.blobs'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        while True:
+            data = handle.read(HASH_CHUNK_SIZE)
+            if not data:
+                break
+            digest.update(data)
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(ProtectedMediaStorage):
+
+    def blob_path(self, sha256):
+        return os.path.join(self.location, BLOB_DIR, sha256[:2], sha256)
+
+    def reference_count(self, sha256):
+        try:
+            return os.stat(self.blob_path(sha256)).st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def intern(self, full_path):
+        """
+        Links a stored file into the blob store. If a blob with the same content
+        already exists, the file is replaced by a link to it and the blob's
+        mtime is bumped, so gc_media's --min-age still sees a fresh upload.
+        Returns (sha256, bytes freed).
+        """
+        sha256 = file_sha256(full_path)
+        blob = self.blob_path(sha256)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+
+        # A concurrent delete can remove the blob between the two link calls; retry once
+        for _ in range(2):
+            try:
+                os.link(full_path, blob)
+                return sha256, 0
+            except FileExistsError:
+                pass
+            if os.path.samefile(full_path, blob):
+                return sha256, 0
+
+            size = os.path.getsize(full_path)
+            temp_path = f"{full_path}.dedupe"
+            try:
+                os.link(blob, temp_path)
+            except FileNotFoundError:
+                continue
+            os.replace(temp_path, full_path)
+            os.utime(full_path)
+            return sha256, size
+        return sha256, 0
+
+    def _save(self, name, content):
+        name = super()._save(name, content)
+        try:
+            self.intern(self.path(name))
+        except OSError:
+            # Hard links unsupported (e.g. a different filesystem): keep the plain copy
+            pass
+        return name
+
+    def delete(self, name):
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        full_path = self.path(name)
+        try:
+            stat = os.stat(full_path)
+        except FileNotFoundError:
+            return
+
+        # Only the last reference (this file + the blob) needs the blob's name
+        blob = None
+        if stat.st_nlink == 2 and os.path.isfile(full_path):
+            blob = self.blob_path(file_sha256(full_path))
+
+        super().delete(name)
+
+        if blob:
+            try:
+                if os.stat(blob).st_nlink == 1:
+                    os.remove(blob)
+            except FileNotFoundError:
+                pass
+
+    def unreferenced_blobs(self):
+        """
+        Yields blob paths no stored file points at any more.
+        """
+        root = os.path.join(self.location, BLOB_DIR)
+        if not os.path.isdir(root):
+            return
+        with os.scandir(root) as prefixes:
+            for prefix in prefixes:
+                if not prefix.is_dir(follow_symlinks=False):
+                    continue
+                with os.scandir(prefix.path) as blobs:
+                    for blob in blobs:
+                        if blob.is_file(follow_symlinks=False) and blob.stat(follow_symlinks=False).st_nlink == 1:
+                            yield blob.path
@@ -0,0 +1,595 @@
+"""
+Tests for the shared infrastructure in cipher.
+
+Query budgets: QueryBudgetTests seeds a realistic dataset at a fixed date
+(FROZEN_NOW), requests every GET endpoint in cipher/urls.py as each role and
+fails when an endpoint runs more SQL queries than its budget in
+cipher/query_budgets.json.
+
+Budgets are exact counts for that dataset. A second test adds more rows and
+fails when an endpoint then runs more queries, so a per-row query added to a
+serializer is caught even if the budget has room. Endpoints that are known
+to query per row carry a `grows_with_data` note with the cause instead; the
+test fails once they stop growing, so the note goes away with the fix.
+
+After an intentional change, re-record the budgets with:
+
+    UPDATE_QUERY_BUDGETS=1 python manage.py test cipher
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+
+from .profiling import RequestProfile
+from .seeding import DatasetBuilder
+
+
+BUDGET_FILE = Path(__file__).resolve().parent / 'query_budgets.json'
+UPDATE_BUDGETS = os.environ.get('UPDATE_QUERY_BUDGETS') == '1'
+
+ROLES = ['superuser', 'admin', 'director', 'manager', 'hr', 'employee']
+
+# Seeded rows are dated relative to today and many endpoints look at the
+# current month, so everything is measured at one fixed moment
+FROZEN_NOW = datetime(2026, 10, 14, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def load_budgets():
+    with open(BUDGET_FILE) as handle:
+        return json.load(handle)
+
+
+def get_routes(patterns=None, prefix=''):
+    """
+    Yields (key, pattern) for every non-admin route that answers GET.
+    The key is the URL name, or the route itself for unnamed patterns.
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from get_routes(pattern.url_patterns, prefix + str(pattern.pattern))
+            continue
+        route = prefix + str(pattern.pattern)
+        if route.startswith('admin/'):
+            continue
+        callback = pattern.callback
+        actions = getattr(callback, 'actions', None)
+        view_class = getattr(callback, 'view_class', None) or getattr(callback, 'cls', None)
+        if (actions and 'get' in actions) or (not actions and view_class and hasattr(view_class, 'get')):
+            yield pattern.name or route, pattern
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False, REQUEST_PROFILING_ENABLED=False)
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        clock = mock.patch('django.utils.timezone.now', return_value=FROZEN_NOW)
+        clock.start()
+        cls.addClassCleanup(clock.stop)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        from cipher.models import ChunkedUpload
+        from clientapp.models import ClientPayment
+        from emplyees.models import Announcement, CameraDepartment, CustomUser, LeaveManagement, SalaryPayment
+        from events.models import Event
+        from finance.models import Expense, ExpenseCategory, Income, IncomeCategory
+        from task.models import Task
+
+        DatasetBuilder(
+            employees=200, clients=60, months=6, tasks=400, events=200,
+            leaves=300, incomes=300, expenses=300, seed=1234, today=FROZEN_NOW.date(),
+        ).build()
+
+        def first_with_role(role):
+            return CustomUser.objects.filter(role=role).order_by('id').first()
+
+        employee = CustomUser.objects.filter(role='employee', salary_payments__isnull=False).order_by('id').first()
+        superuser = CustomUser.objects.create_superuser(
+            username='budget-superuser', email='budget-superuser@example.com', password='x'
+        )
+        cls.users = {
+            'superuser': superuser,
+            'admin': first_with_role('admin'),
+            'director': first_with_role('director'),
+            'manager': first_with_role('manager'),
+            'hr': first_with_role('hr'),
+            'employee': employee,
+        }
+
+        client = employee.tasks.exclude(client=None).first().client
+        cls.objects = {
+            'employee': employee,
+            'client': client,
+            'task': Task.objects.filter(assignee=employee).first(),
+            'event': Event.objects.first(),
+            'leave': LeaveManagement.objects.filter(employee=employee).first() or LeaveManagement.objects.first(),
+            'salary_payment': SalaryPayment.objects.filter(employee=employee).first(),
+            'client_payment': ClientPayment.objects.filter(client=client).first(),
+            'announcement': Announcement.objects.first(),
+            'camera_project': CameraDepartment.objects.first(),
+            'income': Income.objects.first(),
+            'expense': Expense.objects.first(),
+            'income_category': IncomeCategory.objects.first(),
+            'expense_category': ExpenseCategory.objects.first(),
+            'upload': ChunkedUpload.objects.create(
+                user=superuser, target='employee_document', object_id=employee.id,
+                document_type='contract', filename='contract.pdf', total_size=1024, chunk_size=1024,
+            ),
+        }
+
+    def setUp(self):
+        cache.clear()
+
+    def build_url(self, key, entry):
+        kwargs = {name: self.objects[kind].pk for name, kind in entry.get('kwargs', {}).items()}
+        if entry.get('path'):
+            url = entry['path'].format(**kwargs)
+        else:
+            url = reverse(key, kwargs=kwargs)
+        return url + ('?' + entry['query'] if entry.get('query') else '')
+
+    def measure(self, url, role):
+        # Every role starts cold; otherwise data caches filled by the previous
+        # role (leave balances, availability) hide the later roles' queries
+        cache.clear()
+        client = APIClient(raise_request_exception=False)
+        client.force_authenticate(self.users[role])
+        # Counted with an execute wrapper: connection.queries_log is capped at
+        # 9000 entries, which a few unbudgeted endpoints exceed on their own
+        profile = RequestProfile()
+        with connections[DEFAULT_DB_ALIAS].execute_wrapper(profile.query_wrapper):
+            response = client.get(url)
+        return response, profile.query_count
+
+    def test_every_get_endpoint_has_a_budget(self):
+        budgets = load_budgets()
+        known = set(budgets['endpoints']) | set(budgets['skipped'])
+        missing = sorted(key for key, _ in get_routes() if key not in known)
+        self.assertEqual(
+            missing, [],
+            "GET endpoints without a query budget; add them to cipher/query_budgets.json "
+            "(or to 'skipped' with a reason)"
+        )
+
+    def measure_endpoints(self, budgets):
+        """
+        {endpoint: {role: (url, response, query count)}} for every budgeted
+        endpoint the database backend runs.
+        """
+        vendor = connections[DEFAULT_DB_ALIAS].vendor
+        measured = {}
+        for key, entry in budgets['endpoints'].items():
+            if entry.get('postgres_only') and vendor != 'postgresql':
+                continue
+            url = self.build_url(key, entry)
+            measured[key] = {role: (url, *self.measure(url, role)) for role in ROLES}
+        return measured
+
+    def test_query_budgets(self):
+        budgets = load_budgets()
+        measured = self.measure_endpoints(budgets)
+
+        if UPDATE_BUDGETS:
+            for key, results in measured.items():
+                budgets['endpoints'][key]['budgets'] = {role: count for role, (_, _, count) in results.items()}
+            with open(BUDGET_FILE, 'w') as handle:
+                json.dump(budgets, handle, indent=2)
+                handle.write('\n')
+            return
+
+        for key, results in measured.items():
+            for role, (url, response, count) in results.items():
+                with self.subTest(endpoint=key, role=role):
+                    self.assertLess(response.status_code, 500, f"{url} returned {response.status_code}")
+                    budget = budgets['endpoints'][key]['budgets'].get(role)
+                    self.assertIsNotNone(budget, f"No {role} budget for {key}")
+                    self.assertLessEqual(
+                        count, budget,
+                        f"{url} as {role} ran {count} queries (budget {budget})"
+                    )
+
+    def test_query_counts_do_not_grow_with_data(self):
+        budgets = load_budgets()
+        before = self.measure_endpoints(budgets)
+        # A second, smaller dataset on top makes every list longer; only
+        # endpoints that query per row run more queries afterwards
+        DatasetBuilder(
+            employees=60, clients=20, months=6, tasks=120, events=60,
+            leaves=90, incomes=90, expenses=90, seed=4321, today=FROZEN_NOW.date(), first_index=1000,
+        ).build()
+        after = self.measure_endpoints(budgets)
+
+        for key, results in after.items():
+            # Counts may drop: the first request can create rows (leave balances) later ones reuse
+            grown = {
+                role: (before[key][role][2], count)
+                for role, (_, _, count) in results.items() if count > before[key][role][2]
+            }
+            with self.subTest(endpoint=key):
+                if budgets['endpoints'][key].get('grows_with_data'):
+                    self.assertTrue(grown, f"{key} no longer grows with the data; remove its grows_with_data note")
+                else:
+                    self.assertEqual(grown, {}, f"{key} runs more queries with more data (a query per row?)")
+
+
+# Every request is logged as slow (REQUEST_PROFILING_SLOW_MS=0), so the
+# warnings are captured instead of depending on how long hashing takes
+@override_settings(
+    LOGIN_RATE_LIMIT_ENABLED=True, LOGIN_RATE_LIMIT_BURST=3, LOGIN_RATE_LIMIT_PER_MINUTE=1,
+    REQUEST_PROFILING_SLOW_MS=0,
+)
+class LoginRateThrottleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_spoofed_forwarded_for_does_not_reset_the_address_bucket(self):
+        client = APIClient()
+        statuses = []
+        with self.assertLogs('cipher.requests', 'WARNING') as logs:
+            for attempt in range(4):
+                # A new login name each time, so only the address bucket runs out
+                response = client.post(
+                    reverse('login'),
+                    {'username': f'nobody-{attempt}', 'password': 'wrong'},
+                    format='json',
+                    HTTP_X_FORWARDED_FOR=f'10.0.0.{attempt}, 203.0.113.7',
+                    REMOTE_ADDR='172.18.0.5',
+                )
+                statuses.append(response.status_code)
+        self.assertNotIn(429, statuses[:3])
+        self.assertEqual(statuses[3], 429)
+        self.assertEqual([record.request_metrics['status'] for record in logs.records], statuses)
+
+
+def temporary_directory(test):
+    path = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+@override_settings(REQUEST_PROFILING_ENABLED=False)
+class ChunkedUploadTests(TestCase):
+    CHUNK_SIZE = 64 * 1024
+
+    def setUp(self):
+        from emplyees.models import CustomUser
+
+        media = override_settings(
+            MEDIA_ROOT=temporary_directory(self),
+            CHUNKED_UPLOAD_ROOT=temporary_directory(self),
+        )
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = CustomUser.objects.create_user(username='uploader', email='uploader@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Three chunks, the last one short
+        self.content = os.urandom(self.CHUNK_SIZE * 2 + 100)
+
+    def chunk(self, index):
+        return self.content[index * self.CHUNK_SIZE:(index + 1) * self.CHUNK_SIZE]
+
+    def start(self, **data):
+        response = self.client.post(reverse('chunked-upload-create'), {
+            'target': 'employee_document',
+            'object_id': self.user.id,
+            'document_type': 'resume',
+            'filename': 'resume.pdf',
+            'total_size': len(self.content),
+            'chunk_size': self.CHUNK_SIZE,
+            'checksum': hashlib.sha256(self.content).hexdigest(),
+            **data,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['total_chunks'], 3)
+        return response.data['id']
+
+    def put_chunk(self, upload_id, index, body=None, checksum=None):
+        body = self.chunk(index) if body is None else body
+        return self.client.put(
+            reverse('chunked-upload-chunk', kwargs={'upload_id': upload_id, 'index': index}),
+            data=body,
+            content_type='application/octet-stream',
+            HTTP_X_CHUNK_CHECKSUM=checksum or hashlib.sha256(body).hexdigest(),
+        )
+
+    def complete(self, upload_id):
+        return self.client.post(reverse('chunked-upload-complete', kwargs={'upload_id': upload_id}))
+
+    def test_chunks_in_any_order_assemble_into_the_target_field(self):
+        from cipher.models import ChunkedUpload
+        from cipher.uploads import upload_dir
+        from emplyees.models import EmployeeDocument
+
+        upload_id = self.start()
+        for index in [2, 0, 1]:
+            self.assertEqual(self.put_chunk(upload_id, index).status_code, 200)
+
+        response = self.complete(upload_id)
+        self.assertEqual(response.status_code, 201, response.data)
+        upload = ChunkedUpload.objects.get(pk=upload_id)
+        self.assertEqual(upload.status, 'complete')
+        document = EmployeeDocument.objects.get(pk=upload.result_id)
+        self.assertEqual((document.user_id, document.document_type), (self.user.id, 'resume'))
+        with document.file.open('rb') as handle:
+            self.assertEqual(handle.read(), self.content)
+        self.assertFalse(os.path.exists(upload_dir(upload)))
+        self.assertEqual(self.complete(upload_id).status_code, 409)
+
+    def test_missing_chunks_are_reported_and_block_completion(self):
+        from emplyees.models import EmployeeDocument
+
+        upload_id = self.start()
+        self.put_chunk(upload_id, 0)
+        self.put_chunk(upload_id, 2)
+
+        status = self.client.get(reverse('chunked-upload-detail', kwargs={'upload_id': upload_id}))
+        self.assertEqual((status.data['received_chunks'], status.data['missing_chunks']), ([0, 2], [1]))
+        response = self.complete(upload_id)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Missing chunks: [1]', response.data['error'])
+        self.assertFalse(EmployeeDocument.objects.exists())
+
+    def test_chunk_with_a_wrong_checksum_is_rejected(self):
+        upload_id = self.start()
+        response = self.put_chunk(upload_id, 0, checksum='0' * 64)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Checksum mismatch', response.data['error'])
+
+        status = self.client.get(reverse('chunked-upload-detail', kwargs={'upload_id': upload_id}))
+        self.assertEqual(status.data['received_chunks'], [])
+
+    def test_file_with_a_wrong_checksum_is_rejected(self):
+        from emplyees.models import EmployeeDocument
+
+        upload_id = self.start(checksum='0' * 64)
+        for index in range(3):
+            self.put_chunk(upload_id, index)
+
+        response = self.complete(upload_id)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('assembled file', response.data['error'])
+        self.assertFalse(EmployeeDocument.objects.exists())
+
+    def test_purge_removes_expired_uploads_and_their_chunks(self):
+        from cipher.models import ChunkedUpload
+        from cipher.uploads import upload_dir
+
+        expired_id, fresh_id = self.start(), self.start()
+        self.put_chunk(expired_id, 0)
+        self.put_chunk(fresh_id, 0)
+        ChunkedUpload.objects.filter(pk=expired_id).update(updated_at=timezone.now() - timedelta(hours=48))
+        expired = ChunkedUpload.objects.get(pk=expired_id)
+
+        call_command('purge_chunked_uploads', hours=24, stdout=StringIO())
+
+        self.assertEqual([str(pk) for pk in ChunkedUpload.objects.values_list('pk', flat=True)], [fresh_id])
+        self.assertFalse(os.path.exists(upload_dir(expired)))
+        self.assertTrue(os.path.exists(upload_dir(ChunkedUpload.objects.get(pk=fresh_id))))
+
+
+class ContentAddressedStorageTests(SimpleTestCase):
+
+    def setUp(self):
+        from cipher.storage import ContentAddressedStorage
+
+        self.storage = ContentAddressedStorage(location=temporary_directory(self))
+
+    def save(self, name, content):
+        from django.core.files.base import ContentFile
+
+        return self.storage.save(name, ContentFile(content))
+
+    def blob_of(self, content):
+        return self.storage.blob_path(hashlib.sha256(content).hexdigest())
+
+    def test_identical_files_share_one_blob(self):
+        first = self.save('employee_documents/contract.pdf', b'same content')
+        second = self.save('client_documents/contract.pdf', b'same content')
+
+        self.assertTrue(os.path.samefile(self.storage.path(first), self.storage.path(second)))
+        self.assertTrue(os.path.samefile(self.storage.path(first), self.blob_of(b'same content')))
+        self.assertEqual(self.storage.reference_count(hashlib.sha256(b'same content').hexdigest()), 2)
+
+    def test_deleting_one_copy_keeps_the_other(self):
+        first = self.save('a/report.pdf', b'shared')
+        second = self.save('b/report.pdf', b'shared')
+        blob = self.blob_of(b'shared')
+
+        self.storage.delete(first)
+        self.assertFalse(self.storage.exists(first))
+        with self.storage.open(second) as handle:
+            self.assertEqual(handle.read(), b'shared')
+        self.assertTrue(os.path.exists(blob))
+
+        self.storage.delete(second)
+        self.assertFalse(os.path.exists(blob))
+        self.assertEqual(list(self.storage.unreferenced_blobs()), [])
+
+    def test_same_name_gets_a_new_name_and_keeps_both_contents(self):
+        first = self.save('docs/photo.png', b'first')
+        second = self.save('docs/photo.png', b'second')
+
+        self.assertNotEqual(first, second)
+        with self.storage.open(first) as handle:
+            self.assertEqual(handle.read(), b'first')
+        with self.storage.open(second) as handle:
+            self.assertEqual(handle.read(), b'second')
+        self.assertFalse(os.path.samefile(self.storage.path(first), self.storage.path(second)))
+
+    def test_reused_blob_looks_like_a_fresh_upload(self):
+        first = self.save('docs/old.pdf', b'content')
+        week_ago = timezone.now().timestamp() - 7 * 24 * 3600
+        os.utime(self.storage.path(first), (week_ago, week_ago))
+
+        second = self.save('docs/new.pdf', b'content')
+        self.assertTrue(os.path.samefile(self.storage.path(first), self.storage.path(second)))
+        # gc_media --min-age must not treat the new upload as old
+        self.assertGreater(os.stat(self.storage.path(second)).st_mtime, week_ago + 3600)
+
+
+@override_settings(JWT_TRUST_TOKEN_CLAIMS=True)
+class ClaimsAuthenticationTests(TestCase):
+
+    def setUp(self):
+        from emplyees.models import CustomUser
+
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username='claims-user', email='claims-user@example.com', password='x', role='manager'
+        )
+
+    def authenticate(self, token):
+        from cipher.authentication import ClaimsJWTAuthentication
+
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        user, _ = ClaimsJWTAuthentication().authenticate(request)
+        return user
+
+    def access_token(self):
+        from cipher.authentication import ClaimsRefreshToken
+
+        return ClaimsRefreshToken.for_user(self.user).access_token
+
+    def test_current_token_builds_the_user_without_queries(self):
+        token = self.access_token()
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+            self.assertEqual((user.pk, user.username, user.role), (self.user.pk, 'claims-user', 'manager'))
+        # Fields outside the claims are loaded on first access
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, 'claims-user@example.com')
+
+    def test_claims_issued_before_a_role_change_are_not_trusted(self):
+        token = self.access_token()
+        self.user.role = 'employee'
+        self.user.save()
+
+        user = self.authenticate(token)
+        self.assertEqual(user.role, 'employee')
+        self.assertFalse(getattr(user, '_from_token_claims', False))
+
+    def test_claims_issued_before_a_username_change_are_not_trusted(self):
+        token = self.access_token()
+        self.user.username = 'renamed-user'
+        self.user.save()
+
+        self.assertEqual(self.authenticate(token).username, 'renamed-user')
+
+    def test_other_changes_keep_the_token_current(self):
+        token = self.access_token()
+        self.user.phone_number = '9000000000'
+        self.user.save()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.authenticate(token)._from_token_claims)
+
+    def test_missing_cached_version_falls_back_to_the_database(self):
+        token = self.access_token()
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            self.assertFalse(getattr(self.authenticate(token), '_from_token_claims', False))
+        # The lookup re-caches the version for the next request
+        with self.assertNumQueries(0):
+            self.authenticate(token)
+
+
+class RefreshTokenTests(TestCase):
+
+    def setUp(self):
+        from emplyees.models import CustomUser
+
+        cache.clear()
+        self.user = CustomUser.objects.create_user(username='token-user', email='token-user@example.com', password='x')
+
+    def refresh_token(self):
+        from cipher.authentication import ClaimsRefreshToken
+
+        return ClaimsRefreshToken.for_user(self.user)
+
+    def blacklist(self, token):
+        with self.captureOnCommitCallbacks(execute=True):
+            token.blacklist()
+
+    def test_prune_removes_only_expired_tokens_with_their_blacklist_entries(self):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+        live, live_blacklisted, expired, expired_blacklisted = [self.refresh_token() for _ in range(4)]
+        self.blacklist(live_blacklisted)
+        self.blacklist(expired_blacklisted)
+        OutstandingToken.objects.filter(jti__in=[expired['jti'], expired_blacklisted['jti']]).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        out = StringIO()
+        call_command('prune_expired_tokens', batch_size=1, stdout=out)
+
+        self.assertIn('Removed 2 expired token(s), 1 of them blacklisted', out.getvalue())
+        self.assertEqual(
+            set(OutstandingToken.objects.values_list('jti', flat=True)),
+            {live['jti'], live_blacklisted['jti']}
+        )
+        self.assertEqual(list(BlacklistedToken.objects.values_list('token__jti', flat=True)), [live_blacklisted['jti']])
+
+    def test_prune_dry_run_keeps_everything(self):
+        from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+        self.refresh_token()
+        OutstandingToken.objects.update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        out = StringIO()
+        call_command('prune_expired_tokens', dry_run=True, stdout=out)
+        self.assertIn('Would remove 1 expired token(s)', out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+
+    @override_settings(JWT_CACHE_BLACKLIST=True)
+    def test_cached_lookup_rejects_a_blacklisted_token(self):
+        from cipher.authentication import ClaimsRefreshToken
+        from rest_framework_simplejwt.exceptions import TokenError
+
+        token = self.refresh_token()
+        encoded = str(token)
+        # The first check reads the database and caches "not blacklisted"
+        ClaimsRefreshToken(encoded)
+        with self.assertNumQueries(0):
+            ClaimsRefreshToken(encoded)
+
+        self.blacklist(token)
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            ClaimsRefreshToken(encoded)
+
+    @override_settings(JWT_CACHE_BLACKLIST=False)
+    def test_without_a_shared_cache_every_check_reads_the_database(self):
+        from cipher.authentication import ClaimsRefreshToken, _blacklist_key
+        from rest_framework_simplejwt.exceptions import TokenError
+
+        token = self.refresh_token()
+        encoded = str(token)
+        with self.assertNumQueries(1):
+            ClaimsRefreshToken(encoded)
+
+        self.blacklist(token)
+        with self.assertNumQueries(1), self.assertRaises(TokenError):
+            ClaimsRefreshToken(encoded)
+        self.assertIsNone(cache.get(_blacklist_key(token['jti'])))
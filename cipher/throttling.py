@@ -0,0 +1,60 @@
+"""
+Login rate limiting.
+
+Every login attempt takes a token from two buckets kept in the cache: one
+for the client address and one for the login name. Buckets hold up to
+LOGIN_RATE_LIMIT_BURST tokens and refill at LOGIN_RATE_LIMIT_PER_MINUTE, so
+people mistyping a password are never slowed down, while a credential
+stuffing burst gets 429 (with Retry-After) before any password is hashed.
+A bucket is (tokens, last update) and refills lazily when read; a full one
+expires from the cache. Reads and writes aren't atomic, so concurrent
+attempts may now and then share a token, which is fine for a rate limit.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+
+LOGIN_BUCKET_PREFIX = 'login-bucket'
+
+
+def take_token(key, capacity, refill_per_second, now=None):
+    """
+    Takes a token from the bucket at `key`. Returns 0 when one was
+    available, otherwise the seconds until there will be one.
+    """
+    now = time.time() if now is None else now
+    tokens, updated = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+    if tokens < 1:
+        return (1 - tokens) / refill_per_second
+    cache.set(key, (tokens - 1, now), timeout=int(capacity / refill_per_second) + 1)
+    return 0
+
+
+class LoginRateThrottle(BaseThrottle):
+
+    def allow_request(self, request, view):
+        self.wait_seconds = 0
+        if not settings.LOGIN_RATE_LIMIT_ENABLED:
+            return True
+
+        keys = [f"{LOGIN_BUCKET_PREFIX}:ip:{self.get_ident(request)}"]
+        login = str(request.data.get('username') or '').strip().lower()
+        if login:
+            # Hashed, as cache keys can't hold arbitrary user input
+            keys.append(f"{LOGIN_BUCKET_PREFIX}:login:{hashlib.sha256(login.encode()).hexdigest()[:32]}")
+
+        capacity = settings.LOGIN_RATE_LIMIT_BURST
+        refill_per_second = settings.LOGIN_RATE_LIMIT_PER_MINUTE / 60
+        for key in keys:
+            self.wait_seconds = take_token(key, capacity, refill_per_second)
+            if self.wait_seconds:
+                return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
@@ -0,0 +1,196 @@
+"""
+Chunked, resumable uploads.
+
+Protocol (all endpoints require an authenticated user):
+
+1. POST   /api/uploads/                       target, object_id, document_type,
+                                              filename, total_size[, checksum]
+   -> upload id, chunk_size, total_chunks
+2. PUT    /api/uploads/<id>/chunks/<index>/   raw chunk bytes as the body,
+                                              X-Chunk-Checksum: <sha256 hex>
+3. GET    /api/uploads/<id>/                  received/missing chunks, to resume
+4. POST   /api/uploads/<id>/complete/         assembles the file into the
+                                              target model's FileField
+5. DELETE /api/uploads/<id>/                  aborts and removes the chunks
+
+Chunks are streamed from the request body to disk, so a worker never holds
+more than STREAM_CHUNK_SIZE of a file in memory.
+"""
+import hashlib
+import os
+import shutil
+
+from django.conf import settings
+from django.core.files import File
+
+from .permissions import has_capability
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ChunkError(Exception):
+    pass
+
+
+def _can_upload_employee_document(user, employee):
+    return has_capability(user, 'manage_employees') or user.id == employee.id
+
+
+def _can_upload_employee_media(user, employee):
+    return has_capability(user, 'upload_employee_media') or user.id == employee.id
+
+
+def _get_employee(object_id):
+    from emplyees.models import CustomUser
+    return CustomUser.objects.filter(id=object_id, is_superuser=False).first()
+
+
+def _get_client(object_id):
+    from clientapp.models import Client
+    return Client.objects.filter(id=object_id, is_deleted=False).first()
+
+
+def _employee_document_target():
+    from emplyees.models import EmployeeDocument
+    from emplyees.serializers import EmployeeDocumentSerializer
+    return {
+        'get_owner': _get_employee,
+        'can_upload': _can_upload_employee_document,
+        'document_types': dict(EmployeeDocument.DOCUMENT_TYPES),
+        'build': lambda upload, owner: EmployeeDocument(user=owner, document_type=upload.document_type),
+        'serializer': EmployeeDocumentSerializer,
+    }
+
+
+def _employee_media_target():
+    from emplyees.models import EmployeeMedia
+    from emplyees.serializers import EmployeeMediaSerializer
+    return {
+        'get_owner': _get_employee,
+        'can_upload': _can_upload_employee_media,
+        'document_types': dict(EmployeeMedia.MEDIA_TYPES),
+        'build': lambda upload, owner: EmployeeMedia(user=owner, media_type=upload.document_type),
+        'serializer': EmployeeMediaSerializer,
+    }
+
+
+def _client_document_target():
+    from clientapp.models import ClientDocument
+    from clientapp.serializers import ClientDocumentSerializer
+    return {
+        'get_owner': _get_client,
+        'can_upload': lambda user, client: True,
+        'document_types': dict(ClientDocument.DOCUMENT_TYPES),
+        'build': lambda upload, owner: ClientDocument(
+            client=owner,
+            document_type=upload.document_type,
+            uploaded_by=upload.user
+        ),
+        'serializer': ClientDocumentSerializer,
+    }
+
+
+# Permission rules mirror the single-request upload views
+UPLOAD_TARGETS = {
+    'employee_document': _employee_document_target,
+    'employee_media': _employee_media_target,
+    'client_document': _client_document_target,
+}
+
+
+def get_upload_target(name):
+    return UPLOAD_TARGETS[name]()
+
+
+def upload_dir(upload):
+    return os.path.join(settings.CHUNKED_UPLOAD_ROOT, str(upload.id))
+
+
+def chunk_path(upload, index):
+    return os.path.join(upload_dir(upload), f"{index:06d}.part")
+
+
+def received_chunks(upload):
+    directory = upload_dir(upload)
+    if not os.path.isdir(directory):
+        return []
+    received = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.part'):
+                received.append(int(entry.name[:-5]))
+    return sorted(received)
+
+
+def write_chunk(upload, index, stream, expected_checksum):
+    """
+    Streams one chunk to disk, verifying its size and SHA-256 before it is
+    made visible. Re-sending a chunk that already arrived overwrites it.
+    """
+    expected_size = upload.expected_chunk_size(index)
+    os.makedirs(upload_dir(upload), exist_ok=True)
+    final_path = chunk_path(upload, index)
+    temp_path = f"{final_path}.tmp"
+
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(temp_path, 'wb') as handle:
+            while True:
+                data = stream.read(STREAM_CHUNK_SIZE)
+                if not data:
+                    break
+                written += len(data)
+                if written > expected_size:
+                    raise ChunkError(f"Chunk {index} exceeds the expected size of {expected_size} bytes")
+                digest.update(data)
+                handle.write(data)
+
+        if written != expected_size:
+            raise ChunkError(f"Chunk {index} has {written} bytes, expected {expected_size}")
+        if digest.hexdigest() != expected_checksum.lower():
+            raise ChunkError(f"Checksum mismatch for chunk {index}")
+        os.replace(temp_path, final_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return digest.hexdigest()
+
+
+def assemble_upload(upload, owner):
+    """
+    Concatenates the chunks into one file, checks the optional whole-file
+    checksum and saves it through the target model's FileField (so it lands
+    under the field's upload_to path). Returns the created instance.
+    """
+    missing = sorted(set(range(upload.total_chunks)) - set(received_chunks(upload)))
+    if missing:
+        raise ChunkError(f"Missing chunks: {missing}")
+
+    target = get_upload_target(upload.target)
+    assembled_path = os.path.join(upload_dir(upload), 'assembled')
+    digest = hashlib.sha256()
+    with open(assembled_path, 'wb') as assembled:
+        for index in range(upload.total_chunks):
+            with open(chunk_path(upload, index), 'rb') as chunk:
+                while True:
+                    data = chunk.read(STREAM_CHUNK_SIZE)
+                    if not data:
+                        break
+                    digest.update(data)
+                    assembled.write(data)
+
+    if upload.checksum and digest.hexdigest() != upload.checksum.lower():
+        os.remove(assembled_path)
+        raise ChunkError("Checksum mismatch for the assembled file")
+
+    instance = target['build'](upload, owner)
+    with open(assembled_path, 'rb') as handle:
+        instance.file.save(upload.filename, File(handle), save=True)
+    discard_chunks(upload)
+    return instance
+
+
+def discard_chunks(upload):
+    shutil.rmtree(upload_dir(upload), ignore_errors=True)
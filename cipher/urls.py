@@ -15,10 +15,17 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path,include
+from django.urls import path,include,re_path
 from django.conf import settings
-from django.conf.urls.static import static
 from django.views.generic import RedirectView
+from .views import (
+    CacheStatsView,
+    ChunkedUploadChunkView,
+    ChunkedUploadCompleteView,
+    ChunkedUploadCreateView,
+    ChunkedUploadDetailView,
+    ProtectedMediaView,
+)
 
 urlpatterns = [
     path('admin/clientapp/clientpaymenthistory/', RedirectView.as_view(url='/admin/clientapp/clientpayment/', permanent=True)),
@@ -31,4 +38,10 @@ urlpatterns = [
     path('api/reports/', include('reports.urls')), 
     path('api/', include('verification.urls')),
     path('leaves-api/', include('leaves.urls')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path('api/cache-stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('api/uploads/', ChunkedUploadCreateView.as_view(), name='chunked-upload-create'),
+    path('api/uploads/<uuid:upload_id>/', ChunkedUploadDetailView.as_view(), name='chunked-upload-detail'),
+    path('api/uploads/<uuid:upload_id>/chunks/<int:index>/', ChunkedUploadChunkView.as_view(), name='chunked-upload-chunk'),
+    path('api/uploads/<uuid:upload_id>/complete/', ChunkedUploadCompleteView.as_view(), name='chunked-upload-complete'),
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), ProtectedMediaView.as_view(), name='protected-media'),
+]
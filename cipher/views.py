@@ -0,0 +1,243 @@
+import os
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.views.static import was_modified_since
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cache import get_cache_stats
+from .images import original_for_thumbnail
+from .media import (
+    check_media_signature,
+    iter_file_range,
+    media_headers,
+    parse_range_header,
+    user_can_access_media,
+)
+from .permissions import HasCapability
+from .models import ChunkedUpload
+from .serializers import ChunkedUploadCreateSerializer, ChunkedUploadSerializer
+from .storage import BLOB_DIR
+from .uploads import (
+    ChunkError,
+    assemble_upload,
+    discard_chunks,
+    get_upload_target,
+    received_chunks,
+    write_chunk,
+)
+
+
+#response cache stats view
+class CacheStatsView(APIView):
+    permission_classes = [HasCapability]
+    required_capabilities = {'GET': 'view_cache_stats'}
+    capability_denied_message = 'You do not have permission to view cache statistics'
+
+    def get(self, request):
+        return Response(get_cache_stats())
+
+
+#protected media view
+class ProtectedMediaView(APIView):
+    """
+    Serves MEDIA_ROOT files after an access check; see cipher/media.py.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, path):
+        name = os.path.normpath(path).replace(os.sep, '/')
+        if name.startswith(('..', '/', BLOB_DIR)):
+            raise Http404('File not found')
+        try:
+            full_path = safe_join(settings.MEDIA_ROOT, name)
+        except ValueError:
+            raise Http404('File not found')
+        signed = check_media_signature(name, request.GET.get('expires'), request.GET.get('sig'))
+        cache_control = None
+        if not os.path.isfile(full_path):
+            # Thumbnails that are still being generated: serve the original,
+            # uncached so the thumbnail replaces it once it exists. A valid
+            # thumbnail signature covers the original it was derived from.
+            name = original_for_thumbnail(name)
+            if name is None:
+                raise Http404('File not found')
+            full_path = safe_join(settings.MEDIA_ROOT, name)
+            cache_control = 'no-cache'
+        if not signed and not user_can_access_media(request.user, name):
+            return Response(
+                {'error': 'You do not have permission to access this file'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        stat = os.stat(full_path)
+        server = settings.PROTECTED_MEDIA_SERVER
+        if server == 'nginx':
+            # nginx serves the body (including ranges) from its internal location
+            response = HttpResponse()
+            response['X-Accel-Redirect'] = settings.PROTECTED_MEDIA_INTERNAL_URL.rstrip('/') + '/' + quote(name)
+            return media_headers(response, name, stat, cache_control)
+        if server == 'sendfile':
+            response = HttpResponse()
+            response['X-Sendfile'] = full_path
+            return media_headers(response, name, stat, cache_control)
+
+        # Dev fallback: stream from Django
+        if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+            return HttpResponseNotModified()
+
+        byte_range = parse_range_header(request.META.get('HTTP_RANGE'), stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f"bytes */{stat.st_size}"
+            return response
+
+        start, end = byte_range or (0, stat.st_size - 1)
+        length = max(end - start + 1, 0)
+        response = StreamingHttpResponse(
+            iter_file_range(full_path, start, length),
+            status=206 if byte_range else 200
+        )
+        if byte_range:
+            response['Content-Range'] = f"bytes {start}-{end}/{stat.st_size}"
+        response['Content-Length'] = str(length)
+        response['Accept-Ranges'] = 'bytes'
+        return media_headers(response, name, stat, cache_control)
+
+
+#chunked upload start view
+class ChunkedUploadCreateView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = ChunkedUploadCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        target = get_upload_target(serializer.validated_data['target'])
+        owner = target['get_owner'](serializer.validated_data['object_id'])
+        if owner is None:
+            return Response(
+                {'error': 'Upload target not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        if not target['can_upload'](request.user, owner):
+            return Response(
+                {'error': 'You do not have permission to upload files here'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        upload = serializer.save(user=request.user)
+        return Response(ChunkedUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+
+class ChunkedUploadMixin:
+
+    def get_upload(self, request, upload_id):
+        upload = ChunkedUpload.objects.filter(id=upload_id).first()
+        if upload is None or (upload.user_id != request.user.id and not request.user.is_superuser):
+            return None
+        return upload
+
+
+#chunked upload status/abort view
+class ChunkedUploadDetailView(ChunkedUploadMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ChunkedUploadSerializer(upload).data)
+
+    def delete(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        discard_chunks(upload)
+        upload.delete()
+        return Response({'message': 'Upload cancelled'}, status=status.HTTP_200_OK)
+
+
+#chunked upload chunk view
+class ChunkedUploadChunkView(ChunkedUploadMixin, APIView):
+    """
+    Receives one chunk as the raw request body. The body is streamed to disk
+    rather than parsed, so no parser classes are involved.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def put(self, request, upload_id, index):
+        upload = self.get_upload(request, upload_id)
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        if upload.status == 'complete':
+            return Response({'error': 'Upload is already complete'}, status=status.HTTP_409_CONFLICT)
+        if index >= upload.total_chunks:
+            return Response(
+                {'error': f'Chunk index must be between 0 and {upload.total_chunks - 1}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        checksum = request.headers.get('X-Chunk-Checksum', '')
+        if not checksum:
+            return Response(
+                {'error': 'X-Chunk-Checksum header (SHA-256 of the chunk) is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.stream is None:
+            return Response({'error': 'Chunk body is empty'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            write_chunk(upload, index, request.stream, checksum)
+        except ChunkError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Touch updated_at so stale-upload cleanup sees activity
+        upload.save(update_fields=['updated_at'])
+        return Response({
+            'index': index,
+            'received_chunks': len(received_chunks(upload)),
+            'total_chunks': upload.total_chunks,
+        })
+
+
+#chunked upload complete view
+class ChunkedUploadCompleteView(ChunkedUploadMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        with transaction.atomic():
+            upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+            if upload.status == 'complete':
+                return Response({'error': 'Upload is already complete'}, status=status.HTTP_409_CONFLICT)
+
+            target = get_upload_target(upload.target)
+            owner = target['get_owner'](upload.object_id)
+            if owner is None:
+                return Response({'error': 'Upload target not found'}, status=status.HTTP_404_NOT_FOUND)
+
+            try:
+                instance = assemble_upload(upload, owner)
+            except ChunkError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            upload.status = 'complete'
+            upload.result_id = instance.pk
+            upload.save(update_fields=['status', 'result_id', 'updated_at'])
+
+        return Response({
+            'message': 'File uploaded successfully',
+            'upload': ChunkedUploadSerializer(upload).data,
+            'file': target['serializer'](instance, context={'request': request}).data,
+        }, status=status.HTTP_201_CREATED)
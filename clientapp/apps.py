@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ClientappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'clientapp'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from cipher.cache import invalidate_namespace
+from .models import Client, ClientPayment
+
+
+@receiver([post_save, post_delete], sender=Client)
+def invalidate_client_cache(sender, instance, **kwargs):
+    invalidate_namespace('clients')
+
+
+# The client list renders payment ids and the current month's payment status
+@receiver([post_save, post_delete], sender=ClientPayment)
+def invalidate_client_payment_cache(sender, instance, **kwargs):
+    invalidate_namespace('clients')
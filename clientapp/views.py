@@ -9,6 +9,8 @@ from django.utils import timezone
 from .models import Client, ClientDocument, ClientPayment
 import calendar
 from datetime import date
+from cipher.cache import cache_response
+from cipher.permissions import has_capability
 from .serializers import (
     ClientSerializer, 
     ClientDocumentSerializer, 
@@ -26,7 +28,7 @@ class ClientCreateView(APIView):
 
     def post(self, request):
        
-        if request.user.role not in ['director', 'managing_director'] and not request.user.is_superuser:
+        if not has_capability(request.user, 'assign_work'):
             return Response(
                 {"error": "Permission denied. Only Directors and Managing Directors can create clients."},
                 status=status.HTTP_403_FORBIDDEN
@@ -71,6 +73,7 @@ class ClientDetailView(APIView):
 class ClientListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @cache_response('clients')
     def get(self, request):
         
         queryset = Client.objects.filter(status='active', is_deleted=False)
@@ -162,7 +165,7 @@ class ClientDocumentDeleteView(APIView):
         # Assuming uploaded_by is the user who uploaded it.
         # Admins should be able to delete any document.
         is_owner = request.user == document.uploaded_by
-        is_admin = request.user.is_superuser or request.user.role in ['director', 'managing_director', 'admin']
+        is_admin = has_capability(request.user, 'delete_client_documents')
 
         if not (is_owner or is_admin):
              return Response(
@@ -211,7 +214,7 @@ class ProcessClientPaymentView(APIView):
         except Client.DoesNotExist:
             return Response({'error': 'Client not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        if not request.user.is_superuser and request.user.role not in ['admin', 'hr', 'manager', 'director']:
+        if not has_capability(request.user, 'manage_payroll'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         today = timezone.now().date()
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EmplyeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'emplyees'
+
+    def ready(self):
+        from . import signals
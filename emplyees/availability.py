@@ -0,0 +1,257 @@
+"""
+Team availability heatmap.
+
+For each day of a range and each department: headcount, how many people
+are on approved leave and how many are out at all (leave or an off-site
+event). Every employee's leave and event days are merged into disjoint
+intervals first, so overlapping records never count a person twice. The
+intervals are then expanded into per-day counts with a difference array
+(+1 on the first day, -1 after the last, running sum): the cost is
+O(intervals + days), whatever the leave lengths.
+
+Months are computed and cached per (department, month); a range reads the
+cached months and computes the missing ones together with three queries
+(headcount, leaves, events). Cached months are dropped through per-month
+versions bumped by the leave and event signals; employee changes
+(department moves, leavers) bump a global version.
+"""
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from cipher.cache import get_namespace_version, invalidate_namespace
+
+
+AVAILABILITY_CACHE_PREFIX = 'availability'
+AVAILABILITY_NAMESPACE = 'availability'
+UNASSIGNED_DEPARTMENT = 'Unassigned'
+
+# Event types that take the assigned employee away for the day
+AWAY_EVENT_TYPES = ['conference', 'training', 'workshop', 'client_meeting']
+# Events that mark the whole day off
+HOLIDAY_EVENT_TYPES = ['holiday']
+
+
+def month_bounds(year, month):
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def months_between(start, end):
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _month_version_key(year, month):
+    return f"{AVAILABILITY_CACHE_PREFIX}:ver:{year}-{month:02d}"
+
+
+def _month_version(year, month):
+    key = _month_version_key(year, month)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def _month_key(department, year, month):
+    department = (department or '*').lower().replace(' ', '_')
+    return (
+        f"{AVAILABILITY_CACHE_PREFIX}:{get_namespace_version(AVAILABILITY_NAMESPACE)}:"
+        f"{_month_version(year, month)}:{department}:{year}-{month:02d}"
+    )
+
+
+def invalidate_availability(start=None, end=None):
+    """
+    Drops the cached months overlapping [start, end], or every month when no range is given.
+    """
+    if start is None or end is None:
+        invalidate_namespace(AVAILABILITY_NAMESPACE)
+        return
+    for year, month in months_between(min(start, end), max(start, end)):
+        key = _month_version_key(year, month)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read, so nothing is cached under it yet
+            cache.add(key, 1, timeout=None)
+
+
+def merge_intervals(intervals):
+    """
+    Disjoint, sorted (start, end) intervals covering the same days; ends are inclusive.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def day_counts(intervals, start, end):
+    """
+    People per day of [start, end] from (start, end) intervals, via a difference array.
+    """
+    size = (end - start).days + 1
+    deltas = [0] * (size + 1)
+    for first, last in intervals:
+        first, last = max(first, start), min(last, end)
+        if first > last:
+            continue
+        deltas[(first - start).days] += 1
+        deltas[(last - start).days + 1] -= 1
+    counts = []
+    running = 0
+    for delta in deltas[:size]:
+        running += delta
+        counts.append(running)
+    return counts
+
+
+def _department_filter(queryset, department, field='department'):
+    if department is None:
+        return queryset
+    if department == UNASSIGNED_DEPARTMENT:
+        return queryset.filter(**{f"{field}__isnull": True}) | queryset.filter(**{field: ''})
+    return queryset.filter(**{f"{field}__iexact": department})
+
+
+def compute_availability(start, end, department=None):
+    """
+    {department: {'headcount', 'on_leave': [per day], 'out': [per day]}, and
+    the sorted holiday dates, for [start, end]. Three queries.
+    """
+    from events.models import Event
+    from .leave_periods import leaves_overlapping
+    from .models import CustomUser
+
+    employees = CustomUser.objects.filter(is_superuser=False, is_active=True)
+    headcount = {
+        (row['department'] or UNASSIGNED_DEPARTMENT): row['total']
+        for row in _department_filter(employees, department)
+        .order_by().values('department').annotate(total=Count('id'))
+    }
+
+    leaves = defaultdict(list)
+    departments = {}
+    rows = _department_filter(
+        leaves_overlapping(start, end, ['approved']).filter(employee__in=employees),
+        department, 'employee__department'
+    ).values_list('employee_id', 'employee__department', 'start_day', 'end_day')
+    for employee_id, employee_department, first, last in rows:
+        leaves[employee_id].append((first, last))
+        departments[employee_id] = employee_department or UNASSIGNED_DEPARTMENT
+
+    away = defaultdict(list)
+    holidays = set()
+    tz = timezone.get_current_timezone()
+    events = Event.objects.filter(
+        Q(event_type__in=HOLIDAY_EVENT_TYPES)
+        | Q(event_type__in=AWAY_EVENT_TYPES, assigned_employee__in=employees),
+        is_deleted=False,
+        event_date__date__gte=start,
+        event_date__date__lte=end
+    ).exclude(status='cancelled').values_list(
+        'event_type', 'event_date', 'assigned_employee_id', 'assigned_employee__department'
+    )
+    for event_type, event_date, employee_id, employee_department in events:
+        day = timezone.localtime(event_date, tz).date() if timezone.is_aware(event_date) else event_date.date()
+        if event_type in HOLIDAY_EVENT_TYPES:
+            holidays.add(day)
+            continue
+        employee_department = employee_department or UNASSIGNED_DEPARTMENT
+        if department is not None and employee_department.lower() != department.lower():
+            continue
+        away[employee_id].append((day, day))
+        departments[employee_id] = employee_department
+
+    on_leave_intervals = defaultdict(list)
+    out_intervals = defaultdict(list)
+    for employee_id, employee_department in departments.items():
+        on_leave_intervals[employee_department].extend(merge_intervals(leaves[employee_id]))
+        out_intervals[employee_department].extend(merge_intervals(leaves[employee_id] + away[employee_id]))
+
+    matrix = {}
+    for name in sorted(set(headcount) | set(departments.values())):
+        matrix[name] = {
+            'headcount': headcount.get(name, 0),
+            'on_leave': day_counts(on_leave_intervals[name], start, end),
+            'out': day_counts(out_intervals[name], start, end),
+        }
+    return {'departments': matrix, 'holidays': sorted(holidays)}
+
+
+def get_availability(start, end, department=None):
+    """
+    The availability matrix of [start, end], assembled from cached months.
+    """
+    months = list(months_between(start, end))
+    keys = {_month_key(department, year, month): (year, month) for year, month in months}
+    cached = cache.get_many(list(keys))
+    blocks = {keys[key]: value for key, value in cached.items()}
+
+    missing = [period for period in months if period not in blocks]
+    if missing:
+        first, _ = month_bounds(*missing[0])
+        _, last = month_bounds(*missing[-1])
+        computed = compute_availability(first, last, department)
+        to_cache = {}
+        for year, month in missing:
+            month_start, month_end = month_bounds(year, month)
+            offset, length = (month_start - first).days, (month_end - month_start).days + 1
+            block = {
+                'departments': {
+                    name: {
+                        'headcount': row['headcount'],
+                        'on_leave': row['on_leave'][offset:offset + length],
+                        'out': row['out'][offset:offset + length],
+                    }
+                    for name, row in computed['departments'].items()
+                },
+                'holidays': [day for day in computed['holidays'] if month_start <= day <= month_end],
+            }
+            blocks[(year, month)] = block
+            to_cache[_month_key(department, year, month)] = block
+        cache.set_many(to_cache, timeout=settings.AVAILABILITY_CACHE_TIMEOUT)
+
+    names = sorted({name for block in blocks.values() for name in block['departments']})
+    headcount = {}
+    holidays = set()
+    days = []
+    for year, month in months:
+        block = blocks[(year, month)]
+        month_start, month_end = month_bounds(year, month)
+        holidays.update(block['holidays'])
+        for name, row in block['departments'].items():
+            headcount[name] = row['headcount']
+        for index in range((month_end - month_start).days + 1):
+            day = month_start + timedelta(days=index)
+            if not start <= day <= end:
+                continue
+            counts = {}
+            for name in names:
+                row = block['departments'].get(name)
+                on_leave = row['on_leave'][index] if row else 0
+                out = row['out'][index] if row else 0
+                counts[name] = {
+                    'on_leave': on_leave,
+                    'out': out,
+                    'available': max((row['headcount'] if row else 0) - out, 0),
+                }
+            days.append({'date': day, 'holiday': day in holidays, 'departments': counts})
+
+    return {
+        'departments': [{'department': name, 'headcount': headcount.get(name, 0)} for name in names],
+        'days': days,
+    }
@@ -0,0 +1,30 @@
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+
+from .models import CustomUser
+
+
+class UsernameOrEmailBackend(ModelBackend):
+    """
+    Logs in with either the username or the email address. Both are unique
+    and indexed, so the user is found with one query and the password is
+    hashed once, whichever of the two was given.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(CustomUser.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        users = list(CustomUser._default_manager.filter(Q(username=username) | Q(email=username))[:2])
+        if not users:
+            # Hash anyway, so unknown logins take as long as wrong passwords
+            CustomUser().set_password(password)
+            return None
+        # A username that equals someone else's email address wins, as before
+        users.sort(key=lambda user: user.username != username)
+        for user in users:
+            if user.check_password(password) and self.user_can_authenticate(user):
+                return user
+        return None
@@ -0,0 +1,154 @@
+"""
+Leave balance accounting.
+
+Used days per category (approved leaves) and the pending/approved request
+counts are computed for any number of employees with one grouped query and
+cached per employee and year. Leaves count towards the year they start in,
+read from the indexed start_day column (see emplyees/leave_periods.py). The cache is dropped from the
+LeaveManagement signals whenever a leave's status, category, days or start
+date changes (see emplyees/signals.py).
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+from .leave_periods import parse_leave_day
+
+
+LEAVE_BALANCE_CACHE_PREFIX = 'leavebalance'
+
+# LeaveManagement category -> LeaveBalance field prefix (<prefix>_total)
+BALANCE_CATEGORIES = {
+    'Annual Leave': 'annual',
+    'Casual Leave': 'casual',
+    'Sick Leave': 'sick',
+}
+
+
+def leave_year(start_date):
+    """
+    Year a leave counts towards, from its start date (date or ISO string).
+    Parsed the same way as start_day, so the invalidated year always matches
+    the one compute_leave_usage counts the leave in.
+    """
+    start_day = parse_leave_day(start_date)
+    return start_day.year if start_day else None
+
+
+def _usage_key(employee_id, year):
+    return f"{LEAVE_BALANCE_CACHE_PREFIX}:{employee_id}:{year}"
+
+
+def _empty_usage():
+    usage = {f"{prefix}_used": 0.0 for prefix in BALANCE_CATEGORIES.values()}
+    usage.update(pending_requests=0, approved_requests=0)
+    return usage
+
+
+def compute_leave_usage(employee_ids, year):
+    """
+    {employee id: usage} for one year, with one query for all employees.
+    """
+    from .models import LeaveManagement
+
+    annotations = {
+        f"{prefix}_used": Sum('total_days', filter=Q(status='approved', category=category))
+        for category, prefix in BALANCE_CATEGORIES.items()
+    }
+    rows = LeaveManagement.objects.filter(
+        employee_id__in=employee_ids,
+        start_day__year=year
+    ).order_by().values('employee_id').annotate(
+        pending_requests=Count('id', filter=Q(status='pending')),
+        approved_requests=Count('id', filter=Q(status='approved')),
+        **annotations
+    )
+
+    usage = {employee_id: _empty_usage() for employee_id in employee_ids}
+    for row in rows:
+        employee_usage = usage[row.pop('employee_id')]
+        for field, value in row.items():
+            employee_usage[field] = float(value or 0) if field.endswith('_used') else value
+    return usage
+
+
+def get_leave_usage(employee_ids, year):
+    """
+    Cached compute_leave_usage: only employees missing from the cache are queried.
+    """
+    employee_ids = list(employee_ids)
+    keys = {_usage_key(employee_id, year): employee_id for employee_id in employee_ids}
+    cached = cache.get_many(list(keys))
+    usage = {keys[key]: value for key, value in cached.items()}
+
+    missing = [employee_id for employee_id in employee_ids if employee_id not in usage]
+    if missing:
+        computed = compute_leave_usage(missing, year)
+        cache.set_many(
+            {_usage_key(employee_id, year): value for employee_id, value in computed.items()},
+            timeout=settings.LEAVE_BALANCE_CACHE_TIMEOUT
+        )
+        usage.update(computed)
+    return usage
+
+
+def invalidate_leave_usage(employee_id, *years):
+    cache.delete_many([_usage_key(employee_id, year) for year in set(years) if year])
+
+
+def summarize_balance(balance, usage):
+    """
+    Used/remaining days per category plus the totals the balance endpoints render.
+    """
+    summary = dict(usage)
+    for prefix in BALANCE_CATEGORIES.values():
+        summary[f"{prefix}_remaining"] = float(getattr(balance, f"{prefix}_total")) - usage[f"{prefix}_used"]
+    summary['leaves_used'] = sum(usage[f"{prefix}_used"] for prefix in BALANCE_CATEGORIES.values())
+    summary['total_balance'] = sum(summary[f"{prefix}_remaining"] for prefix in BALANCE_CATEGORIES.values())
+    return summary
+
+
+def balance_employees():
+    from .models import CustomUser
+    return CustomUser.objects.filter(is_superuser=False, is_active=True)
+
+
+def ensure_leave_balances(year, employees=None, carry_over_max=0):
+    """
+    Creates the missing LeaveBalance rows of `year` in bulk. New rows copy
+    the employee's totals from the previous year (default allotments when
+    there is none); with `carry_over_max`, up to that many unused annual
+    days are added on top. Returns the number of rows created.
+    """
+    from .models import LeaveBalance
+
+    if employees is None:
+        employees = balance_employees()
+    missing = list(
+        employees.exclude(leave_balances__year=year).values_list('id', flat=True)
+    )
+    if not missing:
+        return 0
+
+    previous = {
+        balance.employee_id: balance
+        for balance in LeaveBalance.objects.filter(employee_id__in=missing, year=year - 1)
+    }
+    usage = get_leave_usage(list(previous), year - 1) if carry_over_max and previous else {}
+
+    balances = []
+    for employee_id in missing:
+        balance = LeaveBalance(employee_id=employee_id, year=year)
+        last = previous.get(employee_id)
+        if last is not None:
+            for prefix in BALANCE_CATEGORIES.values():
+                setattr(balance, f"{prefix}_total", getattr(last, f"{prefix}_total"))
+            if carry_over_max:
+                unused = float(last.annual_total) - usage[employee_id]['annual_used']
+                carried = min(max(unused, 0), carry_over_max)
+                balance.annual_total += Decimal(str(carried))
+        balances.append(balance)
+    LeaveBalance.objects.bulk_create(balances, batch_size=1000, ignore_conflicts=True)
+    return len(balances)
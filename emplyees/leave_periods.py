@@ -0,0 +1,62 @@
+"""
+Leave periods as date ranges.
+
+LeaveManagement keeps start_date/end_date as the strings the app sends;
+save() mirrors them into the indexed start_day/end_day date columns, so
+overlap and "who is out" lookups are an index range scan on end_day
+(leaves still running on or after the period start) instead of parsing
+every stored string. Ranges are inclusive on both ends.
+
+Overlaps are refused in the views (with the employee row locked) rather
+than by a Postgres exclusion constraint on the day range: leaves stored
+before this check may overlap, and unreadable date strings leave the day
+columns empty, so the constraint could neither be added nor cover those
+rows until the data is cleaned up.
+"""
+from datetime import date, datetime
+
+from django.utils.dateparse import parse_date
+
+
+# Leaves that block the employee's calendar; rejected and cancelled ones don't
+BLOCKING_STATUSES = ['pending', 'approved']
+
+
+def parse_leave_day(value):
+    """
+    date for a stored leave date (date or 'YYYY-MM-DD...' string), None when it can't be read.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    try:
+        return parse_date(str(value).strip()[:10])
+    except ValueError:
+        return None
+
+
+def leaves_overlapping(start, end, statuses=None):
+    """
+    Leaves with at least one day in [start, end].
+    """
+    from .models import LeaveManagement
+
+    return LeaveManagement.objects.filter(
+        end_day__gte=start,
+        start_day__lte=end,
+        status__in=statuses or BLOCKING_STATUSES
+    )
+
+
+def find_overlapping_leave(employee, start, end, exclude=None):
+    """
+    The employee's first pending/approved leave sharing a day with
+    [start, end], or None.
+    """
+    leaves = leaves_overlapping(start, end).filter(employee=employee)
+    if exclude is not None and exclude.pk:
+        leaves = leaves.exclude(pk=exclude.pk)
+    return leaves.order_by('start_day').first()
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from cipher.cache import invalidate_namespace
+from cipher.images import generate_thumbnails, is_image
+from emplyees.models import CustomUser, EmployeeMedia
+
+
+class Command(BaseCommand):
+    help = "Creates missing thumbnails for profile images and image media files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate thumbnails that already exist')
+
+    def handle(self, *args, **options):
+        names = list(
+            CustomUser.objects.exclude(profile_image='').exclude(profile_image__isnull=True)
+            .values_list('profile_image', flat=True)
+        )
+        names += [
+            name for name in EmployeeMedia.objects.values_list('file', flat=True)
+            if is_image(name)
+        ]
+
+        processed = 0
+        written = 0
+        for name in names:
+            count = generate_thumbnails(name, force=options['force'])
+            if count:
+                processed += 1
+                written += count
+
+        if processed:
+            invalidate_namespace('employees')
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {len(names)} image(s); wrote {written} thumbnail file(s) for {processed} image(s)"
+        ))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from emplyees.leave_balances import balance_employees, ensure_leave_balances
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the leave balances of a new year for every active employee in bulk, copying "
+        "each employee's totals from the previous year. Run it once at the start of the year "
+        "(balances that already exist are left alone)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='Year to create balances for (default: the current year)')
+        parser.add_argument(
+            '--carry-over-max',
+            type=float,
+            default=0,
+            help='Carry up to this many unused annual leave days over from the previous year'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many balances are missing')
+
+    def handle(self, *args, **options):
+        year = options['year'] or timezone.now().year
+        if options['carry_over_max'] < 0:
+            raise CommandError("--carry-over-max cannot be negative.")
+
+        employees = balance_employees()
+        if options['dry_run']:
+            missing = employees.exclude(leave_balances__year=year).count()
+            self.stdout.write(f"Would create {missing} leave balance(s) for {year}")
+            return
+
+        with transaction.atomic():
+            created = ensure_leave_balances(year, employees, carry_over_max=options['carry_over_max'])
+        self.stdout.write(self.style.SUCCESS(f"Created {created} leave balance(s) for {year}"))
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:22
+
+import django.db.models.deletion
+import emplyees.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emplyees', '0033_alter_customuser_current_status_announcement'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='leavebalance',
+            name='employee',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_balances', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='leavebalance',
+            name='year',
+            field=models.IntegerField(default=emplyees.models.current_year),
+        ),
+    ]
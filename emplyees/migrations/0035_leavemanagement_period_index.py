@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:28
+
+from django.db import migrations, models
+from django.utils.dateparse import parse_date
+
+
+def parse_day(value):
+    try:
+        return parse_date(str(value or '').strip()[:10])
+    except ValueError:
+        return None
+
+
+def backfill_leave_days(apps, schema_editor):
+    LeaveManagement = apps.get_model('emplyees', 'LeaveManagement')
+    leaves = []
+    for leave in LeaveManagement.objects.only('start_date', 'end_date').iterator(chunk_size=2000):
+        leave.start_day = parse_day(leave.start_date)
+        leave.end_day = parse_day(leave.end_date)
+        leaves.append(leave)
+        if len(leaves) == 2000:
+            LeaveManagement.objects.bulk_update(leaves, ['start_day', 'end_day'])
+            leaves = []
+    LeaveManagement.objects.bulk_update(leaves, ['start_day', 'end_day'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emplyees', '0034_leavebalance_per_year'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leavemanagement',
+            name='end_day',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='leavemanagement',
+            name='start_day',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_leave_days, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='leavemanagement',
+            index=models.Index(fields=['end_day', 'start_day'], name='leave_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leavemanagement',
+            index=models.Index(fields=['employee', 'end_day', 'start_day'], name='leave_employee_period_idx'),
+        ),
+    ]
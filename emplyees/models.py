@@ -98,9 +98,37 @@ class CustomUser(AbstractUser):
     department = models.CharField(max_length=100, blank=True, null=True)
     designation = models.CharField(max_length=100, blank=True, null=True)
 
+    # Bumped whenever a field the access token carries changes; tokens
+    # stamped with an older version are checked against the database
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+
+    # Fields carried in the token claims, plus those that change login or deactivation
+    TOKEN_VERSION_FIELDS = ['username', 'role', 'user_type', 'is_active', 'is_superuser', 'is_staff', 'password']
+
     def __str__(self):
         return f"{self.username} - {self.get_role_display()}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        tracked = [
+            field for field in self.TOKEN_VERSION_FIELDS
+            if update_fields is None or field in update_fields
+        ]
+        if self.pk and tracked:
+            previous = CustomUser.objects.filter(pk=self.pk).values(*tracked).first()
+            if previous and any(previous[field] != getattr(self, field) for field in tracked):
+                self.token_version += 1
+                if update_fields is not None:
+                    kwargs['update_fields'] = [*update_fields, 'token_version']
+        super().save(*args, **kwargs)
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Users built from token claims only hold the claimed fields; the
+        # first access to any other field loads all of them in one query
+        if fields is not None and getattr(self, '_from_token_claims', False):
+            fields = set(fields) | self.get_deferred_fields()
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
 
 class EmployeeDocument(models.Model):
 
@@ -394,6 +422,10 @@ class LeaveManagement(models.Model):
     )
     
     
+    # start_date/end_date parsed on save, for the indexed range lookups in emplyees/leave_periods.py
+    start_day = models.DateField(blank=True, null=True, editable=False)
+    end_day = models.DateField(blank=True, null=True, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -401,21 +433,41 @@ class LeaveManagement(models.Model):
         ordering = ['-created_at']
         verbose_name = "Leave Application"
         verbose_name_plural = "Leave Applications"
+        indexes = [
+            # Leaves still running on or after a day are a small, recent slice of the table
+            models.Index(fields=['end_day', 'start_day'], name='leave_period_idx'),
+            models.Index(fields=['employee', 'end_day', 'start_day'], name='leave_employee_period_idx'),
+        ]
     
     def __str__(self):
         return f"{self.employee.employee_id} - {self.category} ({self.start_date} to {self.end_date})"
 
+    def save(self, *args, **kwargs):
+        from .leave_periods import parse_leave_day
+
+        self.start_day = parse_leave_day(self.start_date)
+        self.end_day = parse_leave_day(self.end_date)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'start_day', 'end_day'}
+        super().save(*args, **kwargs)
+
+
+def current_year():
+    return timezone.now().year
+
 
 class LeaveBalance(models.Model):
-    employee = models.OneToOneField(
+    # One balance per employee and year (see emplyees/leave_balances.py)
+    employee = models.ForeignKey(
         CustomUser,
         on_delete=models.CASCADE,
-        related_name='leave_balance'
+        related_name='leave_balances'
     )
     annual_total = models.DecimalField(max_digits=5, decimal_places=1, default=18.0)
     casual_total = models.DecimalField(max_digits=5, decimal_places=1, default=12.0)
     sick_total = models.DecimalField(max_digits=5, decimal_places=1, default=6.0)
-    year = models.IntegerField(default=timezone.now().year)
+    year = models.IntegerField(default=current_year)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import CustomUser, EmployeeDocument, EmployeeMedia, LeaveManagement, SalaryPayment, CameraDepartment, LeaveBalance, Announcement
+from cipher.images import thumbnail_url
 from django.contrib.auth import authenticate
 
 
@@ -14,16 +15,8 @@ class LoginSerializer(serializers.Serializer):
         password = data.get('password')
         
         if login_value and password:
-            # Try to authenticate with username
-            user = authenticate(username=login_value, password=password)
-            
-            # If username authentication fails, try with email
-            if not user:
-                try:
-                    user_obj = CustomUser.objects.get(email=login_value)
-                    user = authenticate(username=user_obj.username, password=password)
-                except CustomUser.DoesNotExist:
-                    user = None
+            # Username or email, see emplyees/backends.py
+            user = authenticate(self.context.get('request'), username=login_value, password=password)
 
             if user:
                 if user.is_active:
@@ -40,13 +33,14 @@ class LoginSerializer(serializers.Serializer):
 #employee list serializer
 class EmployeeListSerializer(serializers.ModelSerializer):
     profile_image_url = serializers.SerializerMethodField()
+    profile_image_thumb_url = serializers.SerializerMethodField()
     
     class Meta:
         model = CustomUser
         fields = [
             'id', 'username', 'email', 'first_name', 'last_name',
             'phone_number', 'role', 'current_status', 'department',
-            'designation','profile_image_url', 'date_of_birth',
+            'designation','profile_image_url', 'profile_image_thumb_url', 'date_of_birth',
         ]
         read_only_fields = ['created_at', 'updated_at']
     
@@ -58,6 +52,9 @@ class EmployeeListSerializer(serializers.ModelSerializer):
             return obj.profile_image.url
         return None
 
+    def get_profile_image_thumb_url(self, obj):
+        return thumbnail_url(obj.profile_image, request=self.context.get('request'))
+
 
 #employee create serializer
 class EmployeeCreateSerializer(serializers.ModelSerializer):
@@ -245,11 +242,12 @@ class EmployeeDocumentCreateSerializer(serializers.ModelSerializer):
 #employee media serializer (for reading)
 class EmployeeMediaSerializer(serializers.ModelSerializer):
     file_url = serializers.SerializerMethodField()
+    thumb_url = serializers.SerializerMethodField()
     
     class Meta:
         model = EmployeeMedia
         fields = [
-            'id', 'media_type', 'file_url', 'uploaded_at'
+            'id', 'media_type', 'file_url', 'thumb_url', 'uploaded_at'
         ]
        
     def get_file_url(self, obj):
@@ -260,6 +258,9 @@ class EmployeeMediaSerializer(serializers.ModelSerializer):
             return obj.file.url
         return None
 
+    def get_thumb_url(self, obj):
+        return thumbnail_url(obj.file, request=self.context.get('request'))
+
 
 #employee media create serializer (for uploading)
 class EmployeeMediaCreateSerializer(serializers.ModelSerializer):
@@ -333,6 +334,7 @@ class EmployeeDetailSerializer(serializers.ModelSerializer):
     salary_payment_history = SalaryPaymentSerializer(source='salary_payments', many=True, read_only=True)
     full_name = serializers.SerializerMethodField()
     profile_image_url = serializers.SerializerMethodField()  
+    profile_image_thumb_url = serializers.SerializerMethodField()
     payment_status = serializers.SerializerMethodField()
     payment_history_summary = serializers.SerializerMethodField()
     salary = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
@@ -344,7 +346,7 @@ class EmployeeDetailSerializer(serializers.ModelSerializer):
             'employee_id', 'department', 'designation', 'profile_image', 
             'emergency_contact_name', 'emergency_contact_phone', 'emergency_contact_relation',
             'address', 'city', 'state', 'postal_code', 'country',
-            'date_of_birth', 'gender', 'profile_image_url',  
+            'date_of_birth', 'gender', 'profile_image_url', 'profile_image_thumb_url',
             'documents', 'media_files', 'leave_records', 'salary_payment_history',
         ]
 
@@ -475,6 +477,9 @@ class EmployeeDetailSerializer(serializers.ModelSerializer):
             return obj.profile_image.url
         return None
 
+    def get_profile_image_thumb_url(self, obj):
+        return thumbnail_url(obj.profile_image, request=self.context.get('request'))
+
 
 # camera department list serializer
 class CameraDepartmentListSerializer(serializers.ModelSerializer):
@@ -511,7 +516,7 @@ class CameraDepartmentDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = CameraDepartment
         fields = [
-            'id', 'client', 'client_name',  
+            'id', 'client', 'client_name', 'employee_name',
             'uploaded_date', 'priority', 'link','file_path'
         ]
 
@@ -522,6 +527,28 @@ class CameraDepartmentDetailSerializer(serializers.ModelSerializer):
         return name if name.strip() else obj.employee.username
 
 
+def validate_leave_period(start_date, end_date, employee, exclude=None):
+    """
+    Rejects unreadable or reversed dates and leaves overlapping another
+    pending/approved leave of the same employee.
+    """
+    from .leave_periods import find_overlapping_leave, parse_leave_day
+
+    start, end = parse_leave_day(start_date), parse_leave_day(end_date)
+    if start is None or end is None:
+        raise serializers.ValidationError("Leave dates must be in YYYY-MM-DD format.")
+    if end < start:
+        raise serializers.ValidationError("End date cannot be before the start date.")
+    if employee is None:
+        return
+    overlap = find_overlapping_leave(employee, start, end, exclude=exclude)
+    if overlap is not None:
+        raise serializers.ValidationError(
+            f"This leave overlaps a {overlap.status} {overlap.category} "
+            f"from {overlap.start_date} to {overlap.end_date}."
+        )
+
+
 #Leave create serializer
 class LeaveCreateSerializer(serializers.ModelSerializer):
 
@@ -537,6 +564,11 @@ class LeaveCreateSerializer(serializers.ModelSerializer):
             'attachment',
         ]
 
+    def validate(self, data):
+        request = self.context.get('request')
+        validate_leave_period(data['start_date'], data['end_date'], request.user)
+        return data
+
     def create(self, validated_data):
         request = self.context.get('request')
         validated_data['employee'] = request.user
@@ -581,6 +613,20 @@ class LeaveUpdateSerializer(serializers.ModelSerializer):
         read_only_fields = ['employee', 'created_at', 'updated_at']
 
     def validate(self, data):
+        from .leave_periods import BLOCKING_STATUSES
+
+        leave = self.instance
+        status = data.get('status', leave.status)
+        # Re-check when the dates move or a rejected/cancelled leave is reopened
+        if status in BLOCKING_STATUSES and (
+            'start_date' in data or 'end_date' in data or leave.status not in BLOCKING_STATUSES
+        ):
+            validate_leave_period(
+                data.get('start_date', leave.start_date),
+                data.get('end_date', leave.end_date),
+                leave.employee,
+                exclude=leave
+            )
         return data
 
 
@@ -625,58 +671,63 @@ class LeaveBalanceSerializer(serializers.ModelSerializer):
             'total_balance', 'leaves_used', 'pending_requests', 'upcoming_leaves'
         ]
 
-    def get_used_days(self, obj, category):
-        from django.db.models import Sum
-        from .models import LeaveManagement
-        
-        year = obj.year
-        used = LeaveManagement.objects.filter(
-            employee=obj.employee,
-            category=category,
-            status='approved',
-            created_at__year=year
-        ).aggregate(Sum('total_days'))['total_days__sum'] or 0
-        return float(used)
+    def get_summary(self, obj):
+        """
+        Used/remaining days of the balance. Lists pass every employee's usage
+        in the 'leave_usage' context (one query, see leave_balances.py).
+        """
+        from .leave_balances import get_leave_usage, summarize_balance
+
+        if not hasattr(obj, '_leave_summary'):
+            usage = self.context.get('leave_usage', {}).get(obj.employee_id)
+            if usage is None:
+                usage = get_leave_usage([obj.employee_id], obj.year)[obj.employee_id]
+            obj._leave_summary = summarize_balance(obj, usage)
+        return obj._leave_summary
 
     def get_annual_used(self, obj):
-        return self.get_used_days(obj, 'Annual Leave')
+        return self.get_summary(obj)['annual_used']
 
     def get_casual_used(self, obj):
-        return self.get_used_days(obj, 'Casual Leave')
+        return self.get_summary(obj)['casual_used']
 
     def get_sick_used(self, obj):
-        return self.get_used_days(obj, 'Sick Leave')
+        return self.get_summary(obj)['sick_used']
 
     def get_annual_remaining(self, obj):
-        return float(obj.annual_total) - self.get_annual_used(obj)
+        return self.get_summary(obj)['annual_remaining']
 
     def get_casual_remaining(self, obj):
-        return float(obj.casual_total) - self.get_casual_used(obj)
+        return self.get_summary(obj)['casual_remaining']
 
     def get_sick_remaining(self, obj):
-        return float(obj.sick_total) - self.get_sick_used(obj)
+        return self.get_summary(obj)['sick_remaining']
 
     def get_total_balance(self, obj):
-        return self.get_annual_remaining(obj) + self.get_casual_remaining(obj) + self.get_sick_remaining(obj)
+        return self.get_summary(obj)['total_balance']
 
     def get_leaves_used(self, obj):
-        return self.get_annual_used(obj) + self.get_casual_used(obj) + self.get_sick_used(obj)
+        return self.get_summary(obj)['leaves_used']
 
     def get_pending_requests(self, obj):
-        from .models import LeaveManagement
-        return LeaveManagement.objects.filter(
-            employee=obj.employee,
-            status='pending',
-            created_at__year=obj.year
-        ).count()
+        return self.get_summary(obj)['pending_requests']
 
     def get_upcoming_leaves(self, obj):
-        from .models import LeaveManagement
-        return LeaveManagement.objects.filter(
-            employee=obj.employee,
-            status='approved',
-            created_at__year=obj.year
-        ).count()
+        return self.get_summary(obj)['approved_requests']
+
+
+class LeaveBalanceSheetSerializer(LeaveBalanceSerializer):
+    employee_id = serializers.IntegerField(source='employee.id', read_only=True)
+    employee_code = serializers.CharField(source='employee.employee_id', read_only=True)
+    employee_name = serializers.SerializerMethodField()
+    department = serializers.CharField(source='employee.department', read_only=True)
+
+    class Meta(LeaveBalanceSerializer.Meta):
+        fields = ['employee_id', 'employee_code', 'employee_name', 'department'] + LeaveBalanceSerializer.Meta.fields
+
+    def get_employee_name(self, obj):
+        name = obj.employee.get_full_name()
+        return name if name.strip() else obj.employee.username
 
 class AnnouncementSerializer(serializers.ModelSerializer):
     created_by_name = serializers.SerializerMethodField()
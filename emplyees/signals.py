@@ -0,0 +1,104 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from cipher.authentication import forget_token_version, remember_token_version
+from cipher.cache import invalidate_namespace
+from cipher.images import schedule_thumbnails
+from events.models import Event
+from .availability import invalidate_availability
+from .leave_balances import invalidate_leave_usage, leave_year
+from .leave_periods import parse_leave_day
+from .models import CustomUser, Announcement, EmployeeMedia, LeaveManagement
+
+
+# LeaveManagement fields leave balances and team availability are computed from
+LEAVE_TRACKED_FIELDS = ['employee_id', 'status', 'category', 'total_days', 'start_date', 'end_date']
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_employee_cache(sender, instance, **kwargs):
+    # Logins only touch last_login, which no cached response renders
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    # Announcements render the author's name
+    invalidate_namespace('employees', 'announcements')
+    # Headcount and departments of the availability heatmap
+    invalidate_availability()
+
+
+@receiver(post_save, sender=CustomUser)
+def cache_token_version(sender, instance, **kwargs):
+    # Tokens stamped with an older version stop being trusted (cipher/authentication.py)
+    remember_token_version(instance.pk, instance.token_version)
+
+
+@receiver(post_delete, sender=CustomUser)
+def forget_deleted_token_version(sender, instance, **kwargs):
+    forget_token_version(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Announcement)
+def invalidate_announcement_cache(sender, instance, **kwargs):
+    invalidate_namespace('announcements')
+
+
+@receiver(post_save, sender=CustomUser)
+def create_profile_image_thumbnails(sender, instance, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if update_fields and 'profile_image' not in update_fields:
+        return
+    if instance.profile_image:
+        # Cached employee lists fall back to the original until the thumbnail exists
+        schedule_thumbnails(
+            instance.profile_image.name,
+            on_done=lambda: invalidate_namespace('employees')
+        )
+
+
+@receiver(post_save, sender=EmployeeMedia)
+def create_employee_media_thumbnails(sender, instance, created, **kwargs):
+    if created and instance.file:
+        schedule_thumbnails(instance.file.name)
+
+
+@receiver(pre_save, sender=LeaveManagement)
+def remember_leave_fields(sender, instance, **kwargs):
+    instance._previous_leave = None
+    if instance.pk:
+        instance._previous_leave = LeaveManagement.objects.filter(pk=instance.pk).values(*LEAVE_TRACKED_FIELDS).first()
+
+
+@receiver(post_save, sender=LeaveManagement)
+def invalidate_leave_caches_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_leave', None)
+    current = {field: getattr(instance, field) for field in LEAVE_TRACKED_FIELDS}
+    # Remarks, attachments and the like don't change balances or availability
+    if previous and all(str(previous[field]) == str(current[field]) for field in LEAVE_TRACKED_FIELDS):
+        return
+    invalidate_leave_usage(instance.employee_id, leave_year(instance.start_date))
+    if previous and previous['employee_id']:
+        invalidate_leave_usage(previous['employee_id'], leave_year(previous['start_date']))
+    invalidate_availability(instance.start_day, instance.end_day)
+    if previous:
+        invalidate_availability(parse_leave_day(previous['start_date']), parse_leave_day(previous['end_date']))
+
+
+@receiver(post_delete, sender=LeaveManagement)
+def invalidate_leave_caches_on_delete(sender, instance, **kwargs):
+    invalidate_leave_usage(instance.employee_id, leave_year(instance.start_date))
+    invalidate_availability(instance.start_day, instance.end_day)
+
+
+@receiver(pre_save, sender=Event)
+def remember_event_day(sender, instance, **kwargs):
+    instance._previous_event_date = None
+    if instance.pk:
+        instance._previous_event_date = Event.objects.filter(pk=instance.pk).values_list('event_date', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_availability_for_event(sender, instance, **kwargs):
+    for event_date in {instance.event_date, getattr(instance, '_previous_event_date', None)} - {None}:
+        day = timezone.localtime(event_date).date() if timezone.is_aware(event_date) else event_date.date()
+        invalidate_availability(day, day)
@@ -1,4 +1,82 @@
+from types import SimpleNamespace
+
 from django.test import TestCase
 
-# Create your tests here.
+from .leave_balances import compute_leave_usage
+from .models import CustomUser, LeaveManagement
+from .serializers import LeaveCreateSerializer, LeaveUpdateSerializer
+
+
+class LeaveOverlapTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = CustomUser.objects.create_user(username='leaver', email='leaver@example.com', password='x')
+        cls.leave = LeaveManagement.objects.create(
+            employee=cls.employee, category='Casual Leave', start_date='2026-03-10', end_date='2026-03-12',
+            total_days=3, reason='Trip', status='approved',
+        )
+
+    def apply(self, start_date, end_date, employee=None):
+        return LeaveCreateSerializer(
+            data={
+                'category': 'Sick Leave', 'start_date': start_date, 'end_date': end_date,
+                'total_days': 1, 'reason': 'Unwell',
+            },
+            context={'request': SimpleNamespace(user=employee or self.employee)},
+        )
+
+    def test_overlapping_leave_is_rejected(self):
+        for start, end in [('2026-03-12', '2026-03-14'), ('2026-03-08', '2026-03-10'), ('2026-03-01', '2026-03-31')]:
+            with self.subTest(start=start, end=end):
+                serializer = self.apply(start, end)
+                self.assertFalse(serializer.is_valid())
+                self.assertIn('Casual Leave from 2026-03-10 to 2026-03-12', str(serializer.errors['non_field_errors'][0]))
+
+    def test_adjacent_leave_is_accepted(self):
+        self.assertTrue(self.apply('2026-03-13', '2026-03-13').is_valid())
+        self.assertTrue(self.apply('2026-03-08', '2026-03-09').is_valid())
+
+    def test_other_employees_and_rejected_leaves_do_not_block(self):
+        colleague = CustomUser.objects.create_user(username='colleague', email='colleague@example.com', password='x')
+        self.assertTrue(self.apply('2026-03-11', '2026-03-11', employee=colleague).is_valid())
+
+        LeaveManagement.objects.filter(pk=self.leave.pk).update(status='rejected')
+        self.assertTrue(self.apply('2026-03-11', '2026-03-11').is_valid())
+
+    def test_update_does_not_collide_with_itself(self):
+        serializer = LeaveUpdateSerializer(
+            self.leave, data={'start_date': '2026-03-11', 'end_date': '2026-03-13'}, partial=True
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        self.leave.refresh_from_db()
+        self.assertEqual((str(self.leave.start_day), str(self.leave.end_day)), ('2026-03-11', '2026-03-13'))
+
+    def test_update_onto_another_leave_is_rejected(self):
+        other = LeaveManagement.objects.create(
+            employee=self.employee, category='Sick Leave', start_date='2026-03-20', end_date='2026-03-20',
+            total_days=1, reason='Unwell', status='pending',
+        )
+        serializer = LeaveUpdateSerializer(other, data={'start_date': '2026-03-12'}, partial=True)
+        self.assertFalse(serializer.is_valid())
+
+    def test_unreadable_or_reversed_dates_are_rejected(self):
+        self.assertFalse(self.apply('12/03/2026', '2026-03-13').is_valid())
+        self.assertFalse(self.apply('2026-03-20', '2026-03-19').is_valid())
+
+
+class LeaveUsageTests(TestCase):
+
+    def test_leaves_count_towards_the_year_they_start_in(self):
+        employee = CustomUser.objects.create_user(username='usage', email='usage@example.com', password='x')
+        for start_date, end_date, days in [
+            ('2025-12-30', '2026-01-02', 4), ('2026-01-05', '2026-01-05', 1), ('2026-06-01T00:00:00', '2026-06-02', 2),
+        ]:
+            LeaveManagement.objects.create(
+                employee=employee, category='Annual Leave', start_date=start_date, end_date=end_date,
+                total_days=days, reason='Holiday', status='approved',
+            )
 
+        self.assertEqual(compute_leave_usage([employee.id], 2025)[employee.id]['annual_used'], 4)
+        self.assertEqual(compute_leave_usage([employee.id], 2026)[employee.id]['annual_used'], 3)
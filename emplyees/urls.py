@@ -51,6 +51,9 @@ urlpatterns = [
     path('leaves/<int:pk>/', views.LeaveDetailView.as_view(), name='leave-detail'),
     path('leaves/<int:pk>/process/', views.LeaveApprovalRejectView.as_view(), name='leave-process'),
     path('leaves/balance/', views.LeaveBalanceView.as_view(), name='leave-balance'),
+    path('leaves/balances/', views.LeaveBalanceSheetView.as_view(), name='leave-balance-sheet'),
+    path('leaves/out/', views.LeaveWhoIsOutView.as_view(), name='leave-who-is-out'),
+    path('leaves/availability/', views.TeamAvailabilityView.as_view(), name='team-availability'),
 
     #Salary Payment
     path('salary-payment-history/', views.SalaryPaymentListView.as_view(), name='salary-payment-history'),
@@ -3,12 +3,16 @@ from rest_framework.decorators import api_view, permission_classes, parser_class
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser  # Add this import
-from rest_framework_simplejwt.tokens import RefreshToken
+from cipher.authentication import ClaimsRefreshToken
+from cipher.throttling import LoginRateThrottle
 from django.contrib.auth import login
+from django.db import transaction
 from django.db.models import Prefetch
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from datetime import date
+from cipher.cache import cache_response
+from cipher.permissions import HasCapability, has_capability
 from .models import CustomUser, EmployeeDocument, EmployeeMedia, LeaveManagement, SalaryPayment, CameraDepartment, Announcement
 from rest_framework.views import APIView
 from .serializers import (
@@ -37,11 +41,13 @@ from .serializers import (
 
 # login view 
 class LoginView(APIView):
+    throttle_classes = [LoginRateThrottle]
+
     def post(self, request):
-        serializer = LoginSerializer(data=request.data)
+        serializer = LoginSerializer(data=request.data, context={'request': request})
         if serializer.is_valid(): 
             user = serializer.validated_data['user']
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({
                 'user': user.role,
                 'user_info': {
@@ -64,7 +70,7 @@ class LogoutView(APIView):
     def post(self, request):
         try:
             refresh_token = request.data.get("refresh")
-            token = RefreshToken(refresh_token)
+            token = ClaimsRefreshToken(refresh_token)
             token.blacklist()
             return Response({"message": "Successfully logged out"}, status=status.HTTP_205_RESET_CONTENT)
         except Exception as e:
@@ -75,6 +81,7 @@ class LogoutView(APIView):
 class EmployeeListView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @cache_response('employees')
     def get(self, request):
         employees = CustomUser.objects.filter(is_superuser=False,is_active=True).select_related()
         
@@ -103,7 +110,7 @@ class EmployeeCreateView(APIView):
 
     def post(self, request):
         try:
-            if not request.user.is_superuser and request.user.role not in ['director', 'managing_director']:
+            if not has_capability(request.user, 'manage_employees'):
                 return Response (
                     {'error': 'You do not have permission to create employees'},
                     status=status.HTTP_403_FORBIDDEN
@@ -203,7 +210,7 @@ class EmployeeUpdateView(APIView):
 
     def update(self, request, employee_id, partial=False):
         try:
-            if not request.user.is_superuser and request.user.role not in ['director', 'managing_director', 'manager']:
+            if not has_capability(request.user, 'update_employees'):
                 return Response(
                     {'error': 'You do not have permission to update employees'},
                     status=status.HTTP_403_FORBIDDEN
@@ -301,7 +308,7 @@ class EmployeeDeleteView(APIView):
         print("Delete employee called for ID:", employee_id)
         try:
            
-            if not request.user.is_superuser and request.user.role not in ['director', 'managing_director']:
+            if not has_capability(request.user, 'manage_employees'):
                 return Response(
                     {'error': 'You do not have permission to delete employees'},
                     status=status.HTTP_403_FORBIDDEN
@@ -353,7 +360,7 @@ class EmployeeDocumentCreateView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        if not request.user.is_superuser and request.user.role not in ['director', 'managing_director'] and request.user.id != employee.id:
+        if not has_capability(request.user, 'manage_employees') and request.user.id != employee.id:
             return Response (
                 {'error': 'You do not have permission to upload documents for this employee'},
                 status=status.HTTP_403_FORBIDDEN
@@ -394,7 +401,7 @@ class EmployeeMediaCreateView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        if not request.user.is_superuser and request.user.role not in ['superuser', 'admin'] and request.user.id != employee.id:
+        if not has_capability(request.user, 'upload_employee_media') and request.user.id != employee.id:
             return Response (
                 {'error': 'You do not have permission to upload media for this employee'},
                 status=status.HTTP_403_FORBIDDEN
@@ -433,7 +440,7 @@ class EmployeeDocumentDeleteView(APIView):
 
         # Check permissions: owner or admin/hr/director
         is_owner = request.user == document.user
-        is_admin = request.user.is_superuser or request.user.role in ['director', 'managing_director', 'admin', 'hr']
+        is_admin = has_capability(request.user, 'delete_employee_files')
 
         if not (is_owner or is_admin):
              return Response(
@@ -463,7 +470,7 @@ class EmployeeMediaDeleteView(APIView):
 
         # Check permissions: owner or admin/hr/director
         is_owner = request.user == media.user
-        is_admin = request.user.is_superuser or request.user.role in ['director', 'managing_director', 'admin', 'hr']
+        is_admin = has_capability(request.user, 'delete_employee_files')
 
         if not (is_owner or is_admin):
              return Response(
@@ -489,7 +496,7 @@ class SalaryPaymentListView(APIView):
         if employee_id:
             # Check permissions: allow if searching for self OR if user has administrative role
             is_self = str(employee_id) == str(request.user.id)
-            is_admin = request.user.is_superuser or request.user.role in ['admin', 'hr', 'manager', 'director']
+            is_admin = has_capability(request.user, 'manage_payroll')
             
             if not (is_self or is_admin):
                 return Response(
@@ -516,7 +523,7 @@ class ProcessSalaryPaymentView(APIView):
         except CustomUser.DoesNotExist:
             return Response({'error': 'Employee not found'}, status=status.HTTP_404_NOT_FOUND)
             
-        if not request.user.is_superuser and request.user.role not in ['admin', 'hr', 'manager', 'director']:
+        if not has_capability(request.user, 'manage_payroll'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
             
         today = timezone.now().date()
@@ -655,9 +662,7 @@ class CameraDepartmentListView(APIView):
     
     def get(self, request):
         
-        if not request.user.is_superuser and request.user.role not in ['admin'] and request.user.user_type not in [
-            'camera_department', 'hr', 'manager', 'content_creator', 'editor'
-        ]:
+        if not has_capability(request.user, 'manage_camera_projects'):
             return Response(
                 {'error': 'You do not have permission to view camera department projects'},
                 status=status.HTTP_403_FORBIDDEN
@@ -671,11 +676,7 @@ class CameraDepartmentListView(APIView):
         serializer = CameraDepartmentListSerializer(projects, many=True)
         
         # Check if user can create projects
-        can_create = (
-            request.user.is_superuser or 
-            request.user.role in ['admin'] or 
-            request.user.user_type in ['camera_department', 'content_creator', 'manager', 'hr', 'editor']
-        )
+        can_create = has_capability(request.user, 'manage_camera_projects')
         
         return Response({
             'projects': serializer.data,
@@ -689,9 +690,7 @@ class CameraDepartmentCreateView(APIView):
 
     def post(self, request):
         
-        if not request.user.is_superuser and request.user.role not in ['admin'] and request.user.user_type not in [
-            'camera_department', 'content_creator', 'manager', 'hr', 'editor'
-        ]:
+        if not has_capability(request.user, 'manage_camera_projects'):
             return Response(
                 {'error': 'You do not have permission to create camera department projects'},
                 status=status.HTTP_403_FORBIDDEN
@@ -727,9 +726,7 @@ class CameraDepartmentDetailView(APIView):
         if not project:
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        if not request.user.is_superuser and request.user.role not in ['admin'] and request.user.user_type not in [
-            'camera_department', 'content_creator', 'manager', 'hr', 'editor'
-        ]:
+        if not has_capability(request.user, 'manage_camera_projects'):
             return Response(
                 {'error': 'You do not have permission to update camera department projects'},
                 status=status.HTTP_403_FORBIDDEN
@@ -745,9 +742,7 @@ class CameraDepartmentDetailView(APIView):
         if not project:
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        if not request.user.is_superuser and request.user.role not in ['admin'] and request.user.user_type not in [
-            'camera_department', 'content_creator', 'manager', 'hr', 'editor'
-        ]:
+        if not has_capability(request.user, 'manage_camera_projects'):
             return Response(
                 {'error': 'You do not have permission to delete camera department projects'},
                 status=status.HTTP_403_FORBIDDEN
@@ -765,12 +760,15 @@ class LeaveCreateView(APIView):
             data=request.data,
             context={'request': request}
         )
-        if serializer.is_valid():
-            serializer.save(employee=request.user)
-            return Response(
-                {'message': 'Leave applied successfully'},
-                status=status.HTTP_201_CREATED
-            )
+        with transaction.atomic():
+            # Serializes concurrent applications of one employee for the overlap check
+            CustomUser.objects.select_for_update().filter(pk=request.user.pk).first()
+            if serializer.is_valid():
+                serializer.save(employee=request.user)
+                return Response(
+                    {'message': 'Leave applied successfully'},
+                    status=status.HTTP_201_CREATED
+                )
         print("Leave serializer errors:", serializer.errors)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -783,7 +781,7 @@ class LeaveListView(APIView):
         user = request.user
         status_filter = request.query_params.get('status')
 
-        if user.is_superuser or user.role in ['manager', 'hr', 'admin', 'director']:
+        if has_capability(user, 'manage_leaves'):
             leaves = LeaveManagement.objects.select_related(
                 'employee', 'approved_by'
             )
@@ -817,7 +815,7 @@ class LeaveDetailView(APIView):
 
         if (
             request.user != leave.employee and
-            request.user.role not in ['manager', 'hr', 'admin', 'director']
+            not has_capability(request.user, 'manage_leaves')
         ):
             return Response(
                 {'error': 'Permission denied'},
@@ -843,7 +841,7 @@ class LeaveDetailView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        is_staff = request.user.role in ['manager', 'hr', 'admin', 'director']
+        is_staff = has_capability(request.user, 'manage_leaves')
         is_owner = request.user == leave.employee
 
         if not (is_staff or is_owner):
@@ -865,19 +863,21 @@ class LeaveDetailView(APIView):
                 )
 
         serializer = LeaveUpdateSerializer(leave, data=request.data, partial=partial)
-        if serializer.is_valid():
-            if is_staff and 'status' in request.data:
-                serializer.save(approved_by=request.user, approved_at=timezone.now())
-            else:
-                serializer.save()
-            
-            return Response(
-                {
-                    'message': 'Leave record updated successfully',
-                    'leave': LeaveDetailSerializer(leave, context={'request': request}).data
-                },
-                status=status.HTTP_200_OK
-            )
+        with transaction.atomic():
+            CustomUser.objects.select_for_update().filter(pk=leave.employee_id).first()
+            if serializer.is_valid():
+                if is_staff and 'status' in request.data:
+                    serializer.save(approved_by=request.user, approved_at=timezone.now())
+                else:
+                    serializer.save()
+                
+                return Response(
+                    {
+                        'message': 'Leave record updated successfully',
+                        'leave': LeaveDetailSerializer(leave, context={'request': request}).data
+                    },
+                    status=status.HTTP_200_OK
+                )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
@@ -891,7 +891,7 @@ class LeaveDetailView(APIView):
 
         if (
             request.user != leave.employee and
-            request.user.role not in ['manager', 'hr', 'admin', 'director']
+            not has_capability(request.user, 'manage_leaves')
         ):
             return Response(
                 {'error': 'Permission denied'},
@@ -908,7 +908,9 @@ class LeaveDetailView(APIView):
 
 class LeaveApprovalRejectView(APIView):
 
-    permission_classes = [IsAuthenticated]
+    permission_classes = [HasCapability]
+    required_capabilities = {'PUT': 'manage_leaves'}
+    capability_denied_message = 'You do not have permission to approve/reject leave applications'
 
     def put(self, request, pk):
         try:
@@ -919,13 +921,6 @@ class LeaveApprovalRejectView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Check permissions: only manager, hr, admin, or director can approve/reject
-        if request.user.role not in ['manager', 'hr', 'admin', 'director'] and not request.user.is_superuser:
-            return Response(
-                {'error': 'You do not have permission to approve/reject leave applications'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         if leave.status != 'pending':
             return Response(
                 {'error': 'This leave application has already been processed'},
@@ -963,23 +958,164 @@ class LeaveBalanceView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        from .leave_balances import ensure_leave_balances
         from .models import LeaveBalance
         from .serializers import LeaveBalanceSerializer
-        from django.utils import timezone
         
-        balance, created = LeaveBalance.objects.get_or_create(
-            employee=request.user,
-            year=timezone.now().year
-        )
+        year = timezone.now().year
+        balance = LeaveBalance.objects.filter(employee=request.user, year=year).first()
+        if balance is None:
+            ensure_leave_balances(year, CustomUser.objects.filter(pk=request.user.pk))
+            balance = LeaveBalance.objects.get(employee=request.user, year=year)
         
         serializer = LeaveBalanceSerializer(balance)
         return Response(serializer.data)
 
 
+class LeaveBalanceSheetView(APIView):
+    """
+    Every active employee's leave balance for a year (?year=, default the
+    current one; ?department= filters), for HR. Missing balances are created
+    on the way and usage comes from one grouped query or the cache.
+    """
+    permission_classes = [HasCapability]
+    required_capabilities = {'GET': 'manage_leaves'}
+    capability_denied_message = 'You do not have permission to view leave balances'
+
+    def get(self, request):
+        from .leave_balances import balance_employees, ensure_leave_balances, get_leave_usage
+        from .models import LeaveBalance
+        from .serializers import LeaveBalanceSheetSerializer
+
+        try:
+            year = int(request.query_params.get('year', timezone.now().year))
+        except ValueError:
+            return Response({'error': 'Invalid year'}, status=status.HTTP_400_BAD_REQUEST)
+
+        employees = balance_employees()
+        department = request.query_params.get('department')
+        if department:
+            employees = employees.filter(department__icontains=department)
+        ensure_leave_balances(year, employees)
+
+        balances = list(
+            LeaveBalance.objects.filter(employee__in=employees, year=year)
+            .select_related('employee')
+            .order_by('employee__first_name', 'employee__last_name', 'employee_id')
+        )
+        usage = get_leave_usage([balance.employee_id for balance in balances], year)
+        serializer = LeaveBalanceSheetSerializer(balances, many=True, context={'leave_usage': usage})
+        return Response({
+            'year': year,
+            'count': len(balances),
+            'balances': serializer.data
+        })
+
+
+class LeaveWhoIsOutView(APIView):
+    """
+    Employees on leave on a day (?date=, default today) or during a range
+    (?from=&to=), for managers. Approved leaves only unless
+    ?include_pending=true; ?department= narrows it to a team. Served from
+    the leave period index.
+    """
+    permission_classes = [HasCapability]
+    required_capabilities = {'GET': 'manage_leaves'}
+    capability_denied_message = 'You do not have permission to view who is on leave'
+
+    def get(self, request):
+        from .leave_periods import leaves_overlapping, parse_leave_day
+
+        params = request.query_params
+        if params.get('from') or params.get('to'):
+            start = parse_leave_day(params.get('from'))
+            end = parse_leave_day(params.get('to') or params.get('from'))
+        else:
+            start = end = parse_leave_day(params.get('date')) if params.get('date') else timezone.localdate()
+        if start is None or end is None:
+            return Response({'error': 'Dates must be in YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+        if end < start:
+            return Response({'error': 'to cannot be before from'}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start).days > 366:
+            return Response({'error': 'Range cannot exceed one year'}, status=status.HTTP_400_BAD_REQUEST)
+
+        statuses = ['approved']
+        if params.get('include_pending', '').lower() in ['1', 'true', 'yes']:
+            statuses.append('pending')
+        leaves = leaves_overlapping(start, end, statuses).exclude(employee=None).select_related('employee')
+        department = params.get('department')
+        if department:
+            leaves = leaves.filter(employee__department__icontains=department)
+
+        out = []
+        for leave in leaves.order_by('start_day', 'employee__first_name'):
+            employee = leave.employee
+            name = employee.get_full_name()
+            out.append({
+                'leave_id': leave.id,
+                'employee_id': employee.id,
+                'employee_name': name if name.strip() else employee.username,
+                'department': employee.department,
+                'category': leave.category,
+                'status': leave.status,
+                'start_date': leave.start_date,
+                'end_date': leave.end_date,
+                'total_days': leave.total_days,
+            })
+        return Response({
+            'from': start,
+            'to': end,
+            'count': len({entry['employee_id'] for entry in out}),
+            'leaves': out
+        })
+
+
+class TeamAvailabilityView(APIView):
+    """
+    Per-day, per-department absence matrix for managers: a month
+    (?month=&year=, default the current one) or a range of up to 92 days
+    (?from=&to=), optionally for one ?department=.
+    """
+    permission_classes = [HasCapability]
+    required_capabilities = {'GET': 'manage_leaves'}
+    capability_denied_message = 'You do not have permission to view team availability'
+
+    def get(self, request):
+        from .availability import get_availability, month_bounds
+        from .leave_periods import parse_leave_day
+
+        params = request.query_params
+        if params.get('from') or params.get('to'):
+            start = parse_leave_day(params.get('from'))
+            end = parse_leave_day(params.get('to'))
+            if start is None or end is None:
+                return Response({'error': 'Dates must be in YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            today = timezone.localdate()
+            try:
+                start, end = month_bounds(int(params.get('year', today.year)), int(params.get('month', today.month)))
+            except ValueError:
+                return Response({'error': 'Invalid month or year'}, status=status.HTTP_400_BAD_REQUEST)
+        if end < start:
+            return Response({'error': 'to cannot be before from'}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start).days >= 92:
+            return Response({'error': 'Range cannot exceed 92 days'}, status=status.HTTP_400_BAD_REQUEST)
+
+        department = params.get('department') or None
+        availability = get_availability(start, end, department)
+        return Response({
+            'from': start,
+            'to': end,
+            'department': department,
+            **availability
+        })
+
+
 # Announcement ViewSet
 class AnnouncementViewSet(APIView):
     permission_classes = [IsAuthenticated]
 
+    @cache_response('announcements')
     def get(self, request):
         announcements = Announcement.objects.filter(is_active=True).select_related('created_by')
         serializer = AnnouncementSerializer(announcements, many=True, context={'request': request})
@@ -987,7 +1123,7 @@ class AnnouncementViewSet(APIView):
 
     def post(self, request):
         # Only admins/directors can post announcements
-        if request.user.role not in ['admin', 'director', 'managing_director'] and not request.user.is_superuser:
+        if not has_capability(request.user, 'manage_announcements'):
             return Response(
                 {'error': 'Only admins can post announcements'},
                 status=status.HTTP_403_FORBIDDEN
@@ -1020,7 +1156,7 @@ class AnnouncementDetailView(APIView):
         if not announcement:
             return Response({'error': 'Announcement not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        if request.user.role not in ['admin', 'director', 'managing_director'] and not request.user.is_superuser:
+        if not has_capability(request.user, 'manage_announcements'):
             return Response(
                 {'error': 'Only admins can update announcements'},
                 status=status.HTTP_403_FORBIDDEN
@@ -1037,7 +1173,7 @@ class AnnouncementDetailView(APIView):
         if not announcement:
             return Response({'error': 'Announcement not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        if request.user.role not in ['admin', 'director', 'managing_director'] and not request.user.is_superuser:
+        if not has_capability(request.user, 'manage_announcements'):
             return Response(
                 {'error': 'Only admins can delete announcements'},
                 status=status.HTTP_403_FORBIDDEN
@@ -1049,13 +1185,10 @@ class AnnouncementDetailView(APIView):
 
 
 class EmployeePasswordResetView(APIView):
-    permission_classes =[IsAuthenticated]  
+    permission_classes = [HasCapability]
+    required_capabilities = {'POST': 'reset_passwords'}
+
     def post(self, request, pk):
-        if not request.user.is_superuser and request.user.role not in ['admin', 'director', 'manager']:
-            return Response(
-                {'error': 'You do not have permission to reset passwords'},
-                status=status.HTTP_403_FORBIDDEN
-            )
         try:
             # Get the user (employee) by ID
             user = get_object_or_404(CustomUser, pk=pk)
@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db import models
 from django.utils import timezone
+from cipher.permissions import has_capability
 from .models import Event
 from rest_framework.views import APIView
 from .serializers import (
@@ -21,7 +22,7 @@ class EventCreateView(APIView):
 
     def post(self, request):
         
-        if request.user.role not in ['director', 'managing_director'] and not request.user.is_superuser:
+        if not has_capability(request.user, 'assign_work'):
             return Response(
                 {"error": "Permission denied. Only Superusers and Admins can create events."},
                 status=status.HTTP_403_FORBIDDEN
@@ -48,7 +49,7 @@ class EventListView(APIView):
         queryset = Event.objects.filter(is_deleted=False)
         
         user = request.user
-        if not user.is_superuser and user.role not in ['superuser', 'admin', 'director', 'managing_director']:
+        if not has_capability(user, 'view_all_events'):
             queryset = queryset.filter(assigned_employee=user)
 
         search_query = request.query_params.get('search', None)
@@ -123,7 +124,7 @@ class EventDetailView(APIView):
         try:
             event = Event.objects.get(id=id, is_deleted=False)
             user = self.request.user
-            if not user.is_superuser and user.role not in ['superuser', 'admin', 'director', 'managing_director']:
+            if not has_capability(user, 'view_all_events'):
                 if event.assigned_employee != user:
                     return None
             
@@ -154,7 +155,7 @@ class EventUpdateView(APIView):
             event = Event.objects.get(id=id, is_deleted=False)
             
             user = self.request.user
-            if not user.is_superuser and user.role not in ['director', 'managing_director']:
+            if not has_capability(user, 'assign_work'):
                 if event.assigned_employee != user:
                     return None
             
@@ -208,7 +209,7 @@ class EventDeleteView(APIView):
         try:
             event = Event.objects.get(id=id, is_deleted=False)
             user = self.request.user
-            if not user.is_superuser and user.role not in ['superuser', 'admin']:
+            if not has_capability(user, 'archive_work'):
                 if event.assigned_employee != user:
                     return None
             
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from cipher.cache import invalidate_namespace
+from .models import IncomeCategory, ExpenseCategory
+
+
+@receiver([post_save, post_delete], sender=IncomeCategory)
+def invalidate_income_category_cache(sender, instance, **kwargs):
+    invalidate_namespace('income_categories')
+
+
+@receiver([post_save, post_delete], sender=ExpenseCategory)
+def invalidate_expense_category_cache(sender, instance, **kwargs):
+    invalidate_namespace('expense_categories')
@@ -20,8 +20,10 @@ urlpatterns = [
     
     # Statistics and Reports
     path('stats/', views.FinanceStatsView.as_view(), name='finance-stats'),
+    path('stats/async/', views.FinanceStatsAsyncView.as_view(), name='finance-stats-async'),
     path('recent-transactions/', views.RecentTransactionsView.as_view(), name='recent-transactions'),
     path('upcoming-recurring/', views.UpcomingRecurringTransactionsView.as_view(), name='upcoming-recurring'),
+    path('cash-flow-forecast/', views.CashFlowForecastView.as_view(), name='cash-flow-forecast'),
     path('financial-summaries/', views.FinancialSummaryView.as_view(), name='financial-summaries'),
     path('generate-summary/', views.generate_financial_summary, name='generate-summary'),
     path('export-data/', views.export_financial_data, name='export-data'),
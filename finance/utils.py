@@ -1,8 +1,14 @@
 # finance/utils.py
-from .models import Income, Expense, IncomeCategory, ExpenseCategory
-from django.utils import timezone
+import calendar
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 
+from django.core.cache import cache
+from django.db.models import Sum, Count
+from django.utils import timezone
+
+from .models import Income, Expense, IncomeCategory, ExpenseCategory
+
 def record_system_income(income_type, amount, date=None, category_name="General", client_name=None, client_email=None, client_phone=None, remarks=None, reference_number=None, payment_method='bank_transfer', created_by=None):
     """
     Utility to record system-generated income like client payments.
@@ -73,3 +79,356 @@ def record_system_expense(expense_type, amount, date=None, category_name="Genera
         expense = Expense.objects.create(**defaults)
         
     return expense
+
+
+RECURRING_STEP_MONTHS = {
+    'monthly': 1,
+    'quarterly': 3,
+    'yearly': 12,
+}
+
+PAYMENT_CYCLE_MONTHS = {
+    'monthly': 1,
+    'quarterly': 3,
+    'yearly': 12,
+    'custom': 1,
+}
+
+FORECAST_CACHE_PREFIX = 'finance:cash_flow_forecast'
+
+
+def add_months(value, months, month_end=False):
+    """
+    Shift a date by a number of months, clamping the day to the target month.
+    """
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    _, last_day = calendar.monthrange(year, month)
+    day = last_day if month_end else min(value.day, last_day)
+    return date(year, month, day)
+
+
+def _occurrences(anchor, step_months, window_start, window_end, step_days=None, month_end=False):
+    """
+    Yields every date of a series starting at anchor that falls inside the window.
+    """
+    if step_days:
+        if anchor < window_start:
+            skipped = (window_start - anchor).days // step_days
+            anchor = anchor + timedelta(days=skipped * step_days)
+        current = anchor
+        while current <= window_end:
+            if current >= window_start:
+                yield current
+            current = current + timedelta(days=step_days)
+        return
+
+    index = 0
+    current = anchor
+    while current <= window_end:
+        if current >= window_start:
+            yield current
+        index += 1
+        current = add_months(anchor, index * step_months, month_end=month_end)
+
+
+def _latest_recurring_rows(model, counterparty_field, excluded_type):
+    """
+    Returns one row per recurring series, keeping the most recent entry.
+    Re-entered rows for the same series (same type, category, counterparty
+    and frequency) would otherwise be projected twice.
+    """
+    rows = model.objects.filter(
+        is_recurring=True,
+        recurring_frequency__isnull=False
+    ).exclude(
+        type=excluded_type
+    ).exclude(
+        payment_status__in=['failed', 'refunded']
+    ).order_by('-date', '-created_at').values(
+        'type', 'category_id', counterparty_field, 'recurring_frequency', 'amount', 'date'
+    )
+
+    series = {}
+    for row in rows:
+        key = (row['type'], row['category_id'], row[counterparty_field], row['recurring_frequency'])
+        if key not in series:
+            series[key] = row
+    return list(series.values())
+
+
+def build_cash_flow_forecast(months=6, today=None):
+    """
+    Projects expected cash flow over the next N months from every recurring source:
+    recurring incomes/expenses, client retainers by payment cycle and employee payroll.
+    Each source is loaded with a single values() query and bucketed in one pass.
+    """
+    from clientapp.models import Client, ClientPayment
+    from emplyees.models import CustomUser, SalaryPayment
+
+    today = today or timezone.now().date()
+    window_start = today
+    window_end = add_months(date(today.year, today.month, 1), months - 1, month_end=True)
+
+    buckets = {}
+    bucket_order = []
+    for offset in range(months):
+        month_start = add_months(date(today.year, today.month, 1), offset)
+        key = (month_start.year, month_start.month)
+        bucket_order.append(key)
+        buckets[key] = {
+            'recurring_income': Decimal('0'),
+            'client_retainers': Decimal('0'),
+            'recurring_expense': Decimal('0'),
+            'payroll': Decimal('0'),
+        }
+
+    # Recurring incomes and expenses (system-generated rows are covered below)
+    sources = [
+        ('recurring_income', _latest_recurring_rows(Income, 'client_name', 'client_payment')),
+        ('recurring_expense', _latest_recurring_rows(Expense, 'vendor_name', 'employee_salaries')),
+    ]
+    for bucket_field, rows in sources:
+        for row in rows:
+            frequency = row['recurring_frequency']
+            step_days = 7 if frequency == 'weekly' else None
+            step_months = RECURRING_STEP_MONTHS.get(frequency)
+            if not step_days and not step_months:
+                continue
+            for occurrence in _occurrences(row['date'], step_months, window_start, window_end, step_days=step_days):
+                if occurrence == row['date']:
+                    continue
+                buckets[(occurrence.year, occurrence.month)][bucket_field] += row['amount']
+
+    # Client retainers, skipping months that are already paid
+    paid_client_months = set(
+        ClientPayment.objects.filter(
+            status__in=['paid', 'early_paid'],
+            scheduled_date__gte=date(today.year, today.month, 1),
+            scheduled_date__lte=window_end
+        ).values_list('client_id', 'month', 'year')
+    )
+    clients = Client.objects.filter(
+        is_deleted=False,
+        status='active',
+        monthly_retainer__gt=0
+    ).values('id', 'monthly_retainer', 'payment_cycle', 'next_payment_date', 'contract_end_date')
+
+    current_month_end = date(today.year, today.month, calendar.monthrange(today.year, today.month)[1])
+    for client in clients:
+        cycle_months = PAYMENT_CYCLE_MONTHS.get(client['payment_cycle'], 1)
+        if cycle_months == 1 or not client['next_payment_date']:
+            anchor = current_month_end
+        else:
+            anchor = client['next_payment_date']
+        amount = client['monthly_retainer'] * cycle_months
+        end = window_end
+        if client['contract_end_date'] and client['contract_end_date'] < end:
+            end = client['contract_end_date']
+        for occurrence in _occurrences(anchor, cycle_months, date(today.year, today.month, 1), end, month_end=True):
+            if (client['id'], occurrence.month, occurrence.year) in paid_client_months:
+                continue
+            buckets[(occurrence.year, occurrence.month)]['client_retainers'] += amount
+
+    # Payroll for active employees, skipping months that are already paid
+    paid_salary_months = set(
+        SalaryPayment.objects.filter(
+            status__in=['paid', 'early_paid'],
+            scheduled_date__gte=date(today.year, today.month, 1),
+            scheduled_date__lte=window_end
+        ).values_list('employee_id', 'month', 'year')
+    )
+    employees = CustomUser.objects.filter(
+        is_active=True,
+        is_superuser=False,
+        salary__gt=0
+    ).exclude(
+        current_status__in=['inactive', 'terminated']
+    ).values('id', 'salary')
+
+    for employee in employees:
+        for year, month in bucket_order:
+            if (employee['id'], month, year) in paid_salary_months:
+                continue
+            buckets[(year, month)]['payroll'] += employee['salary']
+
+    series = []
+    cumulative = Decimal('0')
+    totals = {'inflow': Decimal('0'), 'outflow': Decimal('0')}
+    for year, month in bucket_order:
+        bucket = buckets[(year, month)]
+        inflow = bucket['recurring_income'] + bucket['client_retainers']
+        outflow = bucket['recurring_expense'] + bucket['payroll']
+        cumulative += inflow - outflow
+        totals['inflow'] += inflow
+        totals['outflow'] += outflow
+        series.append({
+            'month': month,
+            'year': year,
+            'month_name': calendar.month_name[month],
+            'recurring_income': float(bucket['recurring_income']),
+            'client_retainers': float(bucket['client_retainers']),
+            'recurring_expense': float(bucket['recurring_expense']),
+            'payroll': float(bucket['payroll']),
+            'total_inflow': float(inflow),
+            'total_outflow': float(outflow),
+            'net': float(inflow - outflow),
+            'cumulative_net': float(cumulative),
+        })
+
+    return {
+        'start_date': window_start,
+        'end_date': window_end,
+        'months': months,
+        'series': series,
+        'totals': {
+            'total_inflow': float(totals['inflow']),
+            'total_outflow': float(totals['outflow']),
+            'net': float(totals['inflow'] - totals['outflow']),
+        },
+        'generated_on': today,
+    }
+
+
+def get_cash_flow_forecast(months=6):
+    """
+    Cached wrapper around build_cash_flow_forecast. The forecast only changes
+    day to day, so it is cached per (day, horizon) until midnight.
+    """
+    now = timezone.now()
+    today = now.date()
+    cache_key = f"{FORECAST_CACHE_PREFIX}:{today.isoformat()}:{months}"
+
+    forecast = cache.get(cache_key)
+    if forecast is None:
+        forecast = build_cash_flow_forecast(months=months, today=today)
+        midnight = timezone.make_aware(datetime.combine(today + timedelta(days=1), time.min), now.tzinfo)
+        cache.set(cache_key, forecast, timeout=max(int((midnight - now).total_seconds()), 60))
+    return forecast
+
+
+def parse_date_param(value):
+    """
+    Parses a YYYY-MM-DD query parameter, returning None when missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def finance_stats_queries(start_date=None, end_date=None):
+    """
+    Independent query units behind the finance stats endpoint, keyed by result name.
+    Each unit is a zero-argument callable so callers can run them one after
+    another or concurrently (see FinanceStatsAsyncView).
+    """
+    from clientapp.models import ClientPayment
+    from emplyees.models import SalaryPayment
+
+    income_queryset = Income.objects.all()
+    expense_queryset = Expense.objects.all()
+    cp_queryset = ClientPayment.objects.filter(status__in=['paid', 'early_paid', 'partial'])
+    sp_queryset = SalaryPayment.objects.filter(status__in=['paid', 'early_paid', 'overdue'])
+
+    if start_date:
+        income_queryset = income_queryset.filter(date__gte=start_date)
+        expense_queryset = expense_queryset.filter(date__gte=start_date)
+        cp_queryset = cp_queryset.filter(payment_date__date__gte=start_date)
+        sp_queryset = sp_queryset.filter(payment_date__date__gte=start_date)
+
+    if end_date:
+        income_queryset = income_queryset.filter(date__lte=end_date)
+        expense_queryset = expense_queryset.filter(date__lte=end_date)
+        cp_queryset = cp_queryset.filter(payment_date__date__lte=end_date)
+        sp_queryset = sp_queryset.filter(payment_date__date__lte=end_date)
+
+    # Monthly trends (last 6 months)
+    six_months_ago = timezone.now().date() - timedelta(days=180)
+    month_extract = {'month': "EXTRACT(month FROM date)", 'year': "EXTRACT(year FROM date)"}
+
+    return {
+        'total_income_regular': lambda: income_queryset.aggregate(total=Sum('amount'))['total'] or 0,
+        'total_income_cp': lambda: cp_queryset.aggregate(total=Sum('net_amount'))['total'] or 0,
+        'total_expense_regular': lambda: expense_queryset.aggregate(total=Sum('amount'))['total'] or 0,
+        'total_expense_sp': lambda: sp_queryset.aggregate(total=Sum('net_amount'))['total'] or 0,
+        'income_count': lambda: income_queryset.count(),
+        'expense_count': lambda: expense_queryset.count(),
+        'income_by_type': lambda: list(income_queryset.values('type').annotate(
+            count=Count('id'),
+            total_amount=Sum('amount')
+        )),
+        'expense_by_type': lambda: list(expense_queryset.values('type').annotate(
+            count=Count('id'),
+            total_amount=Sum('amount')
+        )),
+        'income_by_category': lambda: list(income_queryset.values('category__name').annotate(
+            count=Count('id'),
+            total_amount=Sum('amount')
+        )),
+        'expense_by_category': lambda: list(expense_queryset.values('category__name').annotate(
+            count=Count('id'),
+            total_amount=Sum('amount')
+        )),
+        'income_by_payment_status': lambda: list(income_queryset.values('payment_status').annotate(
+            count=Count('id'),
+            total_amount=Sum('amount')
+        )),
+        'expense_by_payment_status': lambda: list(expense_queryset.values('payment_status').annotate(
+            count=Count('id'),
+            total_amount=Sum('amount')
+        )),
+        'monthly_income_trend': lambda: list(income_queryset.filter(
+            date__gte=six_months_ago
+        ).extra(month_extract).values('year', 'month').annotate(
+            total=Sum('amount'),
+            count=Count('id')
+        ).order_by('year', 'month')),
+        'monthly_expense_trend': lambda: list(expense_queryset.filter(
+            date__gte=six_months_ago
+        ).extra(month_extract).values('year', 'month').annotate(
+            total=Sum('amount'),
+            count=Count('id')
+        ).order_by('year', 'month')),
+        'top_income_sources': lambda: list(income_queryset.values('client_name').annotate(
+            total=Sum('amount'),
+            count=Count('id')
+        ).order_by('-total')[:10]),
+        'top_expense_vendors': lambda: list(expense_queryset.values('vendor_name').annotate(
+            total=Sum('amount'),
+            count=Count('id')
+        ).order_by('-total')[:10]),
+        'recurring_income_count': lambda: income_queryset.filter(is_recurring=True).count(),
+        'recurring_expense_count': lambda: expense_queryset.filter(is_recurring=True).count(),
+    }
+
+
+def compile_finance_stats(results):
+    """
+    Builds the finance stats payload from the results of finance_stats_queries.
+    """
+    total_income = results['total_income_regular'] + results['total_income_cp']
+    total_expense = results['total_expense_regular'] + results['total_expense_sp']
+
+    return {
+        'total_income': float(total_income),
+        'total_expense': float(total_expense),
+        'net_balance': float(total_income - total_expense),
+        'income_count': results['income_count'],
+        'expense_count': results['expense_count'],
+        'income_by_type': results['income_by_type'],
+        'expense_by_type': results['expense_by_type'],
+        'income_by_category': results['income_by_category'],
+        'expense_by_category': results['expense_by_category'],
+        'income_by_payment_status': results['income_by_payment_status'],
+        'expense_by_payment_status': results['expense_by_payment_status'],
+        'monthly_income_trend': results['monthly_income_trend'],
+        'monthly_expense_trend': results['monthly_expense_trend'],
+        'top_income_sources': results['top_income_sources'],
+        'top_expense_vendors': results['top_expense_vendors'],
+        'recurring_income_count': results['recurring_income_count'],
+        'recurring_expense_count': results['recurring_expense_count'],
+    }
@@ -18,6 +18,14 @@ from .serializers import (
     ExpenseListSerializer,
     FinancialSummarySerializer
 )
+from .utils import (
+    get_cash_flow_forecast,
+    parse_date_param,
+    finance_stats_queries,
+    compile_finance_stats
+)
+from cipher.cache import cache_response
+from cipher.async_views import AsyncAPIView, gather_queries
 from clientapp.models import ClientPayment
 from emplyees.models import SalaryPayment
 
@@ -533,6 +541,10 @@ class IncomeCategoryListCreateView(generics.ListCreateAPIView):
     filter_backends = [SearchFilter]
     search_fields = ['name', 'description']
 
+    @cache_response('income_categories')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 class IncomeCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     View for retrieving, updating and deleting a specific income category
@@ -552,6 +564,10 @@ class ExpenseCategoryListCreateView(generics.ListCreateAPIView):
     filter_backends = [SearchFilter]
     search_fields = ['name', 'description']
 
+    @cache_response('expense_categories')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 class ExpenseCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     View for retrieving, updating and deleting a specific expense category
@@ -569,173 +585,31 @@ class FinanceStatsView(generics.GenericAPIView):
 
     def get(self, request, *args, **kwargs):
         # Date range filtering
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-        
-        income_queryset = Income.objects.all()
-        expense_queryset = Expense.objects.all()
-        
-        if start_date:
-            try:
-                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-                income_queryset = income_queryset.filter(date__gte=start_date)
-                expense_queryset = expense_queryset.filter(date__gte=start_date)
-            except ValueError:
-                pass
-                
-        if end_date:
-            try:
-                end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-                income_queryset = income_queryset.filter(date__lte=end_date)
-                expense_queryset = expense_queryset.filter(date__lte=end_date)
-            except ValueError:
-                pass
-        
-        # Basic statistics
-        total_income_regular = income_queryset.aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        # Calculate Client Payment totals
-        cp_queryset = ClientPayment.objects.filter(status__in=['paid', 'early_paid', 'partial'])
-        if start_date:
-            try:
-                sd = datetime.strptime(start_date, '%Y-%m-%d').date()
-                cp_queryset = cp_queryset.filter(payment_date__date__gte=sd)
-            except ValueError: pass
-        if end_date:
-            try:
-                ed = datetime.strptime(end_date, '%Y-%m-%d').date()
-                cp_queryset = cp_queryset.filter(payment_date__date__lte=ed)
-            except ValueError: pass
-            
-        total_income_cp = cp_queryset.aggregate(total=Sum('net_amount'))['total'] or 0
-        
-        # Combine
-        total_income = total_income_regular + total_income_cp
-        
-        total_expense_regular = expense_queryset.aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        # Calculate Salary Payment totals
-        sp_queryset = SalaryPayment.objects.filter(status__in=['paid', 'early_paid', 'overdue'])
-        if start_date:
-            try:
-                sd = datetime.strptime(start_date, '%Y-%m-%d').date()
-                sp_queryset = sp_queryset.filter(payment_date__date__gte=sd)
-            except ValueError: pass
-        if end_date:
-            try:
-                ed = datetime.strptime(end_date, '%Y-%m-%d').date()
-                sp_queryset = sp_queryset.filter(payment_date__date__lte=ed)
-            except ValueError: pass
-            
-        total_expense_sp = sp_queryset.aggregate(total=Sum('net_amount'))['total'] or 0
-        
-        # Combine
-        total_expense = total_expense_regular + total_expense_sp
-        
-        net_balance = total_income - total_expense
-        
-        # Count statistics
-        income_count = income_queryset.count()
-        expense_count = expense_queryset.count()
-        
-        # Income statistics by type
-        income_by_type = income_queryset.values('type').annotate(
-            count=Count('id'),
-            total_amount=Sum('amount')
-        )
-        
-        # Expense statistics by type
-        expense_by_type = expense_queryset.values('type').annotate(
-            count=Count('id'),
-            total_amount=Sum('amount')
-        )
-        
-        # Income statistics by category
-        income_by_category = income_queryset.values('category__name').annotate(
-            count=Count('id'),
-            total_amount=Sum('amount')
-        )
-        
-        # Expense statistics by category
-        expense_by_category = expense_queryset.values('category__name').annotate(
-            count=Count('id'),
-            total_amount=Sum('amount')
-        )
-        
-        # Payment status statistics
-        income_by_payment_status = income_queryset.values('payment_status').annotate(
-            count=Count('id'),
-            total_amount=Sum('amount')
-        )
-        
-        expense_by_payment_status = expense_queryset.values('payment_status').annotate(
-            count=Count('id'),
-            total_amount=Sum('amount')
-        )
-        
-        # Monthly trends (last 6 months)
-        six_months_ago = timezone.now().date() - timedelta(days=180)
-        
-        monthly_income = income_queryset.filter(
-            date__gte=six_months_ago
-        ).extra(
-            {'month': "EXTRACT(month FROM date)", 'year': "EXTRACT(year FROM date)"}
-        ).values('year', 'month').annotate(
-            total=Sum('amount'),
-            count=Count('id')
-        ).order_by('year', 'month')
-        
-        monthly_expense = expense_queryset.filter(
-            date__gte=six_months_ago
-        ).extra(
-            {'month': "EXTRACT(month FROM date)", 'year': "EXTRACT(year FROM date)"}
-        ).values('year', 'month').annotate(
-            total=Sum('amount'),
-            count=Count('id')
-        ).order_by('year', 'month')
-        
-        # Top income sources
-        top_income_sources = income_queryset.values('client_name').annotate(
-            total=Sum('amount'),
-            count=Count('id')
-        ).order_by('-total')[:10]
-        
-        # Top expense vendors
-        top_expense_vendors = expense_queryset.values('vendor_name').annotate(
-            total=Sum('amount'),
-            count=Count('id')
-        ).order_by('-total')[:10]
-        
-        # Recurring transactions
-        recurring_income = income_queryset.filter(is_recurring=True).count()
-        recurring_expense = expense_queryset.filter(is_recurring=True).count()
-        
-        stats = {
-            'total_income': float(total_income),
-            'total_expense': float(total_expense),
-            'net_balance': float(net_balance),
-            'income_count': income_count,
-            'expense_count': expense_count,
-            'income_by_type': list(income_by_type),
-            'expense_by_type': list(expense_by_type),
-            'income_by_category': list(income_by_category),
-            'expense_by_category': list(expense_by_category),
-            'income_by_payment_status': list(income_by_payment_status),
-            'expense_by_payment_status': list(expense_by_payment_status),
-            'monthly_income_trend': list(monthly_income),
-            'monthly_expense_trend': list(monthly_expense),
-            'top_income_sources': list(top_income_sources),
-            'top_expense_vendors': list(top_expense_vendors),
-            'recurring_income_count': recurring_income,
-            'recurring_expense_count': recurring_expense,
-        }
-        
+        start_date = parse_date_param(request.query_params.get('start_date'))
+        end_date = parse_date_param(request.query_params.get('end_date'))
+
+        queries = finance_stats_queries(start_date, end_date)
+        results = {name: query() for name, query in queries.items()}
+        stats = compile_finance_stats(results)
+
         return Response(stats, status=status.HTTP_200_OK)
 
+class FinanceStatsAsyncView(AsyncAPIView):
+    """
+    Async variant of FinanceStatsView: the independent aggregate queries
+    run concurrently, each on its own database connection
+    """
+
+    async def get(self, request, *args, **kwargs):
+        start_date = parse_date_param(request.GET.get('start_date'))
+        end_date = parse_date_param(request.GET.get('end_date'))
+
+        queries = finance_stats_queries(start_date, end_date)
+        results = await gather_queries(queries)
+        stats = compile_finance_stats(results)
+
+        return self.render(stats)
+
 class RecentTransactionsView(generics.ListAPIView):
     """
     View for listing recent income and expense transactions
@@ -772,13 +646,13 @@ class UpcomingRecurringTransactionsView(generics.ListAPIView):
             is_recurring=True,
             date__month=current_month,
             date__year=current_year
-        )
+        ).select_related('category', 'created_by')
         
         recurring_expense = Expense.objects.filter(
             is_recurring=True,
             date__month=current_month,
             date__year=current_year
-        )
+        ).select_related('category', 'created_by')
         
         income_serializer = IncomeListSerializer(recurring_income, many=True)
         expense_serializer = ExpenseListSerializer(recurring_expense, many=True)
@@ -788,6 +662,28 @@ class UpcomingRecurringTransactionsView(generics.ListAPIView):
             'recurring_expense': expense_serializer.data
         }, status=status.HTTP_200_OK)
 
+class CashFlowForecastView(generics.GenericAPIView):
+    """
+    View for the projected cash flow time series over the next N months
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            months = int(request.query_params.get('months', 6))
+        except ValueError:
+            return Response({
+                'error': 'months must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if months < 1 or months > 24:
+            return Response({
+                'error': 'months must be between 1 and 24'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        forecast = get_cash_flow_forecast(months=months)
+        return Response(forecast, status=status.HTTP_200_OK)
+
 class FinancialSummaryView(generics.ListAPIView):
     """
     View for listing financial summaries
@@ -0,0 +1,176 @@
+"""
+Gunicorn configuration.
+
+Every setting can be overridden from the environment (.env / compose), e.g.
+GUNICORN_WORKERS=4 GUNICORN_THREADS=2. Workers and threads default to values
+derived from the CPUs available to the container.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def available_cpus():
+    """
+    CPUs this container may actually use: the cgroup v2 quota if one is set,
+    otherwise the scheduler affinity mask, otherwise the host count.
+    """
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != 'max':
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+CPUS = available_cpus()
+
+# Server socket
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+backlog = _env_int('GUNICORN_BACKLOG', 2048)
+
+# Workers: (2 x CPU) + 1 processes, each with a few threads so requests
+# waiting on Postgres don't hold up a whole process.
+# WEB_CONCURRENCY is the conventional override used by most platforms.
+workers = _env_int('GUNICORN_WORKERS', _env_int('WEB_CONCURRENCY', CPUS * 2 + 1))
+threads = _env_int('GUNICORN_THREADS', 2 if CPUS > 1 else 4)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync')
+worker_connections = _env_int('GUNICORN_WORKER_CONNECTIONS', 1000)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 60)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# Load the app once in the master so workers share its memory copy-on-write
+preload_app = _env_bool('GUNICORN_PRELOAD', True)
+
+# Recycle workers to cap memory growth; jitter stops them all restarting together
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', max(max_requests // 10, 1))
+
+# Logging
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+# Worker stats: logged every STATS_INTERVAL requests and when a worker exits.
+# They come from the pre_request/post_request hooks, which only the WSGI
+# workers (sync, gthread) call. Uvicorn workers (web_asgi in
+# docker-compose.yml, -k uvicorn.workers.UvicornWorker) serve requests
+# without them, so there are no worker stats under ASGI; per-request timings
+# are still in the 'cipher.requests' logs (cipher/middleware.py).
+STATS_INTERVAL = _env_int('GUNICORN_STATS_INTERVAL', 500)
+STATS_SAMPLE_SIZE = 1000
+
+
+class WorkerStats:
+    """
+    Request count and latency for a single worker process.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.latencies = deque(maxlen=STATS_SAMPLE_SIZE)
+
+    def record(self, elapsed_ms, status_code):
+        with self.lock:
+            self.requests += 1
+            self.total_ms += elapsed_ms
+            self.latencies.append(elapsed_ms)
+            if status_code >= 500:
+                self.errors += 1
+            return self.requests
+
+    def snapshot(self):
+        with self.lock:
+            ordered = sorted(self.latencies)
+            requests = self.requests
+            errors = self.errors
+            total_ms = self.total_ms
+
+        def percentile(pct):
+            if not ordered:
+                return 0.0
+            return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+        return {
+            'requests': requests,
+            'errors': errors,
+            'uptime_s': round(time.time() - self.started, 1),
+            'mean_ms': round(total_ms / requests, 2) if requests else 0.0,
+            'p50_ms': round(percentile(50), 2),
+            'p95_ms': round(percentile(95), 2),
+            'p99_ms': round(percentile(99), 2),
+        }
+
+
+def _log_stats(worker, reason):
+    stats = getattr(worker, 'request_stats', None)
+    if stats is None:
+        return
+    snapshot = stats.snapshot()
+    worker.log.info(
+        "worker stats (%s) pid=%s requests=%s errors=%s uptime=%ss mean=%sms p50=%sms p95=%sms p99=%sms",
+        reason, worker.pid, snapshot['requests'], snapshot['errors'], snapshot['uptime_s'],
+        snapshot['mean_ms'], snapshot['p50_ms'], snapshot['p95_ms'], snapshot['p99_ms'],
+    )
+
+
+# Server hooks
+
+def when_ready(server):
+    server.log.info(
+        "gunicorn ready: cpus=%s workers=%s threads=%s worker_class=%s preload=%s max_requests=%s+%s",
+        CPUS, workers, threads, worker_class, preload_app, max_requests, max_requests_jitter,
+    )
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading in the master must not be shared with forked workers
+    if preload_app:
+        from django.db import connections
+        connections.close_all()
+    if not type(worker).__module__.startswith('uvicorn'):
+        worker.request_stats = WorkerStats()
+
+
+def pre_request(worker, req):
+    req.start_time = time.perf_counter()
+
+
+def post_request(worker, req, environ, resp):
+    start_time = getattr(req, 'start_time', None)
+    stats = getattr(worker, 'request_stats', None)
+    if start_time is None or stats is None:
+        return
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    count = stats.record(elapsed_ms, getattr(resp, 'status_code', 0) or 0)
+    if STATS_INTERVAL and count % STATS_INTERVAL == 0:
+        _log_stats(worker, 'interval')
+
+
+def worker_exit(server, worker):
+    _log_stats(worker, 'exit')
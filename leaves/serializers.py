@@ -58,6 +58,9 @@ class LeaveApplicationSerializer(serializers.ModelSerializer):
         }
 
     def get_monthly_leave_count(self, obj):
+        # Lists annotate it with one subquery (see with_monthly_leave_count)
+        if hasattr(obj, 'monthly_leave_count'):
+            return obj.monthly_leave_count
         try:
             # Handle string dates in LeaveManagement
             if isinstance(obj.start_date, str):
@@ -2,39 +2,49 @@ from rest_framework import status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Substr
 from django.utils import timezone
+from cipher.permissions import HasCapability, has_capability
 from emplyees.models import LeaveManagement
 from .serializers import LeaveApplicationSerializer, LeaveProcessSerializer
 from datetime import datetime
 
+
+def with_monthly_leave_count(queryset):
+    """
+    Annotates each leave with the employee's approved leaves starting in the
+    same month (start_date is an ISO string, so the month is its first 7
+    characters), as one correlated subquery instead of a count per row.
+    """
+    same_month = LeaveManagement.objects.filter(
+        employee=OuterRef('employee'),
+        status='approved',
+        start_date__startswith=Substr(OuterRef('start_date'), 1, 7)
+    ).order_by().values('employee').annotate(total=Count('id')).values('total')
+    return queryset.annotate(monthly_leave_count=Coalesce(Subquery(same_month), 0))
+
+
 class LeaveListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
         # Admin roles see all, others see own (though this page is for Admin)
         user = request.user
-        role_lower = (user.role or '').lower()
-        user_type_lower = (user.user_type or '').lower()
-        
-        is_admin = (
-            role_lower in ['admin', 'superuser'] or 
-            user_type_lower in ['hr', 'manager', 'director', 'admin'] or 
-            user.is_superuser
-        )
-
-        if is_admin:
+        if has_capability(user, 'review_leave_applications'):
             leaves = LeaveManagement.objects.all()
         else:
             leaves = LeaveManagement.objects.filter(employee=user)
+        leaves = with_monthly_leave_count(leaves.select_related('employee', 'approved_by'))
 
         # Filtering
         status_filter = request.query_params.get('status')
         if status_filter:
-            today_str = datetime.now().strftime('%Y-%m-%d')
+            today = datetime.now().date()
             if status_filter == 'active':
-                leaves = leaves.filter(status='approved', start_date__lte=today_str, end_date__gte=today_str)
+                leaves = leaves.filter(status='approved', start_day__lte=today, end_day__gte=today)
             elif status_filter == 'upcoming':
-                leaves = leaves.filter(status='approved', start_date__gt=today_str)
+                leaves = leaves.filter(status='approved', start_day__gt=today)
             else:
                 leaves = leaves.filter(status=status_filter)
 
@@ -62,31 +72,11 @@ from django.utils.decorators import method_decorator
 
 @method_decorator(csrf_exempt, name='dispatch')
 class LeaveProcessView(APIView):
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [HasCapability]
+    required_capabilities = {'POST': 'review_leave_applications'}
     parser_classes = [JSONParser, MultiPartParser, FormParser]
 
     def post(self, request, pk):
-        user = request.user
-        role_lower = (user.role or '').lower()
-        user_type_lower = (user.user_type or '').lower()
-        
-        is_admin = (
-            role_lower in ['admin', 'superuser'] or 
-            user_type_lower in ['hr', 'manager', 'director', 'admin'] or 
-            user.is_superuser
-        )
-
-        if not is_admin:
-            return Response({
-                "error": "Only admins can process leaves",
-                "debug": {
-                    "role": role_lower,
-                    "user_type": user_type_lower,
-                    "is_superuser": user.is_superuser,
-                    "username": user.username
-                }
-            }, status=status.HTTP_403_FORBIDDEN)
-
         try:
             leave = LeaveManagement.objects.get(pk=pk)
         except LeaveManagement.DoesNotExist:
@@ -0,0 +1,303 @@
+"""
+Role-based load test scenarios (Locust).
+
+Replays the traffic of the people using the app against a server filled with
+`manage.py seed_scale`:
+
+- employees (most users) check their tasks, leaves, balance, events,
+  announcements and salary history, and now and then apply for leave
+- HR browses employees, reviews leave requests and runs payroll
+- finance staff load the finance dashboard, ledgers and client payments
+- directors pull the monthly reports and verification status
+
+Requests are named by route (ids replaced with [id]) so the per-endpoint
+numbers aggregate. When the run stops, throughput and tail latency per
+endpoint are printed and written to LOADTEST_REPORT (JSON) for capacity
+planning; Locust's own --csv/--html reports work as usual.
+
+Fully local stack (Postgres, Redis, the app seeded with the chosen preset
+and Locust), see the `loadtest` profile in docker-compose.yml:
+
+    LOADTEST_PRESET=medium docker compose --profile loadtest up locust
+    # then open http://localhost:8089, or run headless:
+    docker compose --profile loadtest run --rm locust --headless -u 200 -r 20 -t 10m \
+        --csv /mnt/locust/reports/run --html /mnt/locust/reports/run.html
+
+Reports land in loadtest/reports/.
+
+Against any other seeded server:
+
+    pip install -r loadtest/requirements.txt
+    locust -f loadtest/locustfile.py --host http://localhost:8000 --headless -u 100 -r 10 -t 5m
+
+Accounts are the seed_scale users, whose usernames follow the order of
+cipher.seeding.STAFF_ROLES: seed00000-01 admin, 00002 director, 00003
+managing director, 00004-06 managers, 00007-08 HR, then employees.
+"""
+import json
+import os
+import random
+from datetime import date, timedelta
+
+from locust import HttpUser, between, events, task
+from locust.exception import StopUser
+
+
+PASSWORD = os.environ.get('LOADTEST_PASSWORD', 'seed-password')
+# Host header to send; the app only answers to its ALLOWED_HOSTS
+HOST_HEADER = os.environ.get('LOADTEST_HOST_HEADER', 'localhost')
+EMPLOYEE_ACCOUNTS = int(os.environ.get('LOADTEST_EMPLOYEE_ACCOUNTS', 90))
+WRITES = os.environ.get('LOADTEST_WRITES', '1') == '1'
+REPORT_PATH = os.environ.get('LOADTEST_REPORT', 'loadtest-report.json')
+
+ACCOUNTS = {
+    'finance': ['seed00000', 'seed00001'],
+    'director': ['seed00002', 'seed00003'],
+    'hr': ['seed00007', 'seed00008'],
+    'employee': [f"seed{index:05d}" for index in range(9, 9 + EMPLOYEE_ACCOUNTS)],
+}
+
+
+def last_month():
+    previous = date.today().replace(day=1) - timedelta(days=1)
+    return {'month': previous.month, 'year': previous.year}
+
+
+class RoleUser(HttpUser):
+    abstract = True
+    role = None
+    wait_time = between(1, 5)
+
+    def on_start(self):
+        self.client.headers['Host'] = HOST_HEADER
+        username = random.choice(ACCOUNTS[self.role])
+        with self.client.post(
+            '/auth/login/',
+            json={'username': username, 'password': PASSWORD},
+            name='/auth/login/',
+            catch_response=True,
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"login as {username} failed: {response.status_code}")
+                raise StopUser()
+            payload = response.json()
+        self.user_id = payload['user_info']['id']
+        self.client.headers['Authorization'] = f"Bearer {payload['access']}"
+
+    def get_json(self, path, name=None, **kwargs):
+        response = self.client.get(path, name=name or path, **kwargs)
+        if response.ok:
+            try:
+                return response.json()
+            except ValueError:
+                return None
+        return None
+
+
+class EmployeeUser(RoleUser):
+    role = 'employee'
+    weight = 70
+
+    @task(5)
+    def my_tasks(self):
+        self.get_json('/tasks/tasks/')
+
+    @task(3)
+    def announcements(self):
+        self.get_json('/auth/announcements/')
+
+    @task(3)
+    def my_leaves(self):
+        self.get_json('/auth/leaves/')
+
+    @task(2)
+    def leave_balance(self):
+        self.get_json('/auth/leaves/balance/')
+
+    @task(2)
+    def my_events(self):
+        self.get_json('/event/events/')
+
+    @task(1)
+    def salary_history(self):
+        self.get_json('/auth/salary-payment-history/')
+
+    @task(1)
+    def apply_for_leave(self):
+        if not WRITES:
+            return
+        start = date.today() + timedelta(days=random.randrange(7, 90))
+        days = random.choice([1, 1, 1, 2, 3])
+        self.client.post('/auth/leaves/create/', name='/auth/leaves/create/', json={
+            'category': random.choice(['Casual Leave', 'Sick Leave', 'Annual Leave']),
+            'start_date': start.isoformat(),
+            'end_date': (start + timedelta(days=days - 1)).isoformat(),
+            'total_days': days,
+            'reason': 'Load test',
+        })
+
+
+class HRUser(RoleUser):
+    role = 'hr'
+    weight = 10
+
+    def on_start(self):
+        super().on_start()
+        data = self.get_json('/auth/employees/') or {}
+        self.employee_ids = [employee['id'] for employee in data.get('employees', [])] or [self.user_id]
+
+    @task(4)
+    def employee_list(self):
+        self.get_json('/auth/employees/')
+
+    @task(3)
+    def employee_detail(self):
+        self.get_json(f"/auth/employees/{random.choice(self.employee_ids)}/", name='/auth/employees/[id]/')
+
+    @task(3)
+    def leave_requests(self):
+        self.get_json('/leaves-api/leaves/')
+
+    @task(1)
+    def leave_balance_sheet(self):
+        self.get_json('/auth/leaves/balances/')
+
+    @task(2)
+    def salary_history(self):
+        self.get_json(
+            f"/auth/salary-payment-history/?employee_id={random.choice(self.employee_ids)}",
+            name='/auth/salary-payment-history/?employee_id=[id]',
+        )
+
+    @task(1)
+    def run_payroll(self):
+        if not WRITES:
+            return
+        employee_id = random.choice(self.employee_ids)
+        with self.client.post(
+            f"/auth/process-salary-payment/{employee_id}/",
+            json=last_month(),
+            name='/auth/process-salary-payment/[id]/',
+            catch_response=True,
+        ) as response:
+            # Already paid / joined later are normal answers while payroll is being run
+            if response.status_code == 400:
+                response.success()
+
+
+class FinanceUser(RoleUser):
+    role = 'finance'
+    weight = 10
+
+    def on_start(self):
+        super().on_start()
+        clients = self.get_json('/client/clients/') or []
+        self.client_ids = [client['id'] for client in clients] or [1]
+
+    @task(4)
+    def dashboard(self):
+        self.get_json('/api/finance/stats/')
+        self.get_json('/api/finance/recent-transactions/')
+        self.get_json('/api/finance/upcoming-recurring/')
+
+    @task(3)
+    def incomes(self):
+        self.get_json('/api/finance/incomes/')
+
+    @task(3)
+    def expenses(self):
+        self.get_json('/api/finance/expenses/')
+
+    @task(2)
+    def cash_flow(self):
+        self.get_json('/api/finance/cash-flow-forecast/')
+
+    @task(2)
+    def client_list(self):
+        self.get_json('/client/clients/')
+
+    @task(2)
+    def client_payments(self):
+        self.get_json(
+            f"/client/clients/{random.choice(self.client_ids)}/payment-history/",
+            name='/client/clients/[id]/payment-history/',
+        )
+
+
+class DirectorUser(RoleUser):
+    role = 'director'
+    weight = 10
+
+    @task(3)
+    def monthly_client_report(self):
+        self.get_json('/api/reports/monthly/clients/', params=last_month())
+
+    @task(3)
+    def monthly_employee_report(self):
+        self.get_json('/api/reports/monthly/employees/', params=last_month())
+
+    @task(2)
+    def monthly_income_report(self):
+        self.get_json('/api/reports/monthly/income/', params=last_month())
+
+    @task(2)
+    def monthly_expense_report(self):
+        self.get_json('/api/reports/monthly/expense/', params=last_month())
+
+    @task(2)
+    def verification_status(self):
+        self.get_json('/api/clientverification-list/')
+
+    @task(1)
+    def finance_stats(self):
+        self.get_json('/api/finance/stats/')
+
+
+@events.quitting.add_listener
+def write_report(environment, **kwargs):
+    """
+    Prints and saves throughput, failures and p50/p95/p99 per endpoint,
+    busiest first.
+    """
+    stats = environment.stats
+    if not stats.total.num_requests:
+        return
+    rows = []
+    for entry in stats.entries.values():
+        rows.append({
+            'method': entry.method,
+            'name': entry.name,
+            'requests': entry.num_requests,
+            'failures': entry.num_failures,
+            'rps': round(entry.total_rps, 2),
+            'share_pct': round(entry.num_requests / stats.total.num_requests * 100, 1),
+            'p50_ms': entry.get_response_time_percentile(0.5),
+            'p95_ms': entry.get_response_time_percentile(0.95),
+            'p99_ms': entry.get_response_time_percentile(0.99),
+            'max_ms': round(entry.max_response_time or 0, 1),
+        })
+    rows.sort(key=lambda row: row['requests'], reverse=True)
+
+    print(f"\n{'endpoint':<52}{'reqs':>8}{'fail':>6}{'rps':>8}{'p50':>8}{'p95':>8}{'p99':>8}")
+    for row in rows:
+        print(f"{row['method'] + ' ' + row['name']:<52.52}{row['requests']:>8}{row['failures']:>6}"
+              f"{row['rps']:>8}{row['p50_ms']:>8}{row['p95_ms']:>8}{row['p99_ms']:>8}")
+    total = stats.total
+    print(f"{'total':<52}{total.num_requests:>8}{total.num_failures:>6}{round(total.total_rps, 2):>8}"
+          f"{total.get_response_time_percentile(0.5):>8}{total.get_response_time_percentile(0.95):>8}"
+          f"{total.get_response_time_percentile(0.99):>8}")
+
+    os.makedirs(os.path.dirname(REPORT_PATH) or '.', exist_ok=True)
+    with open(REPORT_PATH, 'w') as handle:
+        json.dump({
+            'users': environment.runner.user_count if environment.runner else None,
+            'writes': WRITES,
+            'total': {
+                'requests': total.num_requests,
+                'failures': total.num_failures,
+                'rps': round(total.total_rps, 2),
+                'p95_ms': total.get_response_time_percentile(0.95),
+                'p99_ms': total.get_response_time_percentile(0.99),
+            },
+            'endpoints': rows,
+        }, handle, indent=2)
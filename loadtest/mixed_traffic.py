@@ -0,0 +1,136 @@
+"""
+Mixed-traffic tail latency comparison for the WSGI and ASGI deployments.
+
+Fires a weighted mix of light endpoints and slow report/stats endpoints at a
+running server from a pool of concurrent clients, then prints p50/p95/p99 per
+endpoint. Run it once against the sync (gunicorn/WSGI) service and once
+against the uvicorn worker service to compare how slow endpoints affect the
+tail latency of the light ones:
+
+    docker compose up web                      # WSGI on :8000
+    docker compose --profile asgi up web_asgi  # ASGI on :8001
+
+    python loadtest/mixed_traffic.py --base-url http://localhost:8000 \\
+        --username admin --password secret --concurrency 20 --duration 60
+    python loadtest/mixed_traffic.py --base-url http://localhost:8001 \\
+        --username admin --password secret --concurrency 20 --duration 60 --async-variants
+
+Only the standard library is used so it runs from any machine.
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+
+# (label, path, async path, weight); the async path serves the same payload as the sync one
+TRAFFIC_MIX = [
+    ('announcements', '/auth/announcements/', None, 30),
+    ('tasks', '/tasks/tasks/', None, 25),
+    ('leave_balance', '/auth/leaves/balance/', None, 15),
+    ('income_categories', '/api/finance/income-categories/', None, 10),
+    ('finance_stats', '/api/finance/stats/', '/api/finance/stats/async/', 10),
+    ('monthly_full', '/api/reports/monthly/full/', '/api/reports/monthly/full/async/', 10),
+]
+
+
+def login(base_url, username, password):
+    body = json.dumps({'username': username, 'password': password}).encode('utf-8')
+    request = urllib.request.Request(
+        f"{base_url}/auth/login/",
+        data=body,
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())['access']
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def worker(base_url, token, mix, deadline, results, errors, lock):
+    labels = [item[0] for item in mix]
+    paths = {item[0]: item[1] for item in mix}
+    weights = [item[2] for item in mix]
+    while time.monotonic() < deadline:
+        label = random.choices(labels, weights=weights)[0]
+        request = urllib.request.Request(
+            f"{base_url}{paths[label]}",
+            headers={'Authorization': f"Bearer {token}"}
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                response.read()
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                results[label].append(elapsed)
+        except (urllib.error.URLError, TimeoutError):
+            with lock:
+                errors[label] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--duration', type=int, default=60, help='Seconds to run')
+    parser.add_argument('--async-variants', action='store_true',
+                        help='Hit the async stats/report endpoints instead of the sync ones')
+    parser.add_argument('--json', dest='json_path', help='Also write the summary to this file')
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip('/')
+    token = login(base_url, args.username, args.password)
+    mix = [
+        (label, (async_path if args.async_variants and async_path else path), weight)
+        for label, path, async_path, weight in TRAFFIC_MIX
+    ]
+
+    results = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(base_url, token, mix, deadline, results, errors, lock))
+        for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    summary = {}
+    print(f"{'endpoint':<20}{'requests':>10}{'errors':>8}{'rps':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for label, _, _ in mix:
+        ordered = sorted(results[label])
+        row = {
+            'requests': len(ordered),
+            'errors': errors[label],
+            'rps': round(len(ordered) / args.duration, 2),
+            'p50_ms': round(statistics.median(ordered), 2) if ordered else 0,
+            'p95_ms': round(percentile(ordered, 0.95), 2),
+            'p99_ms': round(percentile(ordered, 0.99), 2),
+        }
+        summary[label] = row
+        print(f"{label:<20}{row['requests']:>10}{row['errors']:>8}{row['rps']:>8}"
+              f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as handle:
+            json.dump({'base_url': base_url, 'async_variants': args.async_variants, 'endpoints': summary}, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,4 +6,6 @@ urlpatterns = [
     path('monthly/employees/', views.MonthlyEmployeeReportView.as_view(), name='monthly-employee-report'),
     path('monthly/income/', views.MonthlyIncomeReportView.as_view(), name='monthly-income-report'),
     path('monthly/expense/', views.MonthlyExpenseReportView.as_view(), name='monthly-expense-report'),
+    path('monthly/full/', views.MonthlyFullReportView.as_view(), name='monthly-full-report'),
+    path('monthly/full/async/', views.MonthlyFullReportAsyncView.as_view(), name='monthly-full-report-async'),
 ]
@@ -66,7 +66,7 @@ def get_monthly_client_data(month, year):
     Fetches and aggregates all client revenue data for a given month and year.
     Iterates over ALL active clients, attaching payment info if available.
     """
-    from verification.models import ClientVerification
+    from verification.models import ContentDelivery
     from clientapp.models import Client, ClientPayment
     
     # Get all active clients
@@ -90,27 +90,23 @@ def get_monthly_client_data(month, year):
     # Create valid payment map: client_id -> payment_obj
     payment_map = {p.client.id: p for p in payments}
 
+    # Delivered content per client, kept current by verification/delivery.py
+    delivery_map = {
+        row['client_id']: row
+        for row in ContentDelivery.objects.filter(
+            month=month, year=year, client__in=clients
+        ).values('client_id', 'posters_completed', 'videos_completed')
+    }
+
     for client in clients:
         try:
             # Auto-calculate expected revenue
             total_expected_revenue += client.monthly_retainer or 0
 
-            # Get verified content counts for this month from MonthlyVerification
-            from verification.models import MonthlyVerification
-            
-            # Since each client has a single ClientVerification record
-            cv = ClientVerification.objects.filter(client=client).first()
-            monthly_stat = None
-            if cv:
-                monthly_stat = MonthlyVerification.objects.filter(
-                    clientverification=cv,
-                    month=month,
-                    year=year
-                ).first()
-            
+            delivery = delivery_map.get(client.id, {})
             counts_dict = {
-                'video': monthly_stat.videos_completed if monthly_stat else 0,
-                'poster': monthly_stat.posters_completed if monthly_stat else 0,
+                'video': delivery.get('videos_completed', 0),
+                'poster': delivery.get('posters_completed', 0),
                 'reels': 0, # Future: Add these to MonthlyVerification if needed
                 'stories': 0,
             }
@@ -386,13 +382,13 @@ def get_monthly_general_data(month, year):
     incomes = Income.objects.filter(
         date__month=month,
         date__year=year
-    ).exclude(type='client_payment')
+    ).exclude(type='client_payment').select_related('category')
 
     # Exclude employee_salaries type as it's covered by get_monthly_employee_data
     expenses = Expense.objects.filter(
         date__month=month,
         date__year=year
-    ).exclude(type='employee_salaries')
+    ).exclude(type='employee_salaries').select_related('category')
 
     income_list = []
     total_general_income = 0
@@ -436,6 +432,29 @@ def compile_full_monthly_report(month, year):
     employee_report = get_monthly_employee_data(month, year)
     general_report = get_monthly_general_data(month, year)
 
+    return assemble_full_monthly_report(month, year, client_report, employee_report, general_report)
+
+async def acompile_full_monthly_report(month, year):
+    """
+    Async variant of compile_full_monthly_report. The three sections are
+    independent, so they are built concurrently on separate connections.
+    """
+    from cipher.async_views import gather_queries
+
+    sections = await gather_queries({
+        'client': lambda: get_monthly_client_data(month, year),
+        'employee': lambda: get_monthly_employee_data(month, year),
+        'general': lambda: get_monthly_general_data(month, year),
+    })
+
+    return assemble_full_monthly_report(
+        month, year, sections['client'], sections['employee'], sections['general']
+    )
+
+def assemble_full_monthly_report(month, year, client_report, employee_report, general_report):
+    """
+    Builds the combined report payload from the individual section reports.
+    """
     total_income = client_report['summary']['total_revenue'] + general_report['summary']['total_general_income']
     total_expense = employee_report['summary']['total_net_paid'] + general_report['summary']['total_general_expense']
     net_profit = total_income - total_expense
@@ -2,10 +2,13 @@ from rest_framework.views import APIView
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from django.utils import timezone
+from cipher.async_views import AsyncAPIView
 from .utils import (
     get_monthly_client_data, 
     get_monthly_employee_data,
-    get_detailed_finance_data
+    get_detailed_finance_data,
+    compile_full_monthly_report,
+    acompile_full_monthly_report
 )
 from .models import MonthlyEmployeeReport,MonthlyClientReport, MonthlyIncomeReport,MonthlyExpenseReport
 from .serializers import (
@@ -158,3 +161,33 @@ class MonthlyExpenseReportView(BaseReportView):
             'year': data['year'],
             'expense': data['expense']
         })
+
+class MonthlyFullReportView(BaseReportView):
+    """
+    API view for the combined monthly report, sections compiled one after
+    another. Sync counterpart of MonthlyFullReportAsyncView.
+    """
+    def get(self, request, *args, **kwargs):
+        month, year = self.get_month_year(request)
+        if not month or not 1 <= month <= 12:
+            return Response({'error': 'Invalid month or year'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(compile_full_monthly_report(month, year))
+
+class MonthlyFullReportAsyncView(AsyncAPIView):
+    """
+    Async API view for the combined monthly report (clients, payroll, leaves
+    and general transactions). Sections are compiled concurrently.
+    """
+    async def get(self, request, *args, **kwargs):
+        now = timezone.now()
+        try:
+            month = int(request.GET.get('month') or now.month)
+            year = int(request.GET.get('year') or now.year)
+        except ValueError:
+            return self.render({'error': 'Invalid month or year'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= month <= 12:
+            return self.render({'error': 'Invalid month or year'}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = await acompile_full_monthly_report(month, year)
+        return self.render(data)
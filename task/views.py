@@ -4,6 +4,7 @@ from rest_framework.views import APIView
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db import models
 from django.utils import timezone
+from cipher.permissions import has_capability
 from .models import Task
 from .serializers import (
     TaskCreateSerializer, 
@@ -20,7 +21,7 @@ class TaskCreateView(APIView):
 
     def post(self, request):
        
-        if request.user.role not in ['director', 'managing_director'] and not request.user.is_superuser:
+        if not has_capability(request.user, 'assign_work'):
             return Response(
                 {"error": "Permission denied. Only Superusers and Admins can create tasks."},
                 status=status.HTTP_403_FORBIDDEN
@@ -51,7 +52,7 @@ class TaskListView(APIView):
         queryset = Task.objects.filter(is_deleted=False)
         
         user = request.user
-        if not user.is_superuser and user.role not in ['superuser', 'admin']:
+        if not has_capability(user, 'view_all_tasks'):
             queryset = queryset.filter(assignee=user)
 
         search_query = request.query_params.get('search', None)
@@ -104,7 +105,7 @@ class TaskDetailView(APIView):
         try:
             task = Task.objects.get(id=id, is_deleted=False)
             user = self.request.user
-            if not user.is_superuser and user.role not in ['director', 'managing_director']:
+            if not has_capability(user, 'assign_work'):
                 if task.assignee != user:
                     return None
             
@@ -135,7 +136,7 @@ class TaskUpdateView(APIView):
         try:
             task = Task.objects.get(id=id, is_deleted=False)
             user = self.request.user
-            if not user.is_superuser and user.role not in ['director', 'managing_director']:
+            if not has_capability(user, 'assign_work'):
                 if task.assignee != user:
                     return None
             
@@ -194,7 +195,7 @@ class TaskDeleteView(APIView):
         try:
             task = Task.objects.get(id=task_id)
             user = self.request.user
-            if not user.is_superuser and user.role not in ['superuser', 'admin']:
+            if not has_capability(user, 'archive_work'):
                 if task.assignee != user:
                     raise Task.DoesNotExist
             
@@ -254,7 +255,7 @@ class TaskStatusUpdateView(APIView):
 
         # Permission check
         user = request.user
-        if not user.is_superuser and user.role not in ['admin', 'director', 'managing_director']:
+        if not has_capability(user, 'update_task_status'):
             if task.assignee != user:
                 return Response(
                     {"error": "Permission denied"},
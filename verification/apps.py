@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VerificationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'verification'
+
+    def ready(self):
+        from . import signals
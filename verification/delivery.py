@@ -0,0 +1,184 @@
+"""
+Content delivery counters.
+
+ContentDelivery holds one row per client and month with the client's
+targets and the progress recorded in MonthlyVerification (completed/posted
+posters and videos, month closed) and CameraDepartment (shoots). Rows are
+recomputed for the affected client-months only, from signals
+(verification/signals.py) and from the bulk board endpoints, so reading
+the dashboard never aggregates the source tables.
+"""
+import calendar
+
+from django.db.models import Count, Exists, OuterRef, Q, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils.dateparse import parse_date
+
+
+# ContentDelivery target field -> Client field it is copied from
+TARGET_FIELDS = {
+    'posters_target': 'posters_per_month',
+    'videos_target': 'videos_per_month',
+    'reels_target': 'reels_per_month',
+    'stories_target': 'stories_per_month',
+}
+# MonthlyVerification counts, summed per client; it stores whatever the board
+# sent, so negative entries count as 0 (the counters can't go below it)
+VERIFIED_FIELDS = ['posters_completed', 'videos_completed', 'posters_posted', 'videos_posted']
+COUNTER_FIELDS = [
+    'posters_completed', 'videos_completed', 'posters_posted', 'videos_posted',
+    'camera_projects', 'is_closed',
+]
+
+
+def active_clients():
+    from clientapp.models import Client
+    return Client.objects.filter(status='active', is_deleted=False)
+
+
+def camera_delivery_key(client_id, uploaded_date):
+    """
+    (client id, month, year) a camera project counts towards, or None.
+    """
+    if isinstance(uploaded_date, str):
+        uploaded_date = parse_date(uploaded_date[:10])
+    if not client_id or not uploaded_date:
+        return None
+    return client_id, uploaded_date.month, uploaded_date.year
+
+
+def refresh_content_delivery(client_ids, month, year):
+    """
+    Recomputes the ContentDelivery rows of `client_ids` for one month with
+    three grouped queries and one upsert. New rows take the client's current
+    targets; existing rows keep theirs (see update_delivery_targets).
+    """
+    from clientapp.models import Client
+    from emplyees.models import CameraDepartment
+    from .models import ContentDelivery, MonthlyVerification
+
+    client_ids = {client_id for client_id in client_ids if client_id}
+    if not client_ids:
+        return 0
+
+    verified = {
+        row['clientverification__client_id']: row
+        for row in MonthlyVerification.objects.filter(
+            clientverification__client_id__in=client_ids,
+            month=month,
+            year=year
+        ).order_by().values('clientverification__client_id').annotate(
+            closed=Count('id', filter=Q(is_verified=True)),
+            **{field: Sum(Greatest(field, Value(0))) for field in VERIFIED_FIELDS}
+        )
+    }
+    camera = dict(
+        CameraDepartment.objects.filter(
+            client_id__in=client_ids,
+            uploaded_date__year=year,
+            uploaded_date__month=month
+        ).order_by().values('client_id').annotate(total=Count('id')).values_list('client_id', 'total')
+    )
+
+    rows = []
+    for client in Client.objects.filter(id__in=client_ids).values('id', *TARGET_FIELDS.values()):
+        stats = verified.get(client['id'], {})
+        rows.append(ContentDelivery(
+            client_id=client['id'],
+            month=month,
+            year=year,
+            posters_completed=stats.get('posters_completed') or 0,
+            videos_completed=stats.get('videos_completed') or 0,
+            posters_posted=stats.get('posters_posted') or 0,
+            videos_posted=stats.get('videos_posted') or 0,
+            camera_projects=camera.get(client['id'], 0),
+            is_closed=bool(stats.get('closed')),
+            **{target: client[source] or 0 for target, source in TARGET_FIELDS.items()}
+        ))
+    ContentDelivery.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['client', 'month', 'year'],
+        update_fields=COUNTER_FIELDS + ['updated_at'],
+    )
+    return len(rows)
+
+
+def ensure_content_delivery(month, year):
+    """
+    Adds the rows active clients are missing for a month (new clients,
+    or a month nothing has been recorded for yet). One query when none are.
+    """
+    from .models import ContentDelivery
+
+    missing = active_clients().filter(
+        ~Exists(ContentDelivery.objects.filter(client=OuterRef('pk'), month=month, year=year))
+    ).values_list('id', flat=True)
+    return refresh_content_delivery(list(missing), month, year)
+
+
+def update_delivery_targets(client, today):
+    """
+    Copies a client's targets to its rows for the current and future
+    months; closed-out months keep the targets they were measured against.
+    """
+    from .models import ContentDelivery
+
+    ContentDelivery.objects.filter(client=client).filter(
+        Q(year__gt=today.year) | Q(year=today.year, month__gte=today.month)
+    ).update(**{target: getattr(client, source) or 0 for target, source in TARGET_FIELDS.items()})
+
+
+def rebuild_content_delivery(month=None, year=None, batch_size=500, log=None):
+    """
+    Recomputes every row of one month, or of every month that has
+    verifications or camera projects. Returns the number of rows written.
+    """
+    from django.utils import timezone
+
+    from emplyees.models import CameraDepartment
+    from .models import MonthlyVerification
+
+    log = log or (lambda message: None)
+    today = timezone.localdate()
+    if month and year:
+        periods = {(month, year)}
+    else:
+        periods = set(
+            MonthlyVerification.objects.exclude(month=None).exclude(year=None)
+            .order_by().values_list('month', 'year').distinct()
+        )
+        periods.update((day.month, day.year) for day in CameraDepartment.objects.dates('uploaded_date', 'month'))
+        periods.add((today.month, today.year))
+
+    written = 0
+    for period_month, period_year in sorted(periods, key=lambda period: (period[1], period[0])):
+        client_ids = set()
+        if (period_month, period_year) == (today.month, today.year):
+            # Every active client has a quota this month, recorded or not
+            client_ids.update(active_clients().values_list('id', flat=True))
+        client_ids.update(
+            MonthlyVerification.objects.filter(month=period_month, year=period_year)
+            .values_list('clientverification__client_id', flat=True)
+        )
+        client_ids.update(
+            CameraDepartment.objects.filter(uploaded_date__year=period_year, uploaded_date__month=period_month)
+            .exclude(client=None).values_list('client_id', flat=True)
+        )
+        client_ids = sorted(client_ids)
+        for start in range(0, len(client_ids), batch_size):
+            written += refresh_content_delivery(client_ids[start:start + batch_size], period_month, period_year)
+        log(f"{period_month:02d}/{period_year}: {len(client_ids)} client(s)")
+    return written
+
+
+def expected_progress(month, year, today):
+    """
+    Share of the month's quota that should be delivered by `today`:
+    0 for future months, 1 for past ones, the elapsed fraction otherwise.
+    """
+    if (year, month) < (today.year, today.month):
+        return 1.0
+    if (year, month) > (today.year, today.month):
+        return 0.0
+    return today.day / calendar.monthrange(year, month)[1]
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from verification.delivery import rebuild_content_delivery
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the content delivery counters from the verification board and camera "
+        "projects, for one month or every month with data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', type=int, help='Month to rebuild (with --year)')
+        parser.add_argument('--year', type=int, help='Year to rebuild (with --month)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Clients per upsert')
+
+    def handle(self, *args, **options):
+        month, year = options['month'], options['year']
+        if (month is None) != (year is None):
+            raise CommandError("Pass --month and --year together, or neither to rebuild every month.")
+        if month is not None and not 1 <= month <= 12:
+            raise CommandError("--month must be between 1 and 12.")
+
+        written = rebuild_content_delivery(
+            month=month,
+            year=year,
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} content delivery row(s)"))
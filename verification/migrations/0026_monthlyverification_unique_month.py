@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:13
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_months(apps, schema_editor):
+    """
+    Concurrent get_or_create calls could store the same month twice; keep the
+    oldest row (the one the board has been showing) before adding the constraint.
+    """
+    MonthlyVerification = apps.get_model('verification', 'MonthlyVerification')
+    duplicates = (
+        MonthlyVerification.objects.values('clientverification', 'month', 'year')
+        .annotate(row_count=Count('id'), keep_id=Min('id'))
+        .filter(row_count__gt=1)
+    )
+    for duplicate in duplicates:
+        MonthlyVerification.objects.filter(
+            clientverification=duplicate['clientverification'],
+            month=duplicate['month'],
+            year=duplicate['year'],
+        ).exclude(id=duplicate['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verification', '0025_alter_clientverification_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_months, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='monthlyverification',
+            constraint=models.UniqueConstraint(fields=('clientverification', 'month', 'year'), name='unique_monthly_verification'),
+        ),
+    ]
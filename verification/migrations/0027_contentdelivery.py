@@ -0,0 +1,109 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import ExtractMonth, ExtractYear, Greatest
+
+
+def backfill_content_delivery(apps, schema_editor):
+    """
+    Builds the counters for every client-month that has verifications or
+    camera projects; signals keep them current from here on.
+    """
+    Client = apps.get_model('clientapp', 'Client')
+    CameraDepartment = apps.get_model('emplyees', 'CameraDepartment')
+    ContentDelivery = apps.get_model('verification', 'ContentDelivery')
+    MonthlyVerification = apps.get_model('verification', 'MonthlyVerification')
+
+    counters = {}
+    verified = (
+        MonthlyVerification.objects.exclude(month=None).exclude(year=None)
+        .order_by().values('clientverification__client_id', 'month', 'year')
+        .annotate(
+            # Negative counts (never validated) would break the counters' CHECK constraints
+            posters_completed=Sum(Greatest('posters_completed', Value(0))),
+            videos_completed=Sum(Greatest('videos_completed', Value(0))),
+            posters_posted=Sum(Greatest('posters_posted', Value(0))),
+            videos_posted=Sum(Greatest('videos_posted', Value(0))),
+            closed=Count('id', filter=Q(is_verified=True)),
+        )
+    )
+    for row in verified:
+        counters[(row['clientverification__client_id'], row['month'], row['year'])] = {
+            'posters_completed': row['posters_completed'] or 0,
+            'videos_completed': row['videos_completed'] or 0,
+            'posters_posted': row['posters_posted'] or 0,
+            'videos_posted': row['videos_posted'] or 0,
+            'is_closed': bool(row['closed']),
+        }
+    camera = (
+        CameraDepartment.objects.exclude(client=None)
+        .annotate(upload_month=ExtractMonth('uploaded_date'), upload_year=ExtractYear('uploaded_date'))
+        .order_by().values('client_id', 'upload_month', 'upload_year')
+        .annotate(total=Count('id'))
+    )
+    for row in camera:
+        key = (row['client_id'], row['upload_month'], row['upload_year'])
+        counters.setdefault(key, {})['camera_projects'] = row['total']
+
+    targets = {
+        client['id']: client
+        for client in Client.objects.values(
+            'id', 'posters_per_month', 'videos_per_month', 'reels_per_month', 'stories_per_month'
+        )
+    }
+    ContentDelivery.objects.bulk_create(
+        [
+            ContentDelivery(
+                client_id=client_id,
+                month=month,
+                year=year,
+                posters_target=targets[client_id]['posters_per_month'] or 0,
+                videos_target=targets[client_id]['videos_per_month'] or 0,
+                reels_target=targets[client_id]['reels_per_month'] or 0,
+                stories_target=targets[client_id]['stories_per_month'] or 0,
+                **values
+            )
+            for (client_id, month, year), values in counters.items()
+            if client_id in targets
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientapp', '0024_backfill_quotas'),
+        ('emplyees', '0033_alter_customuser_current_status_announcement'),
+        ('verification', '0026_monthlyverification_unique_month'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.IntegerField()),
+                ('year', models.IntegerField()),
+                ('posters_target', models.PositiveIntegerField(default=0)),
+                ('videos_target', models.PositiveIntegerField(default=0)),
+                ('reels_target', models.PositiveIntegerField(default=0)),
+                ('stories_target', models.PositiveIntegerField(default=0)),
+                ('posters_completed', models.PositiveIntegerField(default=0)),
+                ('videos_completed', models.PositiveIntegerField(default=0)),
+                ('posters_posted', models.PositiveIntegerField(default=0)),
+                ('videos_posted', models.PositiveIntegerField(default=0)),
+                ('camera_projects', models.PositiveIntegerField(default=0)),
+                ('is_closed', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='content_deliveries', to='clientapp.client')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['year', 'month'], name='content_delivery_period_idx')],
+                'constraints': [models.UniqueConstraint(fields=('client', 'month', 'year'), name='unique_content_delivery')],
+            },
+        ),
+        migrations.RunPython(backfill_content_delivery, migrations.RunPython.noop),
+    ]
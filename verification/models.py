@@ -49,5 +49,54 @@ class MonthlyVerification(models.Model):
     posters_posted = models.IntegerField(default=0)
     videos_posted = models.IntegerField(default=0)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['clientverification', 'month', 'year'],
+                name='unique_monthly_verification'
+            )
+        ]
+
     def __str__(self):
         return f"{self.clientverification.client.client_name} - {self.month}/{self.year} - {'Verified' if self.is_verified else 'Pending'}"
+
+
+class ContentDelivery(models.Model):
+    """
+    Per-client, per-month delivery counters: targets copied from the client
+    and progress summed from MonthlyVerification and camera projects. Rows
+    are refreshed by verification/delivery.py whenever a source changes, so
+    the delivery dashboard reads this table alone.
+    """
+    client = models.ForeignKey(
+        'clientapp.Client',
+        on_delete=models.CASCADE,
+        related_name='content_deliveries'
+    )
+    month = models.IntegerField()
+    year = models.IntegerField()
+
+    posters_target = models.PositiveIntegerField(default=0)
+    videos_target = models.PositiveIntegerField(default=0)
+    reels_target = models.PositiveIntegerField(default=0)
+    stories_target = models.PositiveIntegerField(default=0)
+
+    posters_completed = models.PositiveIntegerField(default=0)
+    videos_completed = models.PositiveIntegerField(default=0)
+    posters_posted = models.PositiveIntegerField(default=0)
+    videos_posted = models.PositiveIntegerField(default=0)
+    camera_projects = models.PositiveIntegerField(default=0)
+    is_closed = models.BooleanField(default=False)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['client', 'month', 'year'], name='unique_content_delivery')
+        ]
+        indexes = [
+            models.Index(fields=['year', 'month'], name='content_delivery_period_idx')
+        ]
+
+    def __str__(self):
+        return f"{self.client_id} - {self.month}/{self.year}"
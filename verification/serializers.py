@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import ClientVerification,MonthlyVerification
+from .models import ClientVerification, ContentDelivery, MonthlyVerification
 from django.utils import timezone
 
 class ClientVerificationSerializer(serializers.ModelSerializer):
@@ -23,15 +23,18 @@ class ClientVerificationSerializer(serializers.ModelSerializer):
         ]
 
     def get_monthly_stat(self, obj, field_name):
-        
-        now = timezone.now()
-        monthly_stat = MonthlyVerification.objects.filter(
-            clientverification=obj,
-            month=now.month,
-            year=now.year
-        ).first()
-        if monthly_stat:
-            return getattr(monthly_stat, field_name)
+        # Views prefetch this month's row into `current_month_stats` (see
+        # with_current_month_stats); otherwise it is fetched once per object
+        if not hasattr(obj, 'current_month_stats'):
+            now = timezone.now()
+            monthly_stat = MonthlyVerification.objects.filter(
+                clientverification=obj,
+                month=now.month,
+                year=now.year
+            ).order_by('id').first()
+            obj.current_month_stats = [monthly_stat] if monthly_stat else []
+        if obj.current_month_stats:
+            return getattr(obj.current_month_stats[0], field_name)
         return 0
 
     def get_posters_completed(self, obj):
@@ -48,3 +51,61 @@ class ClientVerificationSerializer(serializers.ModelSerializer):
 
     def get_is_verified(self, obj):
         return self.get_monthly_stat(obj, 'is_verified')
+
+
+class MonthlyVerificationUpdateSerializer(serializers.Serializer):
+    """
+    One entry of a bulk board update: the ClientVerification id and the
+    counts to set for the current month (omitted counts are left as they are).
+    """
+    STAT_FIELDS = ['posters_completed', 'videos_completed', 'posters_posted', 'videos_posted']
+
+    id = serializers.IntegerField()
+    posters_completed = serializers.IntegerField(min_value=0, required=False)
+    videos_completed = serializers.IntegerField(min_value=0, required=False)
+    posters_posted = serializers.IntegerField(min_value=0, required=False)
+    videos_posted = serializers.IntegerField(min_value=0, required=False)
+
+
+class ContentDeliverySerializer(serializers.ModelSerializer):
+    """
+    One client's quota burn-down for a month. Expects `expected_progress`
+    (0-1, see verification.delivery.expected_progress) in the context.
+    """
+    client_name = serializers.CharField(source='client.client_name', read_only=True)
+    posters_remaining = serializers.SerializerMethodField()
+    videos_remaining = serializers.SerializerMethodField()
+    progress = serializers.SerializerMethodField()
+    delivery_status = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ContentDelivery
+        fields = [
+            'client', 'client_name', 'month', 'year',
+            'posters_target', 'videos_target', 'reels_target', 'stories_target',
+            'posters_completed', 'videos_completed', 'posters_posted', 'videos_posted',
+            'posters_remaining', 'videos_remaining', 'camera_projects',
+            'progress', 'delivery_status', 'is_closed', 'updated_at'
+        ]
+
+    def get_posters_remaining(self, obj):
+        return max(obj.posters_target - obj.posters_posted, 0)
+
+    def get_videos_remaining(self, obj):
+        return max(obj.videos_target - obj.videos_posted, 0)
+
+    def get_progress(self, obj):
+        # Posted share of the poster and video quota, in percent
+        target = obj.posters_target + obj.videos_target
+        if not target:
+            return 100.0
+        delivered = min(obj.posters_posted, obj.posters_target) + min(obj.videos_posted, obj.videos_target)
+        return round(delivered / target * 100, 1)
+
+    def get_delivery_status(self, obj):
+        progress = self.get_progress(obj)
+        if progress >= 100:
+            return 'delivered'
+        expected = self.context.get('expected_progress', 0) * 100
+        # Ten points of slack before a client counts as behind
+        return 'behind' if progress < expected - 10 else 'on_track'
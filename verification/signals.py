@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from clientapp.models import Client
+from emplyees.models import CameraDepartment
+from .delivery import camera_delivery_key, refresh_content_delivery, update_delivery_targets
+from .models import ClientVerification, MonthlyVerification
+
+
+@receiver([post_save, post_delete], sender=MonthlyVerification)
+def refresh_delivery_for_verification(sender, instance, **kwargs):
+    if instance.month is None or instance.year is None:
+        return
+    try:
+        client_id = instance.clientverification.client_id
+    except ClientVerification.DoesNotExist:
+        return
+    refresh_content_delivery([client_id], instance.month, instance.year)
+
+
+@receiver(pre_save, sender=CameraDepartment)
+def remember_camera_delivery_key(sender, instance, **kwargs):
+    # A project moved to another client or month must leave the old counter too
+    instance._previous_delivery_key = None
+    if instance.pk:
+        previous = CameraDepartment.objects.filter(pk=instance.pk).values('client_id', 'uploaded_date').first()
+        if previous:
+            instance._previous_delivery_key = camera_delivery_key(previous['client_id'], previous['uploaded_date'])
+
+
+@receiver([post_save, post_delete], sender=CameraDepartment)
+def refresh_delivery_for_camera_project(sender, instance, **kwargs):
+    keys = {
+        camera_delivery_key(instance.client_id, instance.uploaded_date),
+        getattr(instance, '_previous_delivery_key', None),
+    }
+    for key in keys - {None}:
+        client_id, month, year = key
+        refresh_content_delivery([client_id], month, year)
+
+
+@receiver(post_save, sender=Client)
+def update_client_delivery_targets(sender, instance, created, **kwargs):
+    if not created:
+        update_delivery_targets(instance, timezone.localdate())
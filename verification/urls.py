@@ -3,6 +3,9 @@ from .import views
 
 urlpatterns = [
     path('clientverification-list/', views.ClientVerificationList.as_view()),
+    path('clientverification-list/bulk/', views.BulkVerificationUpdate.as_view(), name='verification-bulk-update'),
     path('close-month/', views.CloseMonthlyVerification.as_view(), name='close-month'),
+    path('close-month/bulk/', views.BulkCloseMonthlyVerification.as_view(), name='close-month-bulk'),
     path('verified-list/', views.VerifiedClientList.as_view(), name='verified-list'),
+    path('content-delivery/', views.ContentDeliveryDashboard.as_view(), name='content-delivery-dashboard'),
 ]
\ No newline at end of file
@@ -1,11 +1,54 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import ClientVerification
-from .serializers import ClientVerificationSerializer
+from rest_framework.permissions import IsAuthenticated
+from .models import ClientVerification, MonthlyVerification
+from .serializers import ClientVerificationSerializer, ContentDeliverySerializer, MonthlyVerificationUpdateSerializer
+from .delivery import ensure_content_delivery, expected_progress, refresh_content_delivery
 
+from django.db import IntegrityError, transaction
+from django.db.models import F, Prefetch
 from django.utils import timezone
 
+
+def with_current_month_stats(queryset, now):
+    """
+    Loads the client and this month's MonthlyVerification (as
+    `current_month_stats`) with the verifications, so
+    ClientVerificationSerializer needs no per-row queries.
+    """
+    return queryset.select_related('client').prefetch_related(
+        Prefetch(
+            'monthly_verifications',
+            queryset=MonthlyVerification.objects.filter(month=now.month, year=now.year).order_by('id'),
+            to_attr='current_month_stats'
+        )
+    )
+
+
+def get_or_create_month_stats(verifications, now):
+    """
+    Returns {clientverification id: MonthlyVerification} for this month,
+    creating the missing rows with a single bulk insert.
+    """
+    stats = {
+        stat.clientverification_id: stat
+        for stat in MonthlyVerification.objects.filter(
+            clientverification__in=verifications,
+            month=now.month,
+            year=now.year
+        )
+    }
+    missing = [
+        MonthlyVerification(clientverification=verification, month=now.month, year=now.year)
+        for verification in verifications
+        if verification.id not in stats
+    ]
+    for stat in MonthlyVerification.objects.bulk_create(missing):
+        stats[stat.clientverification_id] = stat
+    return stats
+
+
 class ClientVerificationList(APIView):
     def get(self, request):
         try:
@@ -15,6 +58,7 @@ class ClientVerificationList(APIView):
                 verified_date__year=now.year,
                 verified_date__month=now.month
             )
+            client_verifications = with_current_month_stats(client_verifications, now)
             serializer = ClientVerificationSerializer(client_verifications, many=True)
             return Response(serializer.data)
         except Exception as e:
@@ -27,6 +71,11 @@ class ClientVerificationList(APIView):
             if not verification_id:
                 return Response({'error': 'Verification ID is required'}, status=status.HTTP_400_BAD_REQUEST)
             
+            # Same validation as the bulk update: counts must be whole numbers >= 0
+            serializer = MonthlyVerificationUpdateSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
             client_verification = ClientVerification.objects.get(id=verification_id)
             now = timezone.now()
             
@@ -36,15 +85,9 @@ class ClientVerificationList(APIView):
                 year=now.year
             )
             
-           
-            if 'posters_completed' in request.data:
-                monthly_stat.posters_completed = request.data.get('posters_completed')
-            if 'videos_completed' in request.data:
-                monthly_stat.videos_completed = request.data.get('videos_completed')
-            if 'posters_posted' in request.data:
-                monthly_stat.posters_posted = request.data.get('posters_posted')
-            if 'videos_posted' in request.data:
-                monthly_stat.videos_posted = request.data.get('videos_posted')
+            for field in MonthlyVerificationUpdateSerializer.STAT_FIELDS:
+                if field in serializer.validated_data:
+                    setattr(monthly_stat, field, serializer.validated_data[field])
             
             monthly_stat.save()
             
@@ -98,9 +141,189 @@ class VerifiedClientList(APIView):
                 verified_date__year=year,
                 verified_date__month=month
             )
+            client_verifications = with_current_month_stats(client_verifications, now)
             serializer = ClientVerificationSerializer(client_verifications, many=True)
             return Response(serializer.data)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    
\ No newline at end of file
+
+
+class BulkVerificationUpdate(APIView):
+    """
+    Updates this month's counts for many clients in one transaction.
+    Body: {"updates": [{"id": <verification id>, "posters_completed": 3, ...}, ...]}
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        items = request.data.get('updates') if isinstance(request.data, dict) else request.data
+        serializer = MonthlyVerificationUpdateSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        updates = serializer.validated_data
+        ids = [update['id'] for update in updates]
+        if not ids:
+            return Response({'error': 'No updates given'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(set(ids)) != len(ids):
+            return Response({'error': 'Each verification may appear only once'}, status=status.HTTP_400_BAD_REQUEST)
+
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                verifications = list(ClientVerification.objects.select_for_update().filter(id__in=ids))
+                missing = set(ids) - {verification.id for verification in verifications}
+                if missing:
+                    return Response(
+                        {'error': 'ClientVerification not found', 'ids': sorted(missing)},
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+
+                stats = get_or_create_month_stats(verifications, now)
+                changed_fields = set()
+                for update in updates:
+                    monthly_stat = stats[update['id']]
+                    for field in MonthlyVerificationUpdateSerializer.STAT_FIELDS:
+                        if field in update:
+                            setattr(monthly_stat, field, update[field])
+                            changed_fields.add(field)
+                if changed_fields:
+                    MonthlyVerification.objects.bulk_update(
+                        [stats[verification_id] for verification_id in ids],
+                        sorted(changed_fields)
+                    )
+                # bulk_update sends no signals; refresh the delivery counters here
+                refresh_content_delivery(
+                    [verification.client_id for verification in verifications], now.month, now.year
+                )
+        except IntegrityError:
+            return Response(
+                {'error': 'The board was updated concurrently, please retry'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        return Response({'message': 'Data updated successfully', 'updated': len(ids)}, status=status.HTTP_200_OK)
+
+
+class BulkCloseMonthlyVerification(APIView):
+    """
+    Closes the current month for many clients in one transaction.
+    Body: {"ids": [<verification id>, ...]}, or {"all_delivered": true} to close
+    every client still open on the board whose posted posters and videos
+    have reached the monthly target.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ids = request.data.get('ids')
+        all_delivered = request.data.get('all_delivered') in [True, 'true', '1', 1]
+        now = timezone.now()
+
+        if all_delivered:
+            client_verifications = ClientVerification.objects.filter(is_completed=False).exclude(
+                verified_date__year=now.year,
+                verified_date__month=now.month
+            ).filter(
+                monthly_verifications__month=now.month,
+                monthly_verifications__year=now.year,
+                monthly_verifications__posters_posted__gte=F('client__posters_per_month'),
+                monthly_verifications__videos_posted__gte=F('client__videos_per_month')
+            )
+        elif isinstance(ids, list) and ids and all(isinstance(pk, int) for pk in ids):
+            client_verifications = ClientVerification.objects.filter(id__in=ids)
+        else:
+            return Response(
+                {'error': 'Provide a list of verification ids or all_delivered'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            with transaction.atomic():
+                verifications = list(client_verifications.select_for_update(of=('self',)))
+                if ids and not all_delivered:
+                    missing = set(ids) - {verification.id for verification in verifications}
+                    if missing:
+                        return Response(
+                            {'error': 'ClientVerification not found', 'ids': sorted(missing)},
+                            status=status.HTTP_404_NOT_FOUND
+                        )
+
+                stats = get_or_create_month_stats(verifications, now)
+                for monthly_stat in stats.values():
+                    monthly_stat.is_verified = True
+                MonthlyVerification.objects.bulk_update(stats.values(), ['is_verified'])
+
+                # Same as closing one client: verified_date drops it from this month's board
+                ClientVerification.objects.filter(
+                    id__in=[verification.id for verification in verifications]
+                ).update(verified_date=now)
+                refresh_content_delivery(
+                    [verification.client_id for verification in verifications], now.month, now.year
+                )
+        except IntegrityError:
+            return Response(
+                {'error': 'The board was updated concurrently, please retry'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        return Response(
+            {'message': 'Month closed successfully', 'closed': len(verifications)},
+            status=status.HTTP_200_OK
+        )
+
+
+class ContentDeliveryDashboard(APIView):
+    """
+    Quota burn-down for every client in a month (?month=&year=, default
+    current), read from the ContentDelivery counters. Clients furthest
+    behind come first.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        from .models import ContentDelivery
+
+        today = timezone.localdate()
+        try:
+            month = int(request.query_params.get('month', today.month))
+            year = int(request.query_params.get('year', today.year))
+        except (TypeError, ValueError):
+            return Response({'error': 'Invalid month or year'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= month <= 12:
+            return Response({'error': 'Invalid month or year'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if (year, month) == (today.year, today.month):
+            ensure_content_delivery(month, year)
+
+        deliveries = ContentDelivery.objects.filter(
+            month=month,
+            year=year,
+            client__is_deleted=False
+        ).select_related('client')
+        expected = expected_progress(month, year, today)
+        rows = ContentDeliverySerializer(deliveries, many=True, context={'expected_progress': expected}).data
+        rows = sorted(rows, key=lambda row: (row['progress'], row['client_name']))
+
+        totals = {
+            field: sum(row[field] for row in rows)
+            for field in [
+                'posters_target', 'videos_target', 'posters_completed', 'videos_completed',
+                'posters_posted', 'videos_posted', 'camera_projects'
+            ]
+        }
+        target = totals['posters_target'] + totals['videos_target']
+        delivered = sum(
+            min(row['posters_posted'], row['posters_target']) + min(row['videos_posted'], row['videos_target'])
+            for row in rows
+        )
+        totals['progress'] = round(delivered / target * 100, 1) if target else 100.0
+        totals['behind'] = sum(1 for row in rows if row['delivery_status'] == 'behind')
+        totals['delivered'] = sum(1 for row in rows if row['delivery_status'] == 'delivered')
+
+        return Response({
+            'month': month,
+            'year': year,
+            'expected_progress': round(expected * 100, 1),
+            'totals': totals,
+            'clients': rows,
+        })